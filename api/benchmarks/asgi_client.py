@@ -0,0 +1,95 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+from urllib.parse import urlencode
+
+
+@dataclass
+class AsgiResponse:
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class AsgiClient:
+    def __init__(self, app):
+        self.__app = app
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, Any] | None = None,
+        json_body: Any = None,
+        headers: Dict[str, str] | None = None,
+        on_body: Callable[[bytes], None] | None = None,
+    ) -> AsgiResponse:
+        body = b""
+        raw_headers = [
+            (k.lower().encode(), v.encode()) for k, v in (headers or {}).items()
+        ]
+        if json_body is not None:
+            body = json.dumps(json_body, default=str).encode()
+            raw_headers.append((b"content-type", b"application/json"))
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}, doseq=True).encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        request_sent = False
+        response_complete = asyncio.Event()
+        response = AsgiResponse(status_code=500)
+        chunks = []
+
+        async def receive():
+            nonlocal request_sent
+            if request_sent:
+                await response_complete.wait()
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response.status_code = message["status"]
+                response.headers = {
+                    k.decode().lower(): v.decode() for k, v in message["headers"]
+                }
+            elif message["type"] == "http.response.body":
+                if on_body is not None:
+                    on_body(message.get("body", b""))
+                else:
+                    chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        try:
+            await self.__app(scope, receive, send)
+        finally:
+            response_complete.set()
+        response.body = b"".join(chunks)
+        return response
+
+    async def get(self, path: str, **kwargs) -> AsgiResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> AsgiResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> AsgiResponse:
+        return await self.request("DELETE", path, **kwargs)
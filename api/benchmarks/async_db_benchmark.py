@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.modules.availabilities.availabilities_model import Availabilities
+from api.modules.db.db import SQLALCHEMY_DATABASE_URL, AsyncSessionLocal, engine
+from api.modules.schedule.schedule_model import Schedule  # noqa: F401
+from api.modules.user.user_model import User  # noqa: F401
+
+BLOCKING_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("+asyncpg", "+psycopg2")
+
+
+def build_query(sleep_ms: int):
+    query = (
+        select(Availabilities)
+        .where(Availabilities.status == AvailabilityStatusEnum.AVAILABLE)
+        .limit(50)
+    )
+    if sleep_ms:
+        query = query.where(func.pg_sleep(sleep_ms / 1000).is_not(None))
+    return query
+
+
+async def run_requests(handler, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request():
+        async with semaphore:
+            await handler()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def benchmark_blocking(total: int, concurrency: int, sleep_ms: int) -> float:
+    blocking_engine = create_engine(BLOCKING_DATABASE_URL, pool_size=concurrency)
+    session_local = sessionmaker(bind=blocking_engine, autoflush=False)
+    query = build_query(sleep_ms)
+
+    async def handler():
+        with session_local() as db:
+            db.scalars(query).all()
+
+    try:
+        return await run_requests(handler, total, concurrency)
+    finally:
+        blocking_engine.dispose()
+
+
+async def benchmark_async(total: int, concurrency: int, sleep_ms: int) -> float:
+    query = build_query(sleep_ms)
+
+    async def handler():
+        async with AsyncSessionLocal() as db:
+            (await db.scalars(query)).all()
+
+    try:
+        return await run_requests(handler, total, concurrency)
+    finally:
+        await engine.dispose()
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare blocking vs async session throughput inside one event loop."
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--sleep-ms",
+        type=int,
+        default=5,
+        help="server side pg_sleep per query, simulates query/network latency",
+    )
+    args = parser.parse_args()
+
+    for name, bench in (("blocking", benchmark_blocking), ("async", benchmark_async)):
+        elapsed = await bench(args.requests, args.concurrency, args.sleep_ms)
+        print(
+            f"{name:>8}: {args.requests} requests, concurrency {args.concurrency}, "
+            f"{elapsed:.2f}s, {args.requests / elapsed:.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.benchmarks.stats import percentile
+from api.main import app
+from api.modules.db.db import engine
+from api.modules.security.security_service import security_service
+
+BENCH_EMAIL_DOMAIN = "@bench.booking.local"
+BENCH_PROFESSIONAL_EMAIL = f"professional{BENCH_EMAIL_DOMAIN}"
+
+
+async def seed(patients: int, slots: int) -> tuple[list[str], list[str]]:
+    pattern = {"pattern": f"%{BENCH_EMAIL_DOMAIN}"}
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "DELETE FROM schedule WHERE professional_id IN "
+                "(SELECT id FROM users WHERE email LIKE :pattern)"
+            ),
+            pattern,
+        )
+        await connection.execute(
+            text(
+                "DELETE FROM availabilities WHERE owner_id IN "
+                "(SELECT id FROM users WHERE email LIKE :pattern)"
+            ),
+            pattern,
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status, crp) "
+                "VALUES ('Bench Professional', :email, 'x', 'PROFESSIONAL', 'READY', 'CRP/BB-00001') "
+                "ON CONFLICT (email) DO NOTHING"
+            ),
+            {"email": BENCH_PROFESSIONAL_EMAIL},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status) "
+                "SELECT 'Bench Patient ' || g, 'patient' || g || :domain, 'x', 'PATIENT', 'READY' "
+                "FROM generate_series(1, :patients) g ON CONFLICT (email) DO NOTHING"
+            ),
+            {"domain": BENCH_EMAIL_DOMAIN, "patients": patients},
+        )
+        patient_ids = (
+            await connection.scalars(
+                text(
+                    "SELECT id FROM users WHERE email LIKE :pattern AND role = 'PATIENT' "
+                    "ORDER BY email LIMIT :patients"
+                ),
+                {**pattern, "patients": patients},
+            )
+        ).all()
+        slot_ids = (
+            await connection.scalars(
+                text(
+                    "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+                    "SELECT u.id, timestamptz '2040-01-01' + g * interval '1 hour', "
+                    "timestamptz '2040-01-01' + g * interval '1 hour' + interval '50 minutes', "
+                    "'AVAILABLE' "
+                    "FROM users u CROSS JOIN generate_series(0, :slots - 1) g "
+                    "WHERE u.email = :email RETURNING id"
+                ),
+                {"slots": slots, "email": BENCH_PROFESSIONAL_EMAIL},
+            )
+        ).all()
+    return [str(i) for i in patient_ids], [str(i) for i in slot_ids]
+
+
+async def count_bookings(slot_ids: list[str]) -> tuple[int, int]:
+    async with engine.connect() as connection:
+        row = (
+            await connection.execute(
+                text(
+                    "SELECT count(*) FILTER (WHERE status = 'TAKEN'), "
+                    "(SELECT count(*) FROM schedule WHERE availability_id::text = ANY(:ids)) "
+                    "FROM availabilities WHERE id::text = ANY(:ids)"
+                ),
+                {"ids": slot_ids},
+            )
+        ).one()
+    return row[0], row[1]
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Race many patients for a few popular slots and report booking latency."
+    )
+    parser.add_argument("--patients", type=int, default=300)
+    parser.add_argument("--slots", type=int, default=10)
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    patient_ids, slot_ids = await seed(args.patients, args.slots)
+    tokens = [
+        security_service.auth({"user_id": patient_id})["access_token"]
+        for patient_id in patient_ids
+    ]
+
+    client = AsgiClient(app)
+    rng = random.Random(args.seed)
+    latencies = []
+    statuses = {}
+
+    async def patient(token: str):
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(args.attempts):
+            started = time.perf_counter()
+            response = await client.post(
+                "/schedule",
+                headers=headers,
+                json_body={"availability_id": rng.choice(slot_ids)},
+            )
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 200:
+                return
+
+    started = time.perf_counter()
+    await asyncio.gather(*(patient(token) for token in tokens))
+    elapsed = time.perf_counter() - started
+
+    taken, schedules = await count_bookings(slot_ids)
+    await engine.dispose()
+
+    print(f"patients: {len(tokens)}, slots: {len(slot_ids)}")
+    print(f"requests: {len(latencies)} in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(
+        f"latency p50: {percentile(latencies, 50) * 1000:.2f} ms | "
+        f"p99: {percentile(latencies, 99) * 1000:.2f} ms"
+    )
+    print(f"responses by status: {dict(sorted(statuses.items()))}")
+    print(f"slots taken: {taken}, schedules stored: {schedules}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
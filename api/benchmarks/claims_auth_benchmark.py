@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("USER_CACHE_TTL_SECONDS", "0")
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.benchmarks.stats import percentile
+from api.main import app
+from api.modules.db.db import engine
+from api.modules.db.query_counter import count_queries, install_query_counter
+from api.modules.security.security_service import security_service
+from api.modules.security.token_claims import TokenClaims
+
+BENCH_EMAIL = "professional@bench.claims.local"
+BENCH_START = datetime(2045, 1, 1, tzinfo=timezone.utc)
+
+
+async def seed():
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "DELETE FROM availabilities WHERE owner_id IN "
+                "(SELECT id FROM users WHERE email = :email)"
+            ),
+            {"email": BENCH_EMAIL},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status, crp) "
+                "VALUES ('Bench Professional', :email, 'x', 'PROFESSIONAL', 'READY', 'CRP/BC-00001') "
+                "ON CONFLICT (email) DO NOTHING"
+            ),
+            {"email": BENCH_EMAIL},
+        )
+        return (
+            await connection.execute(
+                text(
+                    "SELECT id, role, status, token_version FROM users WHERE email = :email"
+                ),
+                {"email": BENCH_EMAIL},
+            )
+        ).one()
+
+
+async def run(client: AsgiClient, token: str, offset: int, requests: int):
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    queries = 0
+    for i in range(requests):
+        start = BENCH_START + timedelta(hours=offset + i)
+        with count_queries() as counter:
+            started = time.perf_counter()
+            response = await client.post(
+                "/availabilities",
+                headers=headers,
+                json_body={
+                    "start_time": start.isoformat(),
+                    "end_time": (start + timedelta(minutes=50)).isoformat(),
+                    "status": "AVAILABLE",
+                },
+            )
+            latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.body[:200]!r}")
+        queries += counter.count
+    return latencies, queries / requests
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare authorized write latency with claims in the token vs a per-request user lookup."
+    )
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    install_query_counter(engine.sync_engine)
+    user = await seed()
+    tokens = {
+        "claims": security_service.auth(TokenClaims.subject_for(user))["access_token"],
+        "lookup": security_service.auth({"user_id": str(user.id)})["access_token"],
+    }
+
+    client = AsgiClient(app)
+    results = {name: ([], []) for name in tokens}
+    offset = 0
+    for _ in range(args.rounds):
+        for name, token in tokens.items():
+            latencies, queries = await run(client, token, offset, args.requests)
+            results[name][0].extend(latencies)
+            results[name][1].append(queries)
+            offset += args.requests
+
+    await engine.dispose()
+
+    print(f"requests per mode: {args.requests * args.rounds}")
+    for name, (latencies, queries) in results.items():
+        print(
+            f"{name:<7} p50: {percentile(latencies, 50) * 1000:.2f} ms | "
+            f"p99: {percentile(latencies, 99) * 1000:.2f} ms | "
+            f"queries/request: {sum(queries) / len(queries):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import dataclasses
+import os
+import resource
+import sys
+import time
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.config.settings import settings
+from api.main import app
+from api.modules.db.db import create_db_engine, engine
+from api.modules.security.security_service import security_service
+
+BENCH_EMAIL_DOMAIN = "@bench.export.local"
+BENCH_PROFESSIONAL_EMAIL = f"professional{BENCH_EMAIL_DOMAIN}"
+BENCH_PATIENT_EMAIL = f"patient{BENCH_EMAIL_DOMAIN}"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def current_rss() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+async def seed(rows: int) -> tuple[str, str]:
+    users = {"professional": BENCH_PROFESSIONAL_EMAIL, "patient": BENCH_PATIENT_EMAIL}
+    seed_engine = create_db_engine(
+        dataclasses.replace(settings, db_statement_timeout_ms=0), pool_name="seed"
+    )
+    async with seed_engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status, crp) VALUES "
+                "('Export Professional', :professional, 'x', 'PROFESSIONAL', 'READY', 'CRP/EX-00001'), "
+                "('Export Patient', :patient, 'x', 'PATIENT', 'READY', NULL) "
+                "ON CONFLICT (email) DO NOTHING"
+            ),
+            users,
+        )
+        professional_id, patient_id = (
+            await connection.execute(
+                text(
+                    "SELECT (SELECT id FROM users WHERE email = :professional), "
+                    "(SELECT id FROM users WHERE email = :patient)"
+                ),
+                users,
+            )
+        ).one()
+        existing = await connection.scalar(
+            text("SELECT count(*) FROM schedule WHERE patient_id = :patient_id"),
+            {"patient_id": patient_id},
+        )
+        if existing != rows:
+            print(f"seeding {rows} availabilities and schedules...")
+            await connection.execute(
+                text("DELETE FROM schedule WHERE patient_id = :patient_id"),
+                {"patient_id": patient_id},
+            )
+            await connection.execute(
+                text("DELETE FROM availabilities WHERE owner_id = :owner_id"),
+                {"owner_id": professional_id},
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+                    "SELECT :owner_id, timestamptz '2030-01-01' + g * interval '10 minutes', "
+                    "timestamptz '2030-01-01' + g * interval '10 minutes' + interval '5 minutes', "
+                    "'TAKEN' FROM generate_series(0, :rows - 1) g"
+                ),
+                {"owner_id": professional_id, "rows": rows},
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO schedule (professional_id, patient_id, availability_id) "
+                    "SELECT owner_id, :patient_id, id FROM availabilities WHERE owner_id = :owner_id"
+                ),
+                {"owner_id": professional_id, "patient_id": patient_id},
+            )
+    await seed_engine.dispose()
+    return str(professional_id), str(patient_id)
+
+
+async def export(client: AsgiClient, path: str, user_id: str, export_format: str):
+    token = security_service.auth({"user_id": user_id})["access_token"]
+    baseline = current_rss()
+    stats = {"bytes": 0, "lines": 0, "peak": baseline}
+
+    def on_body(chunk: bytes):
+        stats["bytes"] += len(chunk)
+        stats["lines"] += chunk.count(b"\n")
+        stats["peak"] = max(stats["peak"], current_rss())
+
+    started = time.perf_counter()
+    response = await client.get(
+        path,
+        params={"format": export_format},
+        headers={"Authorization": f"Bearer {token}"},
+        on_body=on_body,
+    )
+    elapsed = time.perf_counter() - started
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code}")
+
+    header_lines = 1 if export_format == "CSV" else 0
+    return {
+        "rows": stats["lines"] - header_lines,
+        "megabytes": stats["bytes"] / 1024 / 1024,
+        "seconds": elapsed,
+        "rss_growth_mb": (stats["peak"] - baseline) / 1024 / 1024,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Export a large history and check that RSS stays under a fixed ceiling."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64)
+    args = parser.parse_args()
+
+    professional_id, patient_id = await seed(args.rows)
+    client = AsgiClient(app)
+
+    failed = False
+    for path, user_id in (
+        ("/availabilities/export", professional_id),
+        ("/schedule/export", patient_id),
+    ):
+        for export_format in ("NDJSON", "CSV"):
+            result = await export(client, path, user_id, export_format)
+            ok = (
+                result["rows"] == args.rows
+                and result["rss_growth_mb"] <= args.max_rss_growth_mb
+            )
+            failed |= not ok
+            print(
+                f"{path:<24} {export_format:<6} rows: {result['rows']} | "
+                f"{result['megabytes']:.1f} MB in {result['seconds']:.1f}s | "
+                f"RSS growth: {result['rss_growth_mb']:.1f} MB | "
+                f"{'ok' if ok else 'FAIL'}"
+            )
+
+    await engine.dispose()
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"process peak RSS: {peak_mb:.1f} MB")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.main import app
+from api.modules.db.db import engine
+from api.modules.security.security_service import security_service
+
+BENCH_EMAIL_DOMAIN = "@bench.httpcache.local"
+BENCH_PROFESSIONAL_EMAIL = f"professional{BENCH_EMAIL_DOMAIN}"
+BENCH_PATIENT_EMAIL = f"patient{BENCH_EMAIL_DOMAIN}"
+
+
+async def seed(slots: int) -> tuple[str, str]:
+    users = {"professional": BENCH_PROFESSIONAL_EMAIL, "patient": BENCH_PATIENT_EMAIL}
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status, crp) VALUES "
+                "('Cache Professional', :professional, 'x', 'PROFESSIONAL', 'READY', 'CRP/HC-00001'), "
+                "('Cache Patient', :patient, 'x', 'PATIENT', 'READY', NULL) "
+                "ON CONFLICT (email) DO NOTHING"
+            ),
+            users,
+        )
+        professional_id, patient_id = (
+            await connection.execute(
+                text(
+                    "SELECT (SELECT id FROM users WHERE email = :professional), "
+                    "(SELECT id FROM users WHERE email = :patient)"
+                ),
+                users,
+            )
+        ).one()
+        await connection.execute(
+            text("DELETE FROM schedule WHERE patient_id = :patient_id"),
+            {"patient_id": patient_id},
+        )
+        await connection.execute(
+            text("DELETE FROM availabilities WHERE owner_id = :owner_id"),
+            {"owner_id": professional_id},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+                "SELECT :owner_id, timestamptz '2042-01-01' + g * interval '1 hour', "
+                "timestamptz '2042-01-01' + g * interval '1 hour' + interval '50 minutes', "
+                "'AVAILABLE' FROM generate_series(1, :slots) g"
+            ),
+            {"owner_id": professional_id, "slots": slots},
+        )
+    return str(professional_id), str(patient_id)
+
+
+async def book_next(client: AsgiClient, professional_id: str, patient_headers: dict):
+    async with engine.connect() as connection:
+        availability_id = await connection.scalar(
+            text(
+                "SELECT id FROM availabilities WHERE owner_id = :owner_id "
+                "AND status = 'AVAILABLE' ORDER BY start_time LIMIT 1"
+            ),
+            {"owner_id": professional_id},
+        )
+    if availability_id is not None:
+        await client.post(
+            "/schedule",
+            json_body={"availability_id": str(availability_id)},
+            headers=patient_headers,
+        )
+
+
+async def poll(
+    client: AsgiClient,
+    professional_id: str,
+    patient_id: str,
+    rounds: int,
+    write_every: int,
+    conditional: bool,
+    accept_encoding: str | None,
+):
+    headers = {
+        "Authorization": "Bearer "
+        + security_service.auth({"user_id": patient_id})["access_token"]
+    }
+    if accept_encoding:
+        headers["Accept-Encoding"] = accept_encoding
+
+    endpoints = [
+        (
+            "/availabilities",
+            {
+                "professional_id": professional_id,
+                "time_filter": "ALL",
+                "limit": 50,
+            },
+        ),
+        ("/schedule", {"time_filter": "ALL"}),
+        ("/user", {}),
+        ("/user/all", {"limit": 50}),
+    ]
+    etags = {}
+    stats = {"requests": 0, "not_modified": 0, "bytes": 0, "write_seconds": 0.0}
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    for round_number in range(rounds):
+        if write_every and round_number and round_number % write_every == 0:
+            write_started = time.process_time()
+            await book_next(client, professional_id, headers)
+            stats["write_seconds"] += time.process_time() - write_started
+
+        for path, params in endpoints:
+            request_headers = dict(headers)
+            if conditional and path in etags:
+                request_headers["If-None-Match"] = etags[path]
+            response = await client.get(path, params=params, headers=request_headers)
+            stats["requests"] += 1
+            stats["bytes"] += len(response.body)
+            if response.status_code == 304:
+                stats["not_modified"] += 1
+            elif "etag" in response.headers:
+                etags[path] = response.headers["etag"]
+
+    stats["seconds"] = time.perf_counter() - started
+    stats["cpu_seconds"] = time.process_time() - cpu_started - stats["write_seconds"]
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare a mobile polling workload with and without conditional GETs and compression."
+    )
+    parser.add_argument("--slots", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument(
+        "--write-every",
+        type=int,
+        default=20,
+        help="book one slot every N polling rounds (0 = read only)",
+    )
+    args = parser.parse_args()
+
+    client = AsgiClient(app)
+    scenarios = [
+        ("plain", False, None),
+        ("gzip", False, "gzip"),
+        ("etag", True, None),
+        ("etag + gzip", True, "gzip"),
+        ("etag + br", True, "br, gzip"),
+    ]
+
+    print(
+        f"slots: {args.slots}, rounds: {args.rounds}, 4 endpoints per round, "
+        f"one booking every {args.write_every} rounds"
+    )
+    baseline = None
+    for name, conditional, accept_encoding in scenarios:
+        professional_id, patient_id = await seed(args.slots)
+        stats = await poll(
+            client,
+            professional_id,
+            patient_id,
+            args.rounds,
+            args.write_every,
+            conditional,
+            accept_encoding,
+        )
+        baseline = baseline or stats
+        print(
+            f"{name:<12} bytes: {stats['bytes'] / 1024:9.1f} KB "
+            f"({stats['bytes'] / baseline['bytes']:6.1%}) | "
+            f"cpu: {stats['cpu_seconds']:6.2f}s "
+            f"({stats['cpu_seconds'] / baseline['cpu_seconds']:6.1%}) | "
+            f"304s: {stats['not_modified']}/{stats['requests']} | "
+            f"wall: {stats['seconds']:6.2f}s"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import dataclasses
+import statistics
+import time
+
+from sqlalchemy import select, text
+
+from api.config.settings import settings
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.time_enum import TimeEnum
+from api.modules.availabilities.availabilities_model import Availabilities
+from api.modules.availabilities.availabilities_repository import (
+    AvailabilitiesRepository,
+)
+from api.modules.db.db import AsyncSessionLocal, create_db_engine
+from api.modules.schedule.schedule_model import Schedule  # noqa: F401
+from api.modules.user.user_model import User  # noqa: F401
+
+BENCH_EMAIL_DOMAIN = "@bench.pagination.local"
+
+
+async def seed(rows: int, owners: int):
+    seed_engine = create_db_engine(
+        dataclasses.replace(settings, db_statement_timeout_ms=0), pool_name="seed"
+    )
+    pattern = {"pattern": f"%{BENCH_EMAIL_DOMAIN}"}
+    try:
+        async with seed_engine.begin() as connection:
+            existing = await connection.scalar(
+                text(
+                    "SELECT count(*) FROM availabilities a JOIN users u ON u.id = a.owner_id "
+                    "WHERE u.email LIKE :pattern"
+                ),
+                pattern,
+            )
+            if existing >= rows:
+                return
+
+            print(f"seeding {rows} availabilities for {owners} professionals...")
+            await connection.execute(
+                text(
+                    "DELETE FROM availabilities WHERE owner_id IN "
+                    "(SELECT id FROM users WHERE email LIKE :pattern)"
+                ),
+                pattern,
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO users (name, email, password_hash, role, status, crp) "
+                    "SELECT 'Bench ' || g, 'pro' || g || :domain, 'x', 'PROFESSIONAL', 'READY', "
+                    "'CRP/B' || lpad(g::text, 7, '0') "
+                    "FROM generate_series(1, :owners) g ON CONFLICT (email) DO NOTHING"
+                ),
+                {"domain": BENCH_EMAIL_DOMAIN, "owners": owners},
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+                    "SELECT u.id, timestamptz '2020-01-01' + g * interval '1 hour', "
+                    "timestamptz '2020-01-01' + g * interval '1 hour' + interval '50 minutes', "
+                    "'AVAILABLE' "
+                    "FROM (SELECT id FROM users WHERE email LIKE :pattern) u "
+                    "CROSS JOIN generate_series(0, :per_owner - 1) g"
+                ),
+                {**pattern, "per_owner": rows // owners},
+            )
+        async with seed_engine.connect() as connection:
+            await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(text("ANALYZE availabilities"))
+            await connection.execute(text("ANALYZE users"))
+    finally:
+        await seed_engine.dispose()
+
+
+async def time_call(call, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await call(AvailabilitiesRepository(db))
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def cursor_for_page(page: int, limit: int):
+    if page == 1:
+        return None
+    async with AsyncSessionLocal() as db:
+        row = (
+            await db.execute(
+                select(Availabilities.start_time, Availabilities.id)
+                .where(Availabilities.status == AvailabilityStatusEnum.AVAILABLE)
+                .order_by(Availabilities.start_time, Availabilities.id)
+                .offset((page - 1) * limit - 1)
+                .limit(1)
+            )
+        ).one()
+    return row.start_time, row.id
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare offset and keyset page latency on a large availabilities table."
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--owners", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    await seed(args.rows, args.owners)
+    status = AvailabilityStatusEnum.AVAILABLE
+
+    for page in args.pages:
+        skip = (page - 1) * args.limit
+        offset_ms = await time_call(
+            lambda repo: repo.find_all_by_owner_id_status_and_time(
+                None, status, TimeEnum.ALL, skip, args.limit
+            ),
+            args.repeat,
+        )
+        after = await cursor_for_page(page, args.limit)
+        keyset_ms = await time_call(
+            lambda repo: repo.find_page_by_owner_id_status_and_time(
+                None, status, TimeEnum.ALL, after, args.limit + 1
+            ),
+            args.repeat,
+        )
+        print(
+            f"page {page:>6}: offset {offset_ms:8.2f} ms | keyset {keyset_ms:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from api.benchmarks.loadtest.http_client import HttpClient
+from api.benchmarks.loadtest.run import build_parser, run_load, write_report
+from api.modules.db.db import engine
+
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+SERVER_START_TIMEOUT = 60
+
+
+def relative_change(before: float, after: float) -> float:
+    return after / before - 1 if before else 0.0
+
+
+def compare(baseline: dict, candidate: dict, args) -> dict:
+    endpoints = {}
+    regressions = []
+    names = sorted(set(baseline["endpoints"]) | set(candidate["endpoints"]))
+    for name in names:
+        before = baseline["endpoints"].get(name)
+        after = candidate["endpoints"].get(name)
+        if before is None or after is None:
+            endpoints[name] = {
+                "missing_in": "baseline" if before is None else "candidate"
+            }
+            continue
+
+        changes = {
+            key: relative_change(before[key], after[key])
+            for key in (*LATENCY_KEYS, "rps")
+        }
+        changes["error_rate"] = after["error_rate"] - before["error_rate"]
+        changes["conflict_rate"] = after["conflict_rate"] - before["conflict_rate"]
+        endpoints[name] = {key: round(value, 4) for key, value in changes.items()}
+
+        if min(before["requests"], after["requests"]) < args.min_requests:
+            continue
+        flagged = [
+            key
+            for key in LATENCY_KEYS
+            if changes[key] > args.latency_tolerance
+            and after[key] - before[key] > args.min_latency_ms
+        ]
+        if changes["rps"] < -args.rps_tolerance:
+            flagged.append("rps")
+        if changes["error_rate"] > args.error_tolerance:
+            flagged.append("error_rate")
+        regressions.extend(
+            {
+                "endpoint": name,
+                "metric": key,
+                "baseline": before[key],
+                "candidate": after[key],
+            }
+            for key in flagged
+        )
+
+    return {
+        "baseline": baseline.get("label"),
+        "candidate": candidate.get("label"),
+        "regressions": regressions,
+        "endpoints": endpoints,
+    }
+
+
+def format_comparison(baseline: dict, candidate: dict, result: dict) -> str:
+    flagged = {(item["endpoint"], item["metric"]) for item in result["regressions"]}
+
+    def cell(name: str, key: str, fmt: str) -> str:
+        before = baseline["endpoints"][name][key]
+        after = candidate["endpoints"][name][key]
+        mark = "!" if (name, key) in flagged else " "
+        return f"{before:{fmt}} -> {after:{fmt}}{mark}"
+
+    lines = [f"baseline {result['baseline']} vs candidate {result['candidate']}"]
+    for name, changes in result["endpoints"].items():
+        if "missing_in" in changes:
+            lines.append(f"{name:<24} missing in {changes['missing_in']}")
+            continue
+        lines.append(
+            f"{name:<24} p50 {cell(name, 'p50_ms', '7.2f')} | "
+            f"p95 {cell(name, 'p95_ms', '7.2f')} | p99 {cell(name, 'p99_ms', '7.2f')} | "
+            f"rps {cell(name, 'rps', '7.1f')} | errors {cell(name, 'error_rate', '6.2%')} | "
+            f"409 {cell(name, 'conflict_rate', '6.2%')}"
+        )
+    lines.append(
+        f"{len(result['regressions'])} regressions (marked with !)"
+        if result["regressions"]
+        else "no regressions"
+    )
+    return "\n".join(lines)
+
+
+async def wait_until_ready(url: str, server: subprocess.Popen):
+    client = HttpClient(url)
+    deadline = time.perf_counter() + SERVER_START_TIMEOUT
+    try:
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    return
+            except OSError:
+                pass
+            await asyncio.sleep(0.5)
+        raise RuntimeError(f"server did not become ready at {url}")
+    finally:
+        await client.close()
+
+
+async def run_commit(commit: str, run_args: list[str], args) -> dict:
+    sha = subprocess.run(
+        ["git", "rev-parse", "--short", commit],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    url = f"http://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as root:
+        tree = os.path.join(root, sha)
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", tree, sha],
+            check=True,
+            capture_output=True,
+        )
+        try:
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "api.main:app",
+                    "--port",
+                    str(args.port),
+                    "--workers",
+                    str(args.workers),
+                    "--log-level",
+                    "warning",
+                ],
+                cwd=tree,
+                env={**os.environ, "PYTHONPATH": tree},
+            )
+            try:
+                await wait_until_ready(url, server)
+                print(f"running load against {commit} ({sha})", file=sys.stderr)
+                report = await run_load(
+                    build_parser().parse_args(
+                        [*run_args, "--target", url, "--label", commit]
+                    )
+                )
+            finally:
+                server.terminate()
+                server.wait()
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", tree], check=True)
+    report["commit"] = sha
+    return report
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare two load test reports and exit with 1 on regressions. "
+        "With --commits, run the load test against both commits first; "
+        "options after -- are passed to api.benchmarks.loadtest.run."
+    )
+    parser.add_argument("reports", nargs="*", help="BASELINE.json CANDIDATE.json")
+    parser.add_argument("--commits", nargs=2, metavar=("BASELINE", "CANDIDATE"))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument(
+        "--save-dir", help="with --commits, also write both reports here"
+    )
+    parser.add_argument("--latency-tolerance", type=float, default=0.15)
+    parser.add_argument("--min-latency-ms", type=float, default=1.0)
+    parser.add_argument("--rps-tolerance", type=float, default=0.10)
+    parser.add_argument("--error-tolerance", type=float, default=0.005)
+    parser.add_argument(
+        "--min-requests",
+        type=int,
+        default=50,
+        help="do not flag endpoints with fewer requests than this",
+    )
+    parser.add_argument("--output", help="write the comparison as JSON here")
+    argv = sys.argv[1:]
+    run_args = []
+    if "--" in argv:
+        argv, run_args = argv[: argv.index("--")], argv[argv.index("--") + 1 :]
+    args = parser.parse_args(argv)
+
+    if args.commits:
+        try:
+            baseline, candidate = [
+                await run_commit(commit, run_args, args) for commit in args.commits
+            ]
+        finally:
+            await engine.dispose()
+        if args.save_dir:
+            os.makedirs(args.save_dir, exist_ok=True)
+            for report in (baseline, candidate):
+                write_report(
+                    report, os.path.join(args.save_dir, f"{report['commit']}.json")
+                )
+    elif len(args.reports) == 2:
+        baseline, candidate = [json.load(open(path)) for path in args.reports]
+    else:
+        parser.error("pass two report files or --commits BASELINE CANDIDATE")
+
+    result = compare(baseline, candidate, args)
+    print(format_comparison(baseline, candidate, result))
+    if args.output:
+        write_report(result, args.output)
+    sys.exit(1 if result["regressions"] else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
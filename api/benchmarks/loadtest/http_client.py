@@ -0,0 +1,93 @@
+import asyncio
+import json
+from typing import Any, Dict
+from urllib.parse import urlencode, urlsplit
+
+from api.benchmarks.asgi_client import AsgiResponse
+
+
+class HttpClient:
+    def __init__(self, base_url: str):
+        parsed = urlsplit(base_url)
+        self.__host = parsed.hostname or "127.0.0.1"
+        self.__port = parsed.port or 80
+        self.__reader = None
+        self.__writer = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, Any] | None = None,
+        json_body: Any = None,
+        headers: Dict[str, str] | None = None,
+    ) -> AsgiResponse:
+        body = b""
+        lines = [
+            f"{method} {path}{'?' + urlencode(params, doseq=True) if params else ''} HTTP/1.1",
+            f"Host: {self.__host}:{self.__port}",
+        ]
+        if json_body is not None:
+            body = json.dumps(json_body, default=str).encode()
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(body)}")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        message = ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+        reused = self.__writer is not None
+        try:
+            response = await self.__send(message)
+            if response is None and reused:
+                await self.close()
+                response = await self.__send(message)
+            if response is None:
+                raise ConnectionError("server closed the connection")
+        except BaseException:
+            await self.close()
+            raise
+        if response.headers.get("connection", "").lower() == "close":
+            await self.close()
+        return response
+
+    async def __send(self, message: bytes) -> AsgiResponse | None:
+        if self.__writer is None:
+            self.__reader, self.__writer = await asyncio.open_connection(
+                self.__host, self.__port
+            )
+        self.__writer.write(message)
+        await self.__writer.drain()
+
+        status_line = await self.__reader.readline()
+        if not status_line:
+            return None
+        response = AsgiResponse(status_code=int(status_line.split()[1]))
+        while (line := await self.__reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            response.headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in response.headers:
+            response.body = await self.__reader.readexactly(
+                int(response.headers["content-length"])
+            )
+        elif response.headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await self.__reader.readline()).split(b";")[0], 16):
+                chunks.append(await self.__reader.readexactly(size))
+                await self.__reader.readexactly(2)
+            await self.__reader.readline()
+            response.body = b"".join(chunks)
+        return response
+
+    async def close(self):
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__reader = self.__writer = None
+
+    async def get(self, path: str, **kwargs) -> AsgiResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> AsgiResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> AsgiResponse:
+        return await self.request("DELETE", path, **kwargs)
@@ -0,0 +1,84 @@
+import time
+from collections import defaultdict
+
+from api.benchmarks.stats import percentile
+
+CONFLICT = 409
+
+
+class Recorder:
+    def __init__(self):
+        self.__latencies = defaultdict(list)
+        self.__statuses = defaultdict(lambda: defaultdict(int))
+        self.__recording = False
+        self.__started = None
+        self.__elapsed = 0.0
+
+    def start(self):
+        self.__recording = True
+        self.__started = time.perf_counter()
+
+    def stop(self):
+        if self.__recording:
+            self.__elapsed = time.perf_counter() - self.__started
+            self.__recording = False
+
+    def record(self, endpoint: str, status_code: int, seconds: float):
+        if self.__recording:
+            self.__latencies[endpoint].append(seconds)
+            self.__statuses[endpoint][status_code] += 1
+
+    def summary(self) -> dict:
+        endpoints = {
+            endpoint: self.__summarize(latencies, self.__statuses[endpoint])
+            for endpoint, latencies in sorted(self.__latencies.items())
+        }
+        statuses = defaultdict(int)
+        for counts in self.__statuses.values():
+            for status_code, count in counts.items():
+                statuses[status_code] += count
+        every = [value for values in self.__latencies.values() for value in values]
+        return {
+            "duration_seconds": round(self.__elapsed, 3),
+            "total": self.__summarize(every, statuses) if every else {},
+            "endpoints": endpoints,
+        }
+
+    def __summarize(self, latencies: list[float], statuses: dict) -> dict:
+        requests = len(latencies)
+        errors = sum(
+            count
+            for status_code, count in statuses.items()
+            if status_code >= 500 or status_code == 0
+        )
+        return {
+            "requests": requests,
+            "rps": round(requests / self.__elapsed, 2) if self.__elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "max_ms": round(max(latencies) * 1000, 3),
+            "error_rate": round(errors / requests, 5),
+            "conflict_rate": round(statuses.get(CONFLICT, 0) / requests, 5),
+            "statuses": {
+                str(status_code): count
+                for status_code, count in sorted(statuses.items())
+            },
+        }
+
+
+def format_table(report: dict) -> str:
+    lines = [
+        f"{'endpoint':<24} {'requests':>8} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>7} {'409':>7}"
+    ]
+    rows = list(report["endpoints"].items())
+    if report["total"]:
+        rows.append(("total", report["total"]))
+    for endpoint, stats in rows:
+        lines.append(
+            f"{endpoint:<24} {stats['requests']:>8} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+            f"{stats['error_rate']:>7.2%} {stats['conflict_rate']:>7.2%}"
+        )
+    return "\n".join(lines)
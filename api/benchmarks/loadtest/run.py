@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.benchmarks.loadtest.http_client import HttpClient
+from api.benchmarks.loadtest.report import Recorder, format_table
+from api.benchmarks.loadtest.scenarios import PatientSession, Traffic
+from api.main import app
+from api.modules.db.db import engine
+from api.modules.user.password_hasher import pwd_context
+
+LOAD_EMAIL_DOMAIN = "@bench.load.local"
+LOAD_PASSWORD = "loadtest123"
+IN_PROCESS = "inprocess"
+
+
+async def seed(professionals: int, patients: int, slots: int) -> tuple[list, list]:
+    params = {
+        "domain": LOAD_EMAIL_DOMAIN,
+        "pattern": f"%{LOAD_EMAIL_DOMAIN}",
+        "professionals": professionals,
+        "patients": patients,
+        "slots": slots,
+        "password_hash": pwd_context.hash(LOAD_PASSWORD),
+    }
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "WITH removed AS (DELETE FROM schedule WHERE patient_id IN "
+                "(SELECT id FROM users WHERE email LIKE :pattern) "
+                "RETURNING availability_id) "
+                "UPDATE availabilities SET status = 'AVAILABLE' "
+                "WHERE status = 'TAKEN' AND id IN (SELECT availability_id FROM removed)"
+            ),
+            params,
+        )
+        await connection.execute(
+            text(
+                "DELETE FROM schedule WHERE professional_id IN "
+                "(SELECT id FROM users WHERE email LIKE :pattern)"
+            ),
+            params,
+        )
+        await connection.execute(
+            text(
+                "DELETE FROM availabilities WHERE owner_id IN "
+                "(SELECT id FROM users WHERE email LIKE :pattern)"
+            ),
+            params,
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status, crp) "
+                "SELECT 'Load Professional ' || g, 'professional' || g || :domain, "
+                ":password_hash, 'PROFESSIONAL', 'READY', 'CRP/L' || lpad(g::text, 7, '0') "
+                "FROM generate_series(1, :professionals) g "
+                "UNION ALL "
+                "SELECT 'Load Patient ' || g, 'patient' || g || :domain, :password_hash, "
+                "'PATIENT', 'READY', NULL FROM generate_series(1, :patients) g "
+                "ON CONFLICT (email) DO UPDATE SET password_hash = EXCLUDED.password_hash"
+            ),
+            params,
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+                "SELECT u.id, s.start_time, s.start_time + interval '50 minutes', 'AVAILABLE' "
+                "FROM users u CROSS JOIN generate_series(0, :slots - 1) k "
+                "CROSS JOIN LATERAL (SELECT date_trunc('day', now()) + interval '1 day' "
+                "+ (k / 10) * interval '1 day' + (8 + k % 10) * interval '1 hour' "
+                "AS start_time) s "
+                "WHERE u.email LIKE :pattern AND u.role = 'PROFESSIONAL'"
+            ),
+            params,
+        )
+        professional_ids = (
+            await connection.scalars(
+                text(
+                    "SELECT id FROM users WHERE email LIKE :pattern "
+                    "AND role = 'PROFESSIONAL' ORDER BY email"
+                ),
+                params,
+            )
+        ).all()
+    return [str(professional_id) for professional_id in professional_ids], [
+        f"patient{number}{LOAD_EMAIL_DOMAIN}" for number in range(1, patients + 1)
+    ]
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run patient traffic (login, browse, book, cancel, list) against the API "
+        "and report throughput and latency per endpoint as JSON."
+    )
+    parser.add_argument(
+        "--target",
+        default=IN_PROCESS,
+        help=f"'{IN_PROCESS}' to call the app in this process, "
+        "or a base URL such as http://127.0.0.1:8000",
+    )
+    parser.add_argument("--users", type=int, default=20, help="concurrent patients")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="seconds excluded from the report"
+    )
+    parser.add_argument("--actions-per-login", type=int, default=20)
+    parser.add_argument(
+        "--think-ms", type=float, default=0, help="mean pause between actions"
+    )
+    parser.add_argument("--professionals", type=int, default=50)
+    parser.add_argument("--patients", type=int, default=500)
+    parser.add_argument("--slots", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", help="name stored in the report (default: commit)")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    return parser
+
+
+async def run_load(args) -> dict:
+    professional_ids, patient_emails = await seed(
+        args.professionals, args.patients, args.slots
+    )
+    traffic = Traffic(professional_ids, LOAD_PASSWORD, args.seed)
+    recorder = Recorder()
+    clients = [
+        AsgiClient(app) if args.target == IN_PROCESS else HttpClient(args.target)
+        for _ in range(args.users)
+    ]
+    sessions = [
+        PatientSession(
+            client,
+            recorder,
+            traffic,
+            patient_emails[index % len(patient_emails)],
+            random.Random(args.seed * 100003 + index),
+            args.actions_per_login,
+            args.think_ms / 1000,
+        )
+        for index, client in enumerate(clients)
+    ]
+
+    async def measure():
+        await asyncio.sleep(args.warmup)
+        recorder.start()
+        await asyncio.sleep(args.duration)
+        recorder.stop()
+
+    started_at = datetime.now(timezone.utc)
+    deadline = time.perf_counter() + args.warmup + args.duration
+    await asyncio.gather(measure(), *(session.run(deadline) for session in sessions))
+    for client in clients:
+        if isinstance(client, HttpClient):
+            await client.close()
+
+    commit = current_commit()
+    return {
+        "label": args.label or commit,
+        "commit": commit,
+        "started_at": started_at.isoformat(),
+        "config": {
+            "target": args.target,
+            "users": args.users,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "actions_per_login": args.actions_per_login,
+            "think_ms": args.think_ms,
+            "professionals": args.professionals,
+            "patients": args.patients,
+            "slots": args.slots,
+            "seed": args.seed,
+        },
+        **recorder.summary(),
+    }
+
+
+def write_report(report: dict, output: str | None):
+    content = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as file:
+            file.write(content + "\n")
+    else:
+        print(content)
+
+
+async def main():
+    args = build_parser().parse_args()
+    try:
+        report = await run_load(args)
+    finally:
+        await engine.dispose()
+    print(format_table(report), file=sys.stderr)
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+import asyncio
+import itertools
+import random
+import time
+
+from api.benchmarks.loadtest.report import Recorder
+
+LOGIN = "POST /user/login"
+BROWSE = "GET /availabilities"
+BROWSE_NEXT = "GET /availabilities/next"
+BOOK = "POST /schedule"
+CANCEL = "DELETE /schedule"
+LIST = "GET /schedule"
+
+ACTIONS = (BROWSE, LIST, BOOK, CANCEL)
+ACTION_WEIGHTS = (55, 20, 15, 10)
+NEXT_SLOTS_RATIO = 0.3
+PARETO_ALPHA = 1.16
+
+
+class Traffic:
+    def __init__(self, professional_ids: list[str], password: str, seed: int):
+        rng = random.Random(seed)
+        self.professional_ids = professional_ids
+        self.password = password
+        self.professional_weights = list(
+            itertools.accumulate(
+                rng.paretovariate(PARETO_ALPHA) for _ in professional_ids
+            )
+        )
+
+    def professional(self, rng: random.Random) -> str:
+        return rng.choices(
+            self.professional_ids, cum_weights=self.professional_weights
+        )[0]
+
+
+class PatientSession:
+    def __init__(
+        self,
+        client,
+        recorder: Recorder,
+        traffic: Traffic,
+        email: str,
+        rng: random.Random,
+        actions_per_login: int,
+        think_seconds: float,
+    ):
+        self.__client = client
+        self.__recorder = recorder
+        self.__traffic = traffic
+        self.__email = email
+        self.__rng = rng
+        self.__actions_per_login = actions_per_login
+        self.__think_seconds = think_seconds
+        self.__headers = None
+        self.__available = []
+        self.__booked = []
+
+    async def run(self, deadline: float):
+        while time.perf_counter() < deadline:
+            response = await self.__call(
+                LOGIN,
+                "POST",
+                "/user/login",
+                json_body={"email": self.__email, "password": self.__traffic.password},
+            )
+            if response is None or response.status_code != 200:
+                await asyncio.sleep(self.__think_seconds or 0.1)
+                continue
+            self.__headers = {
+                "Authorization": f"Bearer {response.json()['access_token']}"
+            }
+            for _ in range(self.__actions_per_login):
+                if time.perf_counter() >= deadline:
+                    return
+                action = self.__rng.choices(ACTIONS, ACTION_WEIGHTS)[0]
+                if action == BOOK and self.__available:
+                    await self.__book()
+                elif action == CANCEL and self.__booked:
+                    await self.__cancel()
+                elif action == LIST:
+                    await self.__list()
+                else:
+                    await self.__browse()
+                if self.__think_seconds:
+                    await asyncio.sleep(
+                        self.__rng.expovariate(1 / self.__think_seconds)
+                    )
+
+    async def __browse(self):
+        if self.__rng.random() < NEXT_SLOTS_RATIO:
+            response = await self.__call(
+                BROWSE_NEXT, "GET", "/availabilities/next", params={"n": 20}
+            )
+        else:
+            response = await self.__call(
+                BROWSE,
+                "GET",
+                "/availabilities",
+                params={
+                    "professional_id": self.__traffic.professional(self.__rng),
+                    "time_filter": "ALL",
+                    "limit": 50,
+                },
+            )
+        if response is not None and response.status_code == 200:
+            self.__available = [slot["id"] for slot in response.json()]
+
+    async def __book(self):
+        availability_id = self.__available.pop(
+            self.__rng.randrange(len(self.__available))
+        )
+        response = await self.__call(
+            BOOK,
+            "POST",
+            "/schedule",
+            json_body={"availability_id": availability_id},
+        )
+        if response is not None and response.status_code == 200:
+            self.__booked.append(response.json()["schedule_id"])
+
+    async def __cancel(self):
+        schedule_id = self.__booked.pop(self.__rng.randrange(len(self.__booked)))
+        await self.__call(
+            CANCEL, "DELETE", "/schedule", params={"schedule_id": schedule_id}
+        )
+
+    async def __list(self):
+        await self.__call(
+            LIST,
+            "GET",
+            "/schedule",
+            params={"time_filter": "ALL", "limit": 50, "timezone": "America/Sao_Paulo"},
+        )
+
+    async def __call(self, endpoint: str, method: str, path: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.__client.request(
+                method, path, headers=self.__headers, **kwargs
+            )
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            self.__recorder.record(endpoint, 0, time.perf_counter() - started)
+            return None
+        self.__recorder.record(
+            endpoint, response.status_code, time.perf_counter() - started
+        )
+        return response
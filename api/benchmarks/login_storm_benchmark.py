@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.benchmarks.stats import percentile
+from api.main import app
+
+BENCH_EMAIL = "bench.login.storm@agenda.local"
+BENCH_PASSWORD = "bench-password"
+
+
+async def prepare(client: AsgiClient) -> dict:
+    await client.post(
+        "/user/register",
+        json_body={"email": BENCH_EMAIL, "password": BENCH_PASSWORD, "name": "Bench"},
+    )
+    response = await client.post(
+        "/user/login", json_body={"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    )
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def run_phase(client, headers, readers: int, logins: int, duration: float):
+    deadline = time.perf_counter() + duration
+    read_latencies = []
+    login_status = {}
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.get("/user/all", params={"limit": 10}, headers=headers)
+            read_latencies.append(time.perf_counter() - started)
+
+    async def login():
+        while time.perf_counter() < deadline:
+            response = await client.post(
+                "/user/login",
+                json_body={"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+            )
+            login_status[response.status_code] = (
+                login_status.get(response.status_code, 0) + 1
+            )
+            if response.status_code == 503:
+                await asyncio.sleep(0.01)
+
+    await asyncio.gather(
+        *(reader() for _ in range(readers)), *(login() for _ in range(logins))
+    )
+
+    return {
+        "reads": len(read_latencies),
+        "reads_per_second": round(len(read_latencies) / duration, 1),
+        "read_p50_ms": round(percentile(read_latencies, 50) * 1000, 2),
+        "read_p99_ms": round(percentile(read_latencies, 99) * 1000, 2),
+        "read_mean_ms": round(
+            statistics.fmean(read_latencies) * 1000 if read_latencies else 0, 2
+        ),
+        "logins_by_status": login_status,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Run login storms against normal authenticated reads."
+    )
+    parser.add_argument("--readers", type=int, default=10)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    client = AsgiClient(app)
+    headers = await prepare(client)
+
+    baseline = await run_phase(client, headers, args.readers, 0, args.duration)
+    print("reads only:  ", baseline)
+    storm = await run_phase(client, headers, args.readers, args.logins, args.duration)
+    print("login storm: ", storm)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import os
+import time
+
+os.environ["METRICS_ENABLED"] = "false"
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.benchmarks.stats import percentile
+from api.main import app
+from api.modules.db.db import engine
+from api.modules.db.query_counter import install_query_counter, remove_query_counter
+from api.modules.metrics.request_metrics import RequestMetricsMiddleware
+from api.modules.security.security_service import security_service
+
+
+async def run(
+    client: AsgiClient, path: str, params: dict, headers: dict, requests: int
+):
+    latencies = []
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path, params=params, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+    return latencies, time.process_time() - cpu_started
+
+
+async def middleware_cost(requests: int) -> float:
+    async def empty_app(_scope, _receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def discard(_message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/"}
+    instrumented = RequestMetricsMiddleware(empty_app)
+    costs = []
+    for target in (empty_app, instrumented):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await target(scope, None, discard)
+        costs.append((time.perf_counter() - started) / requests)
+    return costs[1] - costs[0]
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare request latency and CPU with request metrics off and on."
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=4)
+    args = parser.parse_args()
+
+    async with engine.connect() as connection:
+        patient_id = await connection.scalar(
+            text("SELECT id FROM users WHERE role = 'PATIENT' LIMIT 1")
+        )
+    headers = {
+        "Authorization": "Bearer "
+        + security_service.auth({"user_id": str(patient_id)})["access_token"]
+    }
+    plain = AsgiClient(app)
+    instrumented = AsgiClient(RequestMetricsMiddleware(app))
+
+    endpoints = [
+        ("/health/ready", {}),
+        ("/user", {}),
+        ("/schedule", {"time_filter": "ALL"}),
+        ("/user/all", {"limit": 50}),
+    ]
+    print(
+        f"middleware cost per request: "
+        f"{await middleware_cost(args.requests * 100) * 1e6:.1f} us"
+    )
+    print(
+        f"{args.requests} requests per endpoint and mode, {args.rounds} alternating rounds"
+    )
+    for path, params in endpoints:
+        results = {"off": ([], 0.0), "on": ([], 0.0)}
+        for _ in range(args.rounds):
+            for mode, client in (("off", plain), ("on", instrumented)):
+                if mode == "on":
+                    install_query_counter(engine.sync_engine)
+                latencies, cpu = await run(client, path, params, headers, args.requests)
+                remove_query_counter(engine.sync_engine)
+                results[mode] = (results[mode][0] + latencies, results[mode][1] + cpu)
+
+        (off, off_cpu), (on, on_cpu) = results["off"], results["on"]
+        requests = len(off)
+        print(
+            f"{path:<14} p50 {percentile(off, 50) * 1000:6.3f} -> "
+            f"{percentile(on, 50) * 1000:6.3f} ms | "
+            f"p99 {percentile(on, 99) * 1000:6.3f} ms | "
+            f"cpu/request {off_cpu / requests * 1e6:7.1f} -> "
+            f"{on_cpu / requests * 1e6:7.1f} us "
+            f"({(on_cpu - off_cpu) / off_cpu:+.1%})"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import bisect
+import dataclasses
+import heapq
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.benchmarks.stats import percentile
+from api.config.settings import settings
+from api.modules.availabilities.availabilities_repository import (
+    AvailabilitiesRepository,
+)
+from api.modules.db.db import create_db_engine
+from api.modules.schedule.schedule_model import Schedule  # noqa: F401
+from api.modules.user.user_model import User  # noqa: F401
+
+BENCH_EMAIL_DOMAIN = "@bench.next.local"
+
+
+async def seed(connection, professionals: int, slots: int):
+    params = {
+        "domain": BENCH_EMAIL_DOMAIN,
+        "pattern": f"%{BENCH_EMAIL_DOMAIN}",
+        "professionals": professionals,
+        "slots": slots,
+    }
+    existing = await connection.scalar(
+        text(
+            "SELECT count(*) FROM availabilities a JOIN users u ON u.id = a.owner_id "
+            "WHERE u.email LIKE :pattern"
+        ),
+        params,
+    )
+    if existing == professionals * slots:
+        return
+
+    print(
+        f"seeding {professionals} professionals and {professionals * slots} availabilities..."
+    )
+    await connection.execute(
+        text(
+            "DELETE FROM availabilities WHERE owner_id IN "
+            "(SELECT id FROM users WHERE email LIKE :pattern)"
+        ),
+        params,
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO users (name, email, password_hash, role, status, crp) "
+            "SELECT 'Next Professional ' || g, 'professional' || g || :domain, 'x', "
+            "'PROFESSIONAL', 'READY', 'CRP/N' || lpad(g::text, 7, '0') "
+            "FROM generate_series(1, :professionals) g ON CONFLICT (email) DO NOTHING"
+        ),
+        params,
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+            "SELECT u.id, s.start_time, "
+            "s.start_time + CASE WHEN k % 5 = 0 THEN interval '90 minutes' "
+            "ELSE interval '50 minutes' END, "
+            "CASE WHEN k % 10 < 7 THEN 'AVAILABLE' WHEN k % 10 < 9 THEN 'TAKEN' ELSE 'CANCELED' END "
+            "FROM users u CROSS JOIN generate_series(0, :slots - 1) k "
+            "CROSS JOIN LATERAL (SELECT date_trunc('hour', now()) - interval '7 days' "
+            "+ k * interval '3 hours' + (hashtext(u.email) & 31) * interval '5 minutes' "
+            "AS start_time) s "
+            "WHERE u.email LIKE :pattern"
+        ),
+        params,
+    )
+
+
+async def professional_ids(connection, count: int) -> list:
+    result = await connection.execute(
+        text(
+            "SELECT id FROM users WHERE email LIKE :pattern ORDER BY email LIMIT :count"
+        ),
+        {"pattern": f"%{BENCH_EMAIL_DOMAIN}", "count": count},
+    )
+    return result.scalars().all()
+
+
+class InMemorySlots:
+    def __init__(self, rows):
+        self.__slots = defaultdict(list)
+        for owner_id, start_time, end_time, availability_id in rows:
+            self.__slots[owner_id].append((start_time, availability_id, end_time))
+        for slots in self.__slots.values():
+            slots.sort()
+
+    def __len__(self):
+        return sum(len(slots) for slots in self.__slots.values())
+
+    def next(self, after, limit, owner_ids=None, min_duration=None):
+        def upcoming(slots):
+            position = bisect.bisect_left(slots, (after,))
+            for slot in islice(slots, position, None):
+                if min_duration is None or slot[2] - slot[0] >= min_duration:
+                    yield slot
+
+        owners = owner_ids or self.__slots.keys()
+        return list(
+            islice(
+                heapq.merge(*(upcoming(self.__slots[owner]) for owner in owners)),
+                limit,
+            )
+        )
+
+
+def percentiles(samples: list[float]) -> str:
+    return (
+        f"p50 {percentile(samples, 50):8.2f} ms | p95 {percentile(samples, 95):8.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the earliest-available-slots search against a large dataset."
+    )
+    parser.add_argument("--professionals", type=int, default=10000)
+    parser.add_argument("--slots", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument(
+        "--skip-memory",
+        action="store_true",
+        help="do not compare with the in-memory k-way merge",
+    )
+    args = parser.parse_args()
+
+    engine = create_db_engine(
+        dataclasses.replace(settings, db_statement_timeout_ms=0), pool_name="next"
+    )
+    async with engine.begin() as connection:
+        await seed(connection, args.professionals, args.slots)
+    async with engine.connect() as connection:
+        await connection.execute(text("ANALYZE users, availabilities"))
+        await connection.commit()
+        few = await professional_ids(connection, 10)
+        many = await professional_ids(connection, 50)
+
+    now = datetime.now(timezone.utc)
+    hour = timedelta(hours=1)
+    scenarios = [
+        ("next 10, anyone", dict(limit=10)),
+        ("next 100, anyone", dict(limit=100)),
+        ("next 10, anyone, >= 60 min", dict(limit=10, min_duration=hour)),
+        ("next 10, 10 professionals", dict(limit=10, owner_ids=few)),
+        ("next 10, 50 professionals", dict(limit=10, owner_ids=many)),
+        (
+            "next 10, 50 professionals, >= 60 min",
+            dict(limit=10, owner_ids=many, min_duration=hour),
+        ),
+    ]
+
+    print(
+        f"professionals: {args.professionals}, availabilities: "
+        f"{args.professionals * args.slots}, runs: {args.runs}"
+    )
+    results = {}
+    async with AsyncSession(engine) as db:
+        repo = AvailabilitiesRepository(db)
+        for name, options in scenarios:
+            samples = []
+            for run in range(args.runs):
+                after = now + timedelta(minutes=run * 37)
+                started = time.perf_counter()
+                rows = await repo.find_next_available(after, **options)
+                samples.append((time.perf_counter() - started) * 1000)
+                db.expunge_all()
+            results[name] = [(row.start_time, row.id) for row in rows]
+            print(f"sql    {name:<38} {percentiles(samples)}")
+
+    if not args.skip_memory:
+        started = time.perf_counter()
+        async with engine.connect() as connection:
+            rows = await connection.execute(
+                text(
+                    "SELECT owner_id, start_time, end_time, id FROM availabilities "
+                    "WHERE status = 'AVAILABLE' AND start_time >= :now"
+                ),
+                {"now": now},
+            )
+            memory = InMemorySlots(rows.all())
+        print(
+            f"memory load of {len(memory)} upcoming slots: "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+        for name, options in scenarios:
+            samples = []
+            for run in range(args.runs):
+                after = now + timedelta(minutes=run * 37)
+                started = time.perf_counter()
+                slots = memory.next(after, **options)
+                samples.append((time.perf_counter() - started) * 1000)
+            same = [(slot[0], slot[1]) for slot in slots] == results[name]
+            print(
+                f"memory {name:<38} {percentiles(samples)} "
+                f"{'same result' if same else 'DIFFERENT RESULT'}"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.main import app
+from api.modules.db.db import engine
+
+BENCH_PASSWORD = "bench-password"
+
+OVERLAPPING_ROWS_QUERY = text(
+    "SELECT count(*) FROM availabilities a JOIN availabilities b "
+    "ON a.owner_id = b.owner_id AND a.id < b.id "
+    "AND tstzrange(a.start_time, a.end_time) && tstzrange(b.start_time, b.end_time) "
+    "WHERE a.owner_id = :owner_id"
+)
+
+
+async def login_professional(client: AsgiClient) -> tuple[dict, str]:
+    suffix = uuid.uuid4().hex[:8]
+    email = f"bench.overlap.{suffix}@agenda.local"
+    response = await client.post(
+        "/user/register",
+        json_body={
+            "email": email,
+            "password": BENCH_PASSWORD,
+            "name": "Bench Overlap",
+            "crp": f"CRP/{suffix[:2]}-{int(suffix, 16) % 100000:05d}",
+        },
+    )
+    owner_id = response.json()["id"]
+
+    async def login():
+        response = await client.post(
+            "/user/login", json_body={"email": email, "password": BENCH_PASSWORD}
+        )
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    await client.get("/user/verify-crp", headers=await login())
+    return await login(), owner_id
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Fire parallel overlapping availability creates and check only one wins."
+    )
+    parser.add_argument("--parallel", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    client = AsgiClient(app)
+    headers, owner_id = await login_professional(client)
+    base = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=365)
+    failures = 0
+
+    for round_number in range(args.rounds):
+        start = base + timedelta(days=round_number)
+
+        async def create(offset: int):
+            slot_start = start + timedelta(minutes=offset)
+            response = await client.post(
+                "/availabilities",
+                headers=headers,
+                json_body={
+                    "start_time": slot_start.isoformat(),
+                    "end_time": (slot_start + timedelta(minutes=50)).isoformat(),
+                    "status": "AVAILABLE",
+                },
+            )
+            return response.status_code
+
+        statuses = await asyncio.gather(*(create(i) for i in range(args.parallel)))
+        created = statuses.count(200)
+        conflicts = statuses.count(409)
+        ok = created == 1 and conflicts == args.parallel - 1
+        failures += not ok
+        print(
+            f"round {round_number + 1:>3}: created {created}, 409 {conflicts}, "
+            f"other {args.parallel - created - conflicts} {'ok' if ok else 'FAIL'}"
+        )
+
+    async with engine.connect() as connection:
+        overlapping = await connection.scalar(
+            OVERLAPPING_ROWS_QUERY, {"owner_id": owner_id}
+        )
+    print(f"overlapping pairs stored: {overlapping}")
+    await engine.dispose()
+
+    if failures or overlapping:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
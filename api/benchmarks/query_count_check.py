@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import re
+import sys
+
+from sqlalchemy import text
+
+from api.benchmarks.asgi_client import AsgiClient
+from api.main import app
+from api.modules.db.db import engine
+from api.modules.db.query_counter import count_queries, install_query_counter
+from api.modules.security.security_service import security_service
+
+BENCH_EMAIL_DOMAIN = "@bench.querycount.local"
+MAX_QUERIES_PER_REQUEST = 3
+READS_AVAILABILITIES = re.compile(r"\bavailabilities\b", re.IGNORECASE)
+
+
+async def seed(rows: int) -> str:
+    pattern = {"pattern": f"%{BENCH_EMAIL_DOMAIN}"}
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "DELETE FROM schedule WHERE patient_id IN "
+                "(SELECT id FROM users WHERE email LIKE :pattern)"
+            ),
+            pattern,
+        )
+        await connection.execute(
+            text(
+                "DELETE FROM availabilities WHERE owner_id IN "
+                "(SELECT id FROM users WHERE email LIKE :pattern)"
+            ),
+            pattern,
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status, crp) "
+                "SELECT 'Bench ' || g, 'pro' || g || :domain, 'x', 'PROFESSIONAL', 'READY', "
+                "'CRP/Q' || lpad(g::text, 7, '0') "
+                "FROM generate_series(1, :rows) g ON CONFLICT (email) DO NOTHING"
+            ),
+            {"domain": BENCH_EMAIL_DOMAIN, "rows": rows},
+        )
+        patient_id = await connection.scalar(
+            text(
+                "INSERT INTO users (name, email, password_hash, role, status) "
+                "VALUES ('Bench Patient', :email, 'x', 'PATIENT', 'READY') "
+                "ON CONFLICT (email) DO UPDATE SET name = EXCLUDED.name RETURNING id"
+            ),
+            {"email": f"patient{BENCH_EMAIL_DOMAIN}"},
+        )
+        await connection.execute(
+            text(
+                "WITH slots AS ("
+                "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+                "SELECT id, timestamptz '2041-01-01' + row_number() OVER () * interval '1 hour', "
+                "timestamptz '2041-01-01' + row_number() OVER () * interval '1 hour' "
+                "+ interval '50 minutes', 'TAKEN' "
+                "FROM users WHERE email LIKE :pattern AND role = 'PROFESSIONAL' "
+                "RETURNING id, owner_id) "
+                "INSERT INTO schedule (professional_id, patient_id, availability_id) "
+                "SELECT owner_id, :patient_id, id FROM slots"
+            ),
+            {**pattern, "patient_id": patient_id},
+        )
+    return str(patient_id)
+
+
+async def count(
+    client: AsgiClient, path: str, params: dict, headers: dict
+) -> list[str]:
+    with count_queries(capture_statements=True) as counter:
+        response = await client.get(path, params=params, headers=headers)
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} {params} returned {response.status_code}")
+    return counter.statements
+
+
+async def check_summary(client: AsgiClient, headers: dict) -> bool:
+    async with engine.connect() as connection:
+        professional_id = await connection.scalar(
+            text(
+                "SELECT id FROM users WHERE email LIKE :pattern "
+                "AND role = 'PROFESSIONAL' LIMIT 1"
+            ),
+            {"pattern": f"%{BENCH_EMAIL_DOMAIN}"},
+        )
+    params = {"professional_id": str(professional_id), "from": "2041-01-01"}
+    statements = await count(
+        client, "/availabilities/summary", {**params, "to": "2041-02-01"}, headers
+    )
+    live = [
+        statement for statement in statements if READS_AVAILABILITIES.search(statement)
+    ]
+    print(
+        f"{'/availabilities/summary':<24} default timezone reads availabilities: "
+        f"{len(live)} {'FAIL' if live else 'ok'}"
+    )
+    for statement in live:
+        print(f"    {statement[:200]}")
+    return not live
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Check that list endpoints run a fixed number of queries regardless of page size."
+    )
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    install_query_counter(engine.sync_engine)
+    patient_id = await seed(args.rows)
+    token = security_service.auth({"user_id": patient_id})["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client = AsgiClient(app)
+    await client.get("/user", headers=headers)
+
+    checks = [
+        ("/availabilities", {"time_filter": "ALL", "status": "TAKEN"}),
+        ("/availabilities", {"time_filter": "ALL", "status": "TAKEN", "cursor": ""}),
+        ("/schedule", {"time_filter": "ALL"}),
+        ("/user/all", {"role": "PROFESSIONAL"}),
+        ("/user/all", {"role": "PROFESSIONAL", "cursor": ""}),
+    ]
+    failed = False
+    for path, params in checks:
+        small = await count(client, path, {**params, "limit": 1}, headers)
+        large = await count(client, path, {**params, "limit": args.rows}, headers)
+        ok = len(small) == len(large) and len(large) <= MAX_QUERIES_PER_REQUEST
+        failed |= not ok
+        print(
+            f"{path:<16} {str(params):<60} limit=1: {len(small)} "
+            f"limit={args.rows}: {len(large)} {'ok' if ok else 'FAIL'}"
+        )
+        if not ok:
+            for statement in large:
+                print(f"    {statement[:200]}")
+
+    failed |= not await check_summary(client, headers)
+
+    await engine.dispose()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
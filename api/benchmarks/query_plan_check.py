@@ -0,0 +1,354 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config.settings import settings
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.time_enum import TimeEnum
+from api.enum.user_roles_enum import UserRolesEnum
+from api.modules.availabilities.availabilities_repository import (
+    AvailabilitiesRepository,
+)
+from api.modules.db.db import create_db_engine
+from api.modules.schedule.schedule_repository import ScheduleRepository
+from api.modules.time_window.time_window import resolve_window
+from api.modules.user.user_repository import UserRepository
+
+BENCH_EMAIL_DOMAIN = "@bench.plans.local"
+HOT_TABLES = ("users", "availabilities", "schedule")
+PAGE_SIZE = 50
+
+
+async def seed(connection, professionals: int, patients: int, slots: int):
+    params = {
+        "domain": BENCH_EMAIL_DOMAIN,
+        "pattern": f"professional%{BENCH_EMAIL_DOMAIN}",
+        "professionals": professionals,
+        "patients": patients,
+        "slots": slots,
+    }
+    existing = await connection.scalar(
+        text(
+            "SELECT count(*) FROM availabilities a JOIN users u ON u.id = a.owner_id "
+            "WHERE u.email LIKE :pattern"
+        ),
+        params,
+    )
+    if existing == professionals * slots:
+        return
+
+    print(
+        f"seeding {professionals} professionals, {patients} patients and "
+        f"{professionals * slots} availabilities..."
+    )
+    await connection.execute(
+        text(
+            "DELETE FROM schedule WHERE professional_id IN "
+            "(SELECT id FROM users WHERE email LIKE :pattern)"
+        ),
+        params,
+    )
+    await connection.execute(
+        text(
+            "DELETE FROM availabilities WHERE owner_id IN "
+            "(SELECT id FROM users WHERE email LIKE :pattern)"
+        ),
+        params,
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO users (name, email, password_hash, role, status, crp) "
+            "SELECT 'Plan Professional ' || g, 'professional' || g || :domain, 'x', "
+            "'PROFESSIONAL', 'READY', 'CRP/P' || lpad(g::text, 7, '0') "
+            "FROM generate_series(1, :professionals) g "
+            "UNION ALL "
+            "SELECT 'Plan Patient ' || g, 'patient' || g || :domain, 'x', 'PATIENT', 'READY', NULL "
+            "FROM generate_series(1, :patients) g "
+            "ON CONFLICT (email) DO NOTHING"
+        ),
+        params,
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO availabilities (owner_id, start_time, end_time, status) "
+            "SELECT u.id, date_trunc('hour', now()) - interval '180 days' + k * interval '7 hours', "
+            "date_trunc('hour', now()) - interval '180 days' + k * interval '7 hours' "
+            "+ interval '50 minutes', "
+            "CASE WHEN k % 10 < 7 THEN 'AVAILABLE' WHEN k % 10 < 9 THEN 'TAKEN' ELSE 'CANCELED' END "
+            "FROM users u CROSS JOIN generate_series(0, :slots - 1) k "
+            "WHERE u.email LIKE :pattern"
+        ),
+        params,
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO schedule (professional_id, patient_id, availability_id) "
+            "SELECT a.owner_id, p.id, a.id FROM ("
+            "SELECT a.id, a.owner_id, row_number() OVER () AS n FROM availabilities a "
+            "JOIN users u ON u.id = a.owner_id "
+            "WHERE u.email LIKE :pattern AND a.status <> 'AVAILABLE') a "
+            "JOIN users p ON p.email = 'patient' || (a.n % :patients + 1) || :domain"
+        ),
+        params,
+    )
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def first_row(rows):
+    async for _ in rows:
+        break
+    await rows.aclose()
+
+
+def build_checks(professional_id, patient_id, availability_id, schedule_id, email):
+    week = TimeEnum.WEEK
+    available = AvailabilityStatusEnum.AVAILABLE
+    taken = AvailabilityStatusEnum.TAKEN
+    now = datetime.now(timezone.utc)
+    week_window = resolve_window(week, None, None, "America/Sao_Paulo")
+    month_window = resolve_window(TimeEnum.MONTH, None, None, "UTC")
+    slots = [
+        (now + timedelta(days=3, hours=i), now + timedelta(days=3, hours=i, minutes=50))
+        for i in range(20)
+    ]
+
+    def availabilities(db):
+        return AvailabilitiesRepository(db)
+
+    def schedules(db):
+        return ScheduleRepository(db)
+
+    def users(db):
+        return UserRepository(db)
+
+    return [
+        (
+            "availabilities.find_by_id",
+            lambda db: availabilities(db).find_by_id(availability_id),
+        ),
+        (
+            "availabilities.list all/AVAILABLE/WEEK",
+            lambda db: availabilities(db).find_all_by_owner_id_status_and_time(
+                None, available, week, 0, PAGE_SIZE
+            ),
+        ),
+        (
+            "availabilities.list all/TAKEN/ALL",
+            lambda db: availabilities(db).find_all_by_owner_id_status_and_time(
+                None, taken, TimeEnum.ALL, 0, PAGE_SIZE
+            ),
+        ),
+        (
+            "availabilities.list owner/AVAILABLE/WEEK",
+            lambda db: availabilities(db).find_all_by_owner_id_status_and_time(
+                professional_id, available, week, 0, PAGE_SIZE
+            ),
+        ),
+        (
+            "availabilities.versions owner/TAKEN/ALL",
+            lambda db: availabilities(db).find_versions_by_owner_id_status_and_time(
+                professional_id, taken, TimeEnum.ALL, 0, PAGE_SIZE
+            ),
+        ),
+        (
+            "availabilities.page all/AVAILABLE/MONTH",
+            lambda db: availabilities(db).find_page_by_owner_id_status_and_time(
+                None, available, TimeEnum.MONTH, (now, availability_id), PAGE_SIZE + 1
+            ),
+        ),
+        (
+            "availabilities.page_versions owner/AVAILABLE/ALL",
+            lambda db: availabilities(
+                db
+            ).find_page_versions_by_owner_id_status_and_time(
+                professional_id, available, TimeEnum.ALL, None, PAGE_SIZE + 1
+            ),
+        ),
+        (
+            "availabilities.find_conflicting_slots",
+            lambda db: availabilities(db).find_conflicting_slots(
+                professional_id, slots
+            ),
+        ),
+        (
+            "availabilities.stream_for_export",
+            lambda db: first_row(
+                availabilities(db).stream_for_export(professional_id, None, None, 1000)
+            ),
+        ),
+        (
+            "availabilities.next anyone",
+            lambda db: availabilities(db).find_next_available(now, PAGE_SIZE),
+        ),
+        (
+            "availabilities.next professionals",
+            lambda db: availabilities(db).find_next_available(
+                now, PAGE_SIZE, [professional_id], timedelta(minutes=50)
+            ),
+        ),
+        ("schedule.find_by_id", lambda db: schedules(db).find_by_id(schedule_id)),
+        (
+            "schedule.list patient/ALL",
+            lambda db: schedules(db).find_by_user_in_range(
+                patient_id, UserRolesEnum.PATIENT, None, None
+            ),
+        ),
+        (
+            "schedule.list professional/week",
+            lambda db: schedules(db).find_by_user_in_range(
+                professional_id, UserRolesEnum.PROFESSIONAL, *week_window
+            ),
+        ),
+        (
+            "schedule.versions professional/month",
+            lambda db: schedules(db).find_versions_by_user_in_range(
+                professional_id, UserRolesEnum.PROFESSIONAL, *month_window, PAGE_SIZE
+            ),
+        ),
+        (
+            "schedule.find_calendar_entries",
+            lambda db: schedules(db).find_calendar_entries(
+                patient_id, now - timedelta(days=90)
+            ),
+        ),
+        (
+            "schedule.stream_for_export",
+            lambda db: first_row(
+                schedules(db).stream_for_export(professional_id, None, None, 1000)
+            ),
+        ),
+        ("users.find_by_id", lambda db: users(db).find_by_id(patient_id)),
+        ("users.find_by_email", lambda db: users(db).find_by_email(email)),
+        ("users.find_all", lambda db: users(db).find_all(0, PAGE_SIZE)),
+        (
+            "users.find_all_by_role",
+            lambda db: users(db).find_all_by_role(
+                UserRolesEnum.PROFESSIONAL, 0, PAGE_SIZE
+            ),
+        ),
+        (
+            "users.find_versions",
+            lambda db: users(db).find_versions(UserRolesEnum.PATIENT, 0, PAGE_SIZE),
+        ),
+        (
+            "users.find_page",
+            lambda db: users(db).find_page(
+                UserRolesEnum.PROFESSIONAL, None, PAGE_SIZE + 1
+            ),
+        ),
+        (
+            "users.find_page_versions",
+            lambda db: users(db).find_page_versions(None, None, PAGE_SIZE + 1),
+        ),
+    ]
+
+
+async def explain(connection, statement: str, parameters) -> dict:
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", tuple(parameters)
+    )
+    plan = result.scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Seed a large dataset and fail if a repository query plans a sequential scan."
+    )
+    parser.add_argument("--professionals", type=int, default=1000)
+    parser.add_argument("--patients", type=int, default=20000)
+    parser.add_argument("--slots", type=int, default=500)
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    engine = create_db_engine(
+        dataclasses.replace(settings, db_statement_timeout_ms=0), pool_name="plans"
+    )
+    async with engine.begin() as connection:
+        await seed(connection, args.professionals, args.patients, args.slots)
+    async with engine.connect() as connection:
+        await connection.execute(text("ANALYZE users, availabilities, schedule"))
+        await connection.commit()
+        professional_id, patient_id, availability_id, schedule_id = (
+            await connection.execute(
+                text(
+                    "SELECT s.professional_id, s.patient_id, s.availability_id, s.id "
+                    "FROM schedule s JOIN users u ON u.id = s.patient_id "
+                    "WHERE u.email = :email LIMIT 1"
+                ),
+                {"email": f"patient1{BENCH_EMAIL_DOMAIN}"},
+            )
+        ).one()
+
+    checks = build_checks(
+        professional_id,
+        patient_id,
+        availability_id,
+        schedule_id,
+        f"patient1{BENCH_EMAIL_DOMAIN}",
+    )
+
+    captured = []
+
+    def capture(_conn, _cursor, statement, parameters, *_args):
+        if any(
+            f" {table}" in statement for table in HOT_TABLES
+        ) and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    failed = False
+    for name, run in checks:
+        captured.clear()
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            async with AsyncSession(engine) as db:
+                await run(db)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        async with engine.connect() as connection:
+            for position, (statement, parameters) in enumerate(captured, start=1):
+                plan = await explain(connection, statement, parameters)
+                nodes = list(plan_nodes(plan["Plan"]))
+                seq_scans = sorted(
+                    {
+                        node["Relation Name"]
+                        for node in nodes
+                        if node["Node Type"] == "Seq Scan"
+                        and node.get("Relation Name") in HOT_TABLES
+                    }
+                )
+                indexes = sorted(
+                    {node["Index Name"] for node in nodes if "Index Name" in node}
+                )
+                root = plan["Plan"]
+                ok = not seq_scans
+                failed |= not ok
+                label = name if len(captured) == 1 else f"{name} #{position}"
+                print(
+                    f"{label:<52} {plan['Execution Time']:8.2f} ms | "
+                    f"buffers hit {root.get('Shared Hit Blocks', 0):6} read {root.get('Shared Read Blocks', 0):6} | "
+                    f"{'seq scan on ' + ', '.join(seq_scans) if seq_scans else ', '.join(indexes) or root['Node Type']} "
+                    f"{'ok' if ok else 'FAIL'}"
+                )
+                if args.verbose or not ok:
+                    print(statement)
+                    print(json.dumps(plan["Plan"], indent=2))
+
+    await engine.dispose()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+import argparse
+import json
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.user_roles_enum import UserRolesEnum
+from api.enum.user_status_enum import UserStatusEnum
+from api.modules.availabilities.availabilities_model import Availabilities
+from api.modules.availabilities.response.availabilities_response import (
+    availabilities_list_adapter,
+)
+from api.modules.schedule.response.schedule_response import schedule_list_adapter
+from api.modules.schedule.schedule_model import Schedule
+from api.modules.user.response.user_response import UserResponse
+from api.modules.user.user_model import User
+
+
+class LegacyAvailabilitiesResponse:
+    def __init__(self, availabilities: Availabilities):
+        self.id = availabilities.id
+        self.created_at = availabilities.created_at
+        self.status = availabilities.status
+        self.start_time = availabilities.start_time
+        self.end_time = availabilities.end_time
+        self.user = UserResponse.model_validate(
+            availabilities.user, from_attributes=True
+        )
+
+
+class LegacyScheduleResponse:
+    def __init__(self, schedule: Schedule):
+        self.id = schedule.id
+        self.patient_id = schedule.patient_id
+        self.availability_id = schedule.availability_id
+        self.status = schedule.availability.status
+        self.start_time = schedule.availability.start_time
+        self.created_at = schedule.created_at
+        self.user = UserResponse.model_validate(
+            schedule.availability.user, from_attributes=True
+        )
+
+
+def legacy_dump(rows, response_class) -> bytes:
+    return json.dumps(
+        jsonable_encoder([response_class(row) for row in rows]),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def build_rows(count: int):
+    now = datetime.now(timezone.utc)
+    professionals = [
+        User(
+            id=uuid.uuid4(),
+            name=f"Professional {i}",
+            email=f"professional{i}@bench.local",
+            role=UserRolesEnum.PROFESSIONAL,
+            status=UserStatusEnum.READY,
+            crp=f"CRP/01-{i:05d}",
+            bio="Psicóloga clínica",
+            created_at=now,
+        )
+        for i in range(20)
+    ]
+    availabilities = []
+    schedules = []
+    for i in range(count):
+        start = now + timedelta(hours=i)
+        availability = Availabilities(
+            id=uuid.uuid4(),
+            created_at=now,
+            status=AvailabilityStatusEnum.TAKEN,
+            start_time=start,
+            end_time=start + timedelta(minutes=50),
+        )
+        availability.user = professionals[i % len(professionals)]
+        availabilities.append(availability)
+
+        schedule = Schedule(
+            id=uuid.uuid4(),
+            patient_id=uuid.uuid4(),
+            availability_id=availability.id,
+            created_at=now,
+        )
+        schedule.availability = availability
+        schedules.append(schedule)
+    return availabilities, schedules
+
+
+def measure(serialize, rows, repeat: int):
+    serialize(rows)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        serialize(rows)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    serialize(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare list serialization with plain classes + jsonable_encoder vs TypeAdapters."
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    serializers = {
+        "availabilities legacy": (
+            0,
+            lambda rows: legacy_dump(rows, LegacyAvailabilitiesResponse),
+        ),
+        "availabilities adapter": (
+            0,
+            lambda rows: availabilities_list_adapter.dump_json(
+                availabilities_list_adapter.validate_python(rows, from_attributes=True)
+            ),
+        ),
+        "schedule legacy": (1, lambda rows: legacy_dump(rows, LegacyScheduleResponse)),
+        "schedule adapter": (
+            1,
+            lambda rows: schedule_list_adapter.dump_json(
+                schedule_list_adapter.validate_python(rows, from_attributes=True)
+            ),
+        ),
+    }
+
+    for count in args.rows:
+        data = build_rows(count)
+        print(f"rows: {count}")
+        for name, (index, serialize) in serializers.items():
+            elapsed, peak = measure(serialize, data[index], args.repeat)
+            print(
+                f"  {name:<24} {elapsed * 1000:8.2f} ms | "
+                f"{elapsed / count * 1e6:6.2f} us/row | "
+                f"peak allocated {peak / count:7.0f} B/row"
+            )
+
+
+if __name__ == "__main__":
+    main()
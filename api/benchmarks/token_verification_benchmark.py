@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import time
+from dataclasses import replace
+from datetime import timedelta
+
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi_jwt import JwtAccessBearerCookie
+
+from api.benchmarks.stats import percentile
+from api.config.settings import settings
+from api.modules.security.security_service import (
+    ACCESS_TOKEN_EXPIRE_HOURS,
+    SecurityService,
+)
+from api.modules.security.token_claims import TokenClaims
+
+
+def fresh_security():
+    return JwtAccessBearerCookie(
+        secret_key=settings.jwt_secret_key,
+        auto_error=True,
+        access_expires_delta=timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS),
+    )
+
+
+async def measure(name: str, get_security, bearers, iterations: int):
+    timings = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        security = get_security()
+        payload = await security._get_payload(bearers[i % len(bearers)], None)
+        TokenClaims.from_subject(payload["subject"])
+        timings.append(time.perf_counter() - started)
+
+    print(
+        f"{name:<22} mean: {sum(timings) / len(timings) * 1e6:8.1f} us | "
+        f"p50: {percentile(timings, 50) * 1e6:8.1f} us | "
+        f"p99: {percentile(timings, 99) * 1e6:8.1f} us"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Measure per-request JWT verification overhead."
+    )
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    cached = SecurityService()
+    uncached = SecurityService(replace(settings, jwt_verified_cache_max_entries=0))
+    bearers = [
+        HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=cached.auth(
+                {
+                    "user_id": "00000000-0000-0000-0000-%012d" % i,
+                    "role": "PROFESSIONAL",
+                    "status": "READY",
+                    "token_version": 0,
+                }
+            )["access_token"],
+        )
+        for i in range(args.tokens)
+    ]
+
+    print(f"iterations: {args.iterations}, distinct tokens: {args.tokens}")
+    await measure("new service per call", fresh_security, bearers, args.iterations)
+    await measure(
+        "shared, no cache", lambda: uncached.access_security, bearers, args.iterations
+    )
+    await measure(
+        "shared, verified cache",
+        lambda: cached.access_security,
+        bearers,
+        args.iterations,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
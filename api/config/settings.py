@@ -0,0 +1,164 @@
+import os
+from dataclasses import dataclass
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.getenv(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_list(name: str) -> tuple:
+    value = os.getenv(name, "")
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    db_host: str = "localhost"
+    db_port: int = 5432
+    db_user: str = "admin"
+    db_password: str = "admin"
+    db_name: str = "agenda"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 5000
+    db_application_name: str = "agenda-api"
+    db_replica_hosts: tuple = ()
+    db_replica_sticky_seconds: int = 5
+    db_replica_max_lag_seconds: int = 10
+    db_replica_health_interval_seconds: int = 5
+    db_replica_retry_after_seconds: int = 30
+    db_query_count_enabled: bool = False
+    db_query_count_header: bool = False
+
+    metrics_enabled: bool = True
+    metrics_n_plus_one_threshold: int = 5
+
+    slow_query_log_enabled: bool = False
+    slow_query_threshold_ms: int = 200
+    slow_query_explain_sample_rate: float = 0.1
+    slow_query_log_dir: str = ".slow_queries"
+    slow_query_log_max_entries: int = 1000
+
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    cache_backend: str = "memory"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_max_entries: int = 10000
+    availabilities_cache_ttl_seconds: int = 30
+    user_cache_max_entries: int = 10000
+    user_cache_ttl_seconds: int = 60
+    user_cache_version_check: bool = False
+    token_version_cache_ttl_seconds: int = 60
+    calendar_feed_cache_ttl_seconds: int = 86400
+    calendar_feed_past_days: int = 90
+
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+
+    jwt_secret_key: str = "secret_key"
+    jwt_verified_cache_max_entries: int = 10000
+
+    @property
+    def database_url(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.db_user}:{self.db_password}"
+            f"@{self.db_host}:{self.db_port}/{self.db_name}"
+        )
+
+    @property
+    def replica_urls(self) -> tuple:
+        urls = []
+        for host in self.db_replica_hosts:
+            name, _, port = host.partition(":")
+            urls.append(
+                f"postgresql+asyncpg://{self.db_user}:{self.db_password}"
+                f"@{name}:{port or self.db_port}/{self.db_name}"
+            )
+        return tuple(urls)
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            db_host=_env_str("DB_HOST", "localhost"),
+            db_port=_env_int("DB_PORT", 5432),
+            db_user=_env_str("DB_USER", "admin"),
+            db_password=_env_str("DB_PASSWORD", "admin"),
+            db_name=_env_str("DB_NAME", "agenda"),
+            db_pool_size=_env_int("DB_POOL_SIZE", 5),
+            db_max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+            db_pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+            db_pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+            db_pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+            db_statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", 5000),
+            db_application_name=_env_str("DB_APPLICATION_NAME", "agenda-api"),
+            db_replica_hosts=_env_list("DB_REPLICA_HOSTS"),
+            db_replica_sticky_seconds=_env_int("DB_REPLICA_STICKY_SECONDS", 5),
+            db_replica_max_lag_seconds=_env_int("DB_REPLICA_MAX_LAG_SECONDS", 10),
+            db_replica_health_interval_seconds=_env_int(
+                "DB_REPLICA_HEALTH_INTERVAL_SECONDS", 5
+            ),
+            db_replica_retry_after_seconds=_env_int(
+                "DB_REPLICA_RETRY_AFTER_SECONDS", 30
+            ),
+            db_query_count_enabled=_env_bool("DB_QUERY_COUNT_ENABLED", False),
+            db_query_count_header=_env_bool("DB_QUERY_COUNT_HEADER", False),
+            metrics_enabled=_env_bool("METRICS_ENABLED", True),
+            metrics_n_plus_one_threshold=_env_int("METRICS_N_PLUS_ONE_THRESHOLD", 5),
+            slow_query_log_enabled=_env_bool("SLOW_QUERY_LOG_ENABLED", False),
+            slow_query_threshold_ms=_env_int("SLOW_QUERY_THRESHOLD_MS", 200),
+            slow_query_explain_sample_rate=_env_float(
+                "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 0.1
+            ),
+            slow_query_log_dir=_env_str("SLOW_QUERY_LOG_DIR", ".slow_queries"),
+            slow_query_log_max_entries=_env_int("SLOW_QUERY_LOG_MAX_ENTRIES", 1000),
+            password_hash_executor=_env_str("PASSWORD_HASH_EXECUTOR", "thread"),
+            password_hash_workers=_env_int("PASSWORD_HASH_WORKERS", 4),
+            password_hash_max_pending=_env_int("PASSWORD_HASH_MAX_PENDING", 64),
+            cache_backend=_env_str("CACHE_BACKEND", "memory"),
+            cache_redis_url=_env_str("CACHE_REDIS_URL", "redis://localhost:6379/0"),
+            cache_max_entries=_env_int("CACHE_MAX_ENTRIES", 10000),
+            availabilities_cache_ttl_seconds=_env_int(
+                "AVAILABILITIES_CACHE_TTL_SECONDS", 30
+            ),
+            user_cache_max_entries=_env_int("USER_CACHE_MAX_ENTRIES", 10000),
+            user_cache_ttl_seconds=_env_int("USER_CACHE_TTL_SECONDS", 60),
+            user_cache_version_check=_env_bool("USER_CACHE_VERSION_CHECK", False),
+            token_version_cache_ttl_seconds=_env_int(
+                "TOKEN_VERSION_CACHE_TTL_SECONDS", 60
+            ),
+            calendar_feed_cache_ttl_seconds=_env_int(
+                "CALENDAR_FEED_CACHE_TTL_SECONDS", 86400
+            ),
+            calendar_feed_past_days=_env_int("CALENDAR_FEED_PAST_DAYS", 90),
+            compression_enabled=_env_bool("COMPRESSION_ENABLED", True),
+            compression_minimum_size=_env_int("COMPRESSION_MINIMUM_SIZE", 1024),
+            jwt_secret_key=_env_str("JWT_SECRET_KEY", "secret_key"),
+            jwt_verified_cache_max_entries=_env_int(
+                "JWT_VERIFIED_CACHE_MAX_ENTRIES", 10000
+            ),
+        )
+
+
+settings = Settings.from_env()
@@ -1,5 +1,7 @@
 CREATE
 EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE
+EXTENSION IF NOT EXISTS btree_gist;
 
 -- Users (patients and professionals)
 CREATE TABLE users
@@ -14,7 +16,10 @@ CREATE TABLE users
     phone         VARCHAR(20),
     bio           TEXT,
     image_url     TEXT,
-    created_at    TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at    TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at    TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    token_version INTEGER             NOT NULL DEFAULT 0, -- incrementado para revogar access tokens
+    credential_version INTEGER        NOT NULL DEFAULT 0  -- incrementado na troca de senha para revogar refresh tokens
 );
 
 -- Availabilities (horários disponíveis para profissionais)
@@ -25,9 +30,11 @@ CREATE TABLE availabilities
     start_time TIMESTAMP WITH TIME ZONE NOT NULL,
     end_time   TIMESTAMP WITH TIME ZONE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     status     VARCHAR(50)              DEFAULT 'AVAILABLE', -- AVAILABLE / TAKEN / COMPLETED / CANCELED
     CONSTRAINT fk_owner FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE,
-    UNIQUE (owner_id, start_time, end_time)
+    UNIQUE (owner_id, start_time, end_time),
+    CONSTRAINT availabilities_no_overlap EXCLUDE USING gist (owner_id WITH =, tstzrange(start_time, end_time) WITH &&)
 );
 
 -- Schedule (consultas agendadas)
@@ -37,16 +44,172 @@ CREATE TABLE schedule
     professional_id UUID NOT NULL,
     patient_id      UUID NOT NULL,
     availability_id UUID NOT NULL,
+    start_time      TIMESTAMP WITH TIME ZONE NOT NULL, -- cópia de availabilities.start_time, preenchida por trigger
     created_at      TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at      TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_professional FOREIGN KEY (professional_id) REFERENCES users (id),
     CONSTRAINT fk_patient FOREIGN KEY (patient_id) REFERENCES users (id),
     CONSTRAINT fk_availability FOREIGN KEY (availability_id) REFERENCES availabilities (id),
     UNIQUE (availability_id)
 );
 
-CREATE INDEX idx_schedule_patient ON schedule (patient_id);
-CREATE INDEX idx_schedule_professional ON schedule (professional_id);
+-- Availability day counts (slots por profissional, dia e status; mantido por trigger em availabilities)
+CREATE TABLE availability_day_counts
+(
+    owner_id UUID        NOT NULL,
+    day      DATE        NOT NULL, -- dia em America/Sao_Paulo, ver availability_day()
+    status   VARCHAR(50) NOT NULL,
+    slots    INTEGER     NOT NULL,
+    PRIMARY KEY (owner_id, day, status),
+    CONSTRAINT fk_owner FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Calendar versions (versão do feed .ics de cada usuário; mantida por triggers em schedule, availabilities e users)
+CREATE TABLE calendar_versions
+(
+    user_id UUID PRIMARY KEY,
+    version BIGINT NOT NULL,
+    CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_schedule_patient_start_time_id ON schedule (patient_id, start_time, id) INCLUDE (availability_id, updated_at);
+CREATE INDEX idx_schedule_professional_start_time_id ON schedule (professional_id, start_time, id) INCLUDE (availability_id, updated_at);
 CREATE INDEX idx_availabilities_owner ON availabilities (owner_id);
+CREATE INDEX idx_availabilities_start_time_id ON availabilities (start_time, id);
+CREATE INDEX idx_users_created_at_id ON users (created_at, id);
+CREATE INDEX idx_availabilities_status_start_time_id ON availabilities (status, start_time, id);
+CREATE INDEX idx_availabilities_owner_status_start_time_id ON availabilities (owner_id, status, start_time, id);
+CREATE INDEX idx_availabilities_available_start_time_id ON availabilities (start_time, id) WHERE status = 'AVAILABLE';
+CREATE INDEX idx_users_role_created_at_id ON users (role, created_at, id);
+
+-- updated_at acompanha qualquer UPDATE (usado para gerar os ETags das listagens)
+CREATE FUNCTION set_updated_at() RETURNS trigger AS
+$$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER users_set_updated_at
+    BEFORE UPDATE
+    ON users
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+CREATE TRIGGER availabilities_set_updated_at
+    BEFORE UPDATE
+    ON availabilities
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+CREATE TRIGGER schedule_set_updated_at
+    BEFORE UPDATE
+    ON schedule
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+-- schedule.start_time acompanha o horário agendado (listagens por paciente/profissional sem join no filtro)
+CREATE FUNCTION set_schedule_start_time() RETURNS trigger AS
+$$
+BEGIN
+    IF NEW.start_time IS NULL THEN
+        SELECT start_time INTO NEW.start_time FROM availabilities WHERE id = NEW.availability_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER schedule_set_start_time
+    BEFORE INSERT
+    ON schedule
+    FOR EACH ROW
+EXECUTE FUNCTION set_schedule_start_time();
+
+-- availability_day_counts acompanha cada insert, troca de status e delete em availabilities
+CREATE FUNCTION availability_day(start_time TIMESTAMP WITH TIME ZONE) RETURNS DATE AS
+$$
+SELECT (start_time AT TIME ZONE 'America/Sao_Paulo')::date;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE FUNCTION count_availability_day() RETURNS trigger AS
+$$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE availability_day_counts
+        SET slots = slots - 1
+        WHERE owner_id = OLD.owner_id
+          AND day = availability_day(OLD.start_time)
+          AND status = OLD.status;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO availability_day_counts (owner_id, day, status, slots)
+        VALUES (NEW.owner_id, availability_day(NEW.start_time), NEW.status, 1)
+        ON CONFLICT (owner_id, day, status) DO UPDATE SET slots = availability_day_counts.slots + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER availabilities_count_day_insert_delete
+    AFTER INSERT OR DELETE
+    ON availabilities
+    FOR EACH ROW
+EXECUTE FUNCTION count_availability_day();
+CREATE TRIGGER availabilities_count_day_update
+    AFTER UPDATE OF owner_id, start_time, status
+    ON availabilities
+    FOR EACH ROW
+    WHEN ((OLD.owner_id, OLD.start_time, OLD.status) IS DISTINCT FROM (NEW.owner_id, NEW.start_time, NEW.status))
+EXECUTE FUNCTION count_availability_day();
+
+-- calendar_versions muda a cada agendamento/cancelamento, troca de horário/status agendado e renomeação de usuário
+CREATE FUNCTION bump_calendar_versions(user_ids UUID[]) RETURNS void AS
+$$
+INSERT INTO calendar_versions (user_id, version)
+SELECT DISTINCT unnest(user_ids), 1
+ORDER BY 1
+ON CONFLICT (user_id) DO UPDATE SET version = calendar_versions.version + 1;
+$$ LANGUAGE sql;
+
+CREATE FUNCTION calendar_feed_changed() RETURNS trigger AS
+$$
+BEGIN
+    IF TG_TABLE_NAME = 'schedule' THEN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM bump_calendar_versions(ARRAY [OLD.professional_id, OLD.patient_id]);
+        ELSE
+            PERFORM bump_calendar_versions(ARRAY [NEW.professional_id, NEW.patient_id]);
+        END IF;
+    ELSIF TG_TABLE_NAME = 'availabilities' THEN
+        PERFORM bump_calendar_versions(ARRAY [s.professional_id, s.patient_id])
+        FROM schedule s
+        WHERE s.availability_id = NEW.id;
+    ELSE
+        PERFORM bump_calendar_versions(NEW.id || ARRAY(
+                SELECT patient_id FROM schedule WHERE professional_id = NEW.id
+                UNION
+                SELECT professional_id FROM schedule WHERE patient_id = NEW.id));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER schedule_bump_calendar_versions
+    AFTER INSERT OR DELETE
+    ON schedule
+    FOR EACH ROW
+EXECUTE FUNCTION calendar_feed_changed();
+CREATE TRIGGER availabilities_bump_calendar_versions
+    AFTER UPDATE OF start_time, end_time, status
+    ON availabilities
+    FOR EACH ROW
+    WHEN ((OLD.start_time, OLD.end_time, OLD.status) IS DISTINCT FROM (NEW.start_time, NEW.end_time, NEW.status))
+EXECUTE FUNCTION calendar_feed_changed();
+CREATE TRIGGER users_bump_calendar_versions
+    AFTER UPDATE OF name
+    ON users
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION calendar_feed_changed();
 
 -- Insert Users
 INSERT INTO users (name, email, password_hash, role, status, crp)
@@ -0,0 +1,3 @@
+-- Keyset (cursor) pagination: availabilities ordered by (start_time, id) and users by (created_at, id)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_availabilities_start_time_id ON availabilities (start_time, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at_id ON users (created_at, id);
@@ -0,0 +1,10 @@
+-- Overlap enforcement for availabilities: one professional cannot have two slots whose time ranges intersect.
+-- The ALTER fails if overlapping rows already exist; list them with:
+--   SELECT a.id, b.id FROM availabilities a JOIN availabilities b
+--     ON a.owner_id = b.owner_id AND a.id < b.id
+--    AND tstzrange(a.start_time, a.end_time) && tstzrange(b.start_time, b.end_time);
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE availabilities
+    ADD CONSTRAINT availabilities_no_overlap
+        EXCLUDE USING gist (owner_id WITH =, tstzrange(start_time, end_time) WITH &&);
@@ -0,0 +1,3 @@
+-- Per-user token version: access tokens carry it as a claim and are rejected once it is incremented
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
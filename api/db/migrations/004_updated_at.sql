@@ -0,0 +1,31 @@
+-- updated_at on every table, kept current by a trigger; list endpoints derive their ETags from it
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE availabilities
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE schedule
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS
+$$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER users_set_updated_at
+    BEFORE UPDATE
+    ON users
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+CREATE OR REPLACE TRIGGER availabilities_set_updated_at
+    BEFORE UPDATE
+    ON availabilities
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+CREATE OR REPLACE TRIGGER schedule_set_updated_at
+    BEFORE UPDATE
+    ON schedule
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
@@ -0,0 +1,6 @@
+-- Listing filters: availabilities by status (+ owner) over a start_time window, open slots only, and users by role,
+-- each ending in the (start_time, id) / (created_at, id) order used for pagination
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_availabilities_status_start_time_id ON availabilities (status, start_time, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_availabilities_owner_status_start_time_id ON availabilities (owner_id, status, start_time, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_availabilities_available_start_time_id ON availabilities (start_time, id) WHERE status = 'AVAILABLE';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_role_created_at_id ON users (role, created_at, id);
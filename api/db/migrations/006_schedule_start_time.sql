@@ -0,0 +1,36 @@
+-- Denormalized schedule.start_time so listings by patient or professional are a single index range scan.
+-- Filled from the booked availability on INSERT when the caller doesn't send it.
+ALTER TABLE schedule
+    ADD COLUMN IF NOT EXISTS start_time TIMESTAMP WITH TIME ZONE;
+
+CREATE OR REPLACE FUNCTION set_schedule_start_time() RETURNS trigger AS
+$$
+BEGIN
+    IF NEW.start_time IS NULL THEN
+        SELECT start_time INTO NEW.start_time FROM availabilities WHERE id = NEW.availability_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER schedule_set_start_time
+    BEFORE INSERT
+    ON schedule
+    FOR EACH ROW
+EXECUTE FUNCTION set_schedule_start_time();
+
+UPDATE schedule s
+SET start_time = a.start_time
+FROM availabilities a
+WHERE a.id = s.availability_id
+  AND s.start_time IS NULL;
+
+ALTER TABLE schedule
+    ALTER COLUMN start_time SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_schedule_patient_start_time_id
+    ON schedule (patient_id, start_time, id) INCLUDE (availability_id, updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_schedule_professional_start_time_id
+    ON schedule (professional_id, start_time, id) INCLUDE (availability_id, updated_at);
+DROP INDEX CONCURRENTLY IF EXISTS idx_schedule_patient;
+DROP INDEX CONCURRENTLY IF EXISTS idx_schedule_professional;
@@ -0,0 +1,57 @@
+-- Per-day slot counters behind GET /availabilities/summary, kept current by a trigger on availabilities
+CREATE TABLE IF NOT EXISTS availability_day_counts
+(
+    owner_id UUID        NOT NULL,
+    day      DATE        NOT NULL,
+    status   VARCHAR(50) NOT NULL,
+    slots    INTEGER     NOT NULL,
+    PRIMARY KEY (owner_id, day, status),
+    CONSTRAINT fk_owner FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION availability_day(start_time TIMESTAMP WITH TIME ZONE) RETURNS DATE AS
+$$
+SELECT (start_time AT TIME ZONE 'America/Sao_Paulo')::date;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION count_availability_day() RETURNS trigger AS
+$$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE availability_day_counts
+        SET slots = slots - 1
+        WHERE owner_id = OLD.owner_id
+          AND day = availability_day(OLD.start_time)
+          AND status = OLD.status;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO availability_day_counts (owner_id, day, status, slots)
+        VALUES (NEW.owner_id, availability_day(NEW.start_time), NEW.status, 1)
+        ON CONFLICT (owner_id, day, status) DO UPDATE SET slots = availability_day_counts.slots + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- the initial build must see every row, so writes wait until the triggers exist and the counts are in
+BEGIN;
+LOCK TABLE availabilities IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE OR REPLACE TRIGGER availabilities_count_day_insert_delete
+    AFTER INSERT OR DELETE
+    ON availabilities
+    FOR EACH ROW
+EXECUTE FUNCTION count_availability_day();
+CREATE OR REPLACE TRIGGER availabilities_count_day_update
+    AFTER UPDATE OF owner_id, start_time, status
+    ON availabilities
+    FOR EACH ROW
+    WHEN ((OLD.owner_id, OLD.start_time, OLD.status) IS DISTINCT FROM (NEW.owner_id, NEW.start_time, NEW.status))
+EXECUTE FUNCTION count_availability_day();
+
+DELETE FROM availability_day_counts;
+INSERT INTO availability_day_counts (owner_id, day, status, slots)
+SELECT owner_id, availability_day(start_time), status, count(*)
+FROM availabilities
+GROUP BY 1, 2, 3;
+COMMIT;
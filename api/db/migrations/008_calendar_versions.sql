@@ -0,0 +1,56 @@
+-- Per-user calendar version behind the ETag of GET /calendar/{user_id}.ics, bumped by triggers whenever a feed changes
+CREATE TABLE IF NOT EXISTS calendar_versions
+(
+    user_id UUID PRIMARY KEY,
+    version BIGINT NOT NULL,
+    CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION bump_calendar_versions(user_ids UUID[]) RETURNS void AS
+$$
+INSERT INTO calendar_versions (user_id, version)
+SELECT DISTINCT unnest(user_ids), 1
+ORDER BY 1
+ON CONFLICT (user_id) DO UPDATE SET version = calendar_versions.version + 1;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION calendar_feed_changed() RETURNS trigger AS
+$$
+BEGIN
+    IF TG_TABLE_NAME = 'schedule' THEN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM bump_calendar_versions(ARRAY [OLD.professional_id, OLD.patient_id]);
+        ELSE
+            PERFORM bump_calendar_versions(ARRAY [NEW.professional_id, NEW.patient_id]);
+        END IF;
+    ELSIF TG_TABLE_NAME = 'availabilities' THEN
+        PERFORM bump_calendar_versions(ARRAY [s.professional_id, s.patient_id])
+        FROM schedule s
+        WHERE s.availability_id = NEW.id;
+    ELSE
+        PERFORM bump_calendar_versions(NEW.id || ARRAY(
+                SELECT patient_id FROM schedule WHERE professional_id = NEW.id
+                UNION
+                SELECT professional_id FROM schedule WHERE patient_id = NEW.id));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER schedule_bump_calendar_versions
+    AFTER INSERT OR DELETE
+    ON schedule
+    FOR EACH ROW
+EXECUTE FUNCTION calendar_feed_changed();
+CREATE OR REPLACE TRIGGER availabilities_bump_calendar_versions
+    AFTER UPDATE OF start_time, end_time, status
+    ON availabilities
+    FOR EACH ROW
+    WHEN ((OLD.start_time, OLD.end_time, OLD.status) IS DISTINCT FROM (NEW.start_time, NEW.end_time, NEW.status))
+EXECUTE FUNCTION calendar_feed_changed();
+CREATE OR REPLACE TRIGGER users_bump_calendar_versions
+    AFTER UPDATE OF name
+    ON users
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION calendar_feed_changed();
@@ -0,0 +1,3 @@
+-- Per-user credential version: refresh tokens carry it and are rejected once a password change increments it
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS credential_version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,6 @@
+from api.enum.serializable_enum import SerializableEnum
+
+
+class AvailabilityConflictEnum(SerializableEnum):
+    EXISTING = "EXISTING"
+    BATCH = "BATCH"
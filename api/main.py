@@ -1,15 +1,59 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from api.config.settings import settings
 from api.modules.availabilities.availabilities_controller import (
     router as availabilities_router,
 )
+from api.modules.cache.cache_backend import cache_backend
+from api.modules.calendar.calendar_controller import router as calendar_router
+from api.modules.db.db import db_router, engine
+from api.modules.db.query_counter import QueryCountMiddleware
+from api.modules.db.slow_query_log import SlowQueryLogMiddleware
+from api.modules.health.health_controller import router as health_router
+from api.modules.http_cache.compression_middleware import CompressionMiddleware
+from api.modules.metrics.metrics_controller import router as metrics_router
+from api.modules.metrics.request_metrics import RequestMetricsMiddleware
 from api.modules.schedule.schedule_controller import router as schedule_router
 from api.modules.security.security_controller import router as security_router
+from api.modules.user.password_hasher import password_hasher
 from api.modules.user.user_controller import router as user_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    db_router.start()
+    yield
+    password_hasher.shutdown()
+    await cache_backend.close()
+    await db_router.stop()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+if settings.db_query_count_enabled:
+    app.add_middleware(
+        QueryCountMiddleware, expose_header=settings.db_query_count_header
+    )
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.compression_minimum_size
+    )
+if settings.slow_query_log_enabled:
+    app.add_middleware(SlowQueryLogMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(
+        RequestMetricsMiddleware,
+        n_plus_one_threshold=settings.metrics_n_plus_one_threshold,
+    )
 
 app.include_router(security_router)
 app.include_router(user_router)
 app.include_router(availabilities_router)
 app.include_router(schedule_router)
+app.include_router(calendar_router)
+app.include_router(health_router)
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
@@ -0,0 +1,74 @@
+from datetime import date
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from api.config.settings import settings
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.time_enum import TimeEnum
+from api.modules.cache.cache_backend import cache_backend
+from api.modules.cache.response_cache import ResponseCache
+
+ALL_PROFESSIONALS_SCOPE = "all"
+
+
+class AvailabilitiesCache:
+    def __init__(self, cache: ResponseCache):
+        self.__cache = cache
+
+    @staticmethod
+    def __scope(professional_id: UUID | None) -> str:
+        return str(professional_id) if professional_id else ALL_PROFESSIONALS_SCOPE
+
+    @staticmethod
+    def __key(scope: str, *parts) -> str:
+        return ":".join(str(part) for part in (scope, *parts, date.today()))
+
+    async def get_or_load(
+        self,
+        professional_id: UUID | None,
+        time_filter: TimeEnum,
+        availability_status: AvailabilityStatusEnum,
+        skip: int,
+        limit: int,
+        cursor: str | None,
+        loader: Callable[[], Awaitable[tuple[str, bytes]]],
+    ) -> tuple[str, bytes]:
+        async def load() -> bytes:
+            etag, content = await loader()
+            return etag.encode() + b"\n" + content
+
+        scope = self.__scope(professional_id)
+        key = self.__key(scope, time_filter, availability_status, skip, limit, cursor)
+        etag, _, content = (
+            await self.__cache.get_or_load([scope], key, load)
+        ).partition(b"\n")
+        return etag.decode(), content
+
+    async def get_or_load_etag(
+        self,
+        professional_id: UUID | None,
+        time_filter: TimeEnum,
+        availability_status: AvailabilityStatusEnum,
+        skip: int,
+        limit: int,
+        cursor: str | None,
+        loader: Callable[[], Awaitable[str]],
+    ) -> str:
+        async def load() -> bytes:
+            return (await loader()).encode()
+
+        scope = self.__scope(professional_id)
+        key = self.__key(
+            scope, "etag", time_filter, availability_status, skip, limit, cursor
+        )
+        return (await self.__cache.get_or_load([scope], key, load)).decode()
+
+    async def invalidate(self, professional_id):
+        await self.__cache.invalidate([str(professional_id), ALL_PROFESSIONALS_SCOPE])
+
+
+availabilities_cache = AvailabilitiesCache(
+    ResponseCache(
+        "availabilities", cache_backend, settings.availabilities_cache_ttl_seconds
+    )
+)
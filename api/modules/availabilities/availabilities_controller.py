@@ -1,30 +1,51 @@
+from datetime import date, datetime
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Security, status
-from fastapi_jwt import JwtAuthorizationCredentials
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.export_format_enum import ExportFormatEnum
 from api.enum.time_enum import TimeEnum
+from api.modules.availabilities.availabilities_cache import availabilities_cache
 from api.modules.availabilities.availabilities_model import Availabilities
 from api.modules.availabilities.availabilities_service import AvailabilitiesService
+from api.modules.availabilities.availabilities_summary_repository import (
+    COUNTS_TIMEZONE,
+)
+from api.modules.availabilities.request.availabilities_bulk_create_request import (
+    AvailabilitiesBulkCreateRequest,
+)
 from api.modules.availabilities.request.availabilities_change_status_request import (
     AvailabilitiesUpdateStatusRequest,
 )
 from api.modules.availabilities.request.availabilities_create_request import (
     AvailabilitiesCreateRequest,
 )
+from api.modules.availabilities.response.availabilities_response import (
+    AvailabilitiesResponse,
+    availabilities_list_adapter,
+    availabilities_page_adapter,
+)
+from api.modules.availabilities.response.availabilities_summary_response import (
+    AvailabilitiesDaySummaryResponse,
+    availabilities_summary_adapter,
+)
 from api.modules.db.db import get_db
-from api.modules.security.security_service import SecurityService
+from api.modules.http_cache.etag import etag_matches, not_modified
+from api.modules.pagination.response.cursor_page_response import CursorPageResponse
+from api.modules.security.security_dependencies import get_current_claims
+from api.modules.security.token_claims import TokenClaims
 
+MAX_SUMMARY_PROFESSIONALS = 50
+MAX_NEXT_SLOTS = 100
+MAX_NEXT_PROFESSIONALS = 50
+MAX_SLOT_MINUTES = 24 * 60
 
-def get_availabilities_service(db: Session = Depends(get_db)):
-    return AvailabilitiesService(db)
 
-
-def get_security_service():
-    return SecurityService()
+def get_availabilities_service(db: AsyncSession = Depends(get_db)):
+    return AvailabilitiesService(db)
 
 
 router = APIRouter(
@@ -37,13 +58,9 @@ router = APIRouter(
 async def availabilities(
     data: AvailabilitiesCreateRequest,
     service: AvailabilitiesService = Depends(get_availabilities_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    availability: Availabilities = service.create_availability(
-        data, credentials.subject.get("user_id")
-    )
+    availability: Availabilities = await service.create_availability(data, claims)
 
     if not availability:
         raise HTTPException(
@@ -54,34 +71,127 @@ async def availabilities(
     return {"availability_id": availability.id}
 
 
-@router.get("")
+@router.post("/bulk")
+async def availabilities_bulk(
+    data: AvailabilitiesBulkCreateRequest,
+    service: AvailabilitiesService = Depends(get_availabilities_service),
+    claims: TokenClaims = Depends(get_current_claims),
+):
+    return await service.create_availabilities_bulk(data, claims)
+
+
+@router.get(
+    "",
+    response_model=List[AvailabilitiesResponse]
+    | CursorPageResponse[AvailabilitiesResponse],
+)
 async def availabilities(
     professional_id: UUID | None = None,
     time_filter: TimeEnum | None = TimeEnum.WEEK,
     status: AvailabilityStatusEnum | None = AvailabilityStatusEnum.AVAILABLE,
     skip: int | None = 0,
     limit: int | None = 50,
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
     service: AvailabilitiesService = Depends(get_availabilities_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
+    claims: TokenClaims = Depends(get_current_claims),
+):
+    if if_none_match:
+        etag = await availabilities_cache.get_or_load_etag(
+            professional_id,
+            time_filter,
+            status,
+            skip,
+            limit,
+            cursor,
+            lambda: service.get_availabilities_etag(
+                professional_id, time_filter, status, skip, limit, cursor
+            ),
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    async def load():
+        if cursor is not None:
+            page, etag = await service.get_availabilities_page(
+                professional_id, time_filter, status, cursor, limit
+            )
+            return etag, availabilities_page_adapter.dump_json(page)
+        availability_list, etag = await service.get_availabilities(
+            professional_id, time_filter, status, skip, limit
+        )
+        return etag, availabilities_list_adapter.dump_json(availability_list)
+
+    etag, content = await availabilities_cache.get_or_load(
+        professional_id, time_filter, status, skip, limit, cursor, load
+    )
+    return Response(
+        content=content, media_type="application/json", headers={"ETag": etag}
+    )
+
+
+@router.get("/next", response_model=List[AvailabilitiesResponse])
+async def next_availabilities(
+    after: datetime | None = None,
+    n: int = Query(10, ge=1, le=MAX_NEXT_SLOTS),
+    professional_id: List[UUID] | None = Query(None, max_length=MAX_NEXT_PROFESSIONALS),
+    duration: int | None = Query(None, ge=1, le=MAX_SLOT_MINUTES),
+    timezone_name: str = Query("UTC", alias="timezone"),
+    service: AvailabilitiesService = Depends(get_availabilities_service),
+    claims: TokenClaims = Depends(get_current_claims),
+):
+    return Response(
+        content=availabilities_list_adapter.dump_json(
+            await service.get_next_availabilities(
+                after, timezone_name, n, professional_id, duration
+            )
+        ),
+        media_type="application/json",
+    )
+
+
+@router.get("/summary", response_model=List[AvailabilitiesDaySummaryResponse])
+async def availabilities_summary(
+    professional_id: List[UUID] = Query(
+        ..., min_length=1, max_length=MAX_SUMMARY_PROFESSIONALS
     ),
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    timezone_name: str = Query(COUNTS_TIMEZONE, alias="timezone"),
+    if_none_match: str | None = Header(None),
+    service: AvailabilitiesService = Depends(get_availabilities_service),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    availability_list: List[Availabilities] = service.get_availabilities(
-        professional_id, time_filter, status, skip, limit
+    summary, etag = await service.get_summary(
+        professional_id, start, end, timezone_name
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    return Response(
+        content=availabilities_summary_adapter.dump_json(summary),
+        media_type="application/json",
+        headers={"ETag": etag},
     )
 
-    return availability_list
+
+@router.get("/export")
+async def export_availabilities(
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format"),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    claims: TokenClaims = Depends(get_current_claims),
+):
+    return AvailabilitiesService.export_availabilities(
+        claims.id, export_format, start, end
+    )
 
 
 @router.post("/change-status")
 async def change_status(
     data: AvailabilitiesUpdateStatusRequest,
     service: AvailabilitiesService = Depends(get_availabilities_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    availability: Availabilities = service.change_status(
-        data, credentials.subject.get("user_id")
-    )
+    availability: Availabilities = await service.change_status(data, claims)
     return availability
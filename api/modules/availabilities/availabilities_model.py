@@ -19,7 +19,17 @@ class Availabilities(Base):
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    status = Column(Enum(AvailabilityStatusEnum, name="status"), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    status = Column(
+        Enum(AvailabilityStatusEnum, name="status", native_enum=False), nullable=False
+    )
 
-    user = relationship("User", back_populates="availabilities")
-    schedules = relationship("Schedule", back_populates="availability")
+    user = relationship("User", back_populates="availabilities", lazy="raise_on_sql")
+    schedules = relationship(
+        "Schedule", back_populates="availability", lazy="raise_on_sql"
+    )
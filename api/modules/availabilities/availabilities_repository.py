@@ -1,42 +1,68 @@
 from datetime import datetime, timedelta
-from typing import Type
+from typing import AsyncIterator, Type
 from uuid import UUID
 
-from sqlalchemy import and_, exists, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    DateTime,
+    bindparam,
+    column,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, selectinload
 
+from api.enum.availability_conflict_enum import AvailabilityConflictEnum
 from api.enum.availability_status_enum import AvailabilityStatusEnum
 from api.enum.time_enum import TimeEnum
 from api.modules.availabilities.availabilities_model import Availabilities
+from api.modules.user.user_model import User
 
 MAX_MONTHS_YEAR = 12
 MAX_DAYS_WEEK = 7
 
+EXPORT_COLUMNS = (
+    Availabilities.id,
+    Availabilities.start_time,
+    Availabilities.end_time,
+    Availabilities.status,
+    Availabilities.created_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+VERSION_COLUMNS = (Availabilities.id, Availabilities.updated_at, User.updated_at)
+
 
 class AvailabilitiesRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.__db = db
 
-    def find_by_id(self, av_id) -> Availabilities | None:
-        return (
-            self.__db.query(Availabilities).filter(Availabilities.id == av_id).first()
+    async def find_by_id(self, av_id) -> Availabilities | None:
+        return await self.__db.scalar(
+            select(Availabilities).where(Availabilities.id == av_id)
         )
 
-    def find_all(self) -> list[Type[Availabilities]]:
-        return self.__db.query(Availabilities).all()
+    async def find_all(self) -> list[Type[Availabilities]]:
+        result = await self.__db.scalars(select(Availabilities))
+        return result.all()
 
-    def find_all_by_owner_id_status_and_time(
-        self,
+    @staticmethod
+    def __filter_by_owner_id_status_and_time(
+        query,
         owner_id: UUID | None,
         availability_status: AvailabilityStatusEnum,
         time_filter: TimeEnum,
-        skip: int = 0,
-        limit: int = 10,
-    ) -> list[Availabilities]:
-        query = self.__db.query(Availabilities)
-
+    ):
         if owner_id:
-            query = query.filter(Availabilities.owner_id == owner_id)
+            query = query.where(Availabilities.owner_id == owner_id)
 
         now = datetime.now()
 
@@ -58,36 +84,273 @@ class AvailabilitiesRepository:
                 start, end = None, None
 
         if start and end:
-            query = query.filter(
+            query = query.where(
                 Availabilities.start_time >= start,
                 Availabilities.start_time < end,
             )
 
-        query = query.filter(Availabilities.status == availability_status)
+        return query.where(Availabilities.status == availability_status)
+
+    @classmethod
+    def __offset_query(
+        cls,
+        query,
+        owner_id: UUID | None,
+        availability_status: AvailabilityStatusEnum,
+        time_filter: TimeEnum,
+        skip: int,
+        limit: int,
+    ):
+        query = cls.__filter_by_owner_id_status_and_time(
+            query, owner_id, availability_status, time_filter
+        )
+        return (
+            query.order_by(Availabilities.start_time, Availabilities.id)
+            .offset(skip)
+            .limit(limit)
+        )
+
+    @classmethod
+    def __keyset_query(
+        cls,
+        query,
+        owner_id: UUID | None,
+        availability_status: AvailabilityStatusEnum,
+        time_filter: TimeEnum,
+        after: tuple[datetime, UUID] | None,
+        limit: int,
+    ):
+        query = cls.__filter_by_owner_id_status_and_time(
+            query, owner_id, availability_status, time_filter
+        )
+
+        if after:
+            query = query.where(
+                tuple_(Availabilities.start_time, Availabilities.id) > tuple_(*after)
+            )
 
-        return query.offset(skip).limit(limit).all()
+        return query.order_by(Availabilities.start_time, Availabilities.id).limit(limit)
 
-    def save(self, availability) -> Availabilities:
+    async def find_all_by_owner_id_status_and_time(
+        self,
+        owner_id: UUID | None,
+        availability_status: AvailabilityStatusEnum,
+        time_filter: TimeEnum,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> list[Availabilities]:
+        result = await self.__db.scalars(
+            self.__offset_query(
+                select(Availabilities).options(selectinload(Availabilities.user)),
+                owner_id,
+                availability_status,
+                time_filter,
+                skip,
+                limit,
+            )
+        )
+        return result.all()
+
+    async def find_versions_by_owner_id_status_and_time(
+        self,
+        owner_id: UUID | None,
+        availability_status: AvailabilityStatusEnum,
+        time_filter: TimeEnum,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> list[Row]:
+        result = await self.__db.execute(
+            self.__offset_query(
+                select(*VERSION_COLUMNS).join(Availabilities.user),
+                owner_id,
+                availability_status,
+                time_filter,
+                skip,
+                limit,
+            )
+        )
+        return result.all()
+
+    async def find_page_by_owner_id_status_and_time(
+        self,
+        owner_id: UUID | None,
+        availability_status: AvailabilityStatusEnum,
+        time_filter: TimeEnum,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int = 10,
+    ) -> list[Availabilities]:
+        result = await self.__db.scalars(
+            self.__keyset_query(
+                select(Availabilities).options(selectinload(Availabilities.user)),
+                owner_id,
+                availability_status,
+                time_filter,
+                after,
+                limit,
+            )
+        )
+        return result.all()
+
+    async def find_page_versions_by_owner_id_status_and_time(
+        self,
+        owner_id: UUID | None,
+        availability_status: AvailabilityStatusEnum,
+        time_filter: TimeEnum,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int = 10,
+    ) -> list[Row]:
+        result = await self.__db.execute(
+            self.__keyset_query(
+                select(*VERSION_COLUMNS).join(Availabilities.user),
+                owner_id,
+                availability_status,
+                time_filter,
+                after,
+                limit,
+            )
+        )
+        return result.all()
+
+    @staticmethod
+    def __next_available_query(
+        query, after: datetime, min_duration: timedelta | None, limit: int
+    ):
+        query = query.where(
+            Availabilities.status == AvailabilityStatusEnum.AVAILABLE,
+            Availabilities.start_time >= after,
+        )
+        if min_duration:
+            query = query.where(
+                Availabilities.end_time - Availabilities.start_time >= min_duration
+            )
+        return query.order_by(Availabilities.start_time, Availabilities.id).limit(limit)
+
+    async def find_next_available(
+        self,
+        after: datetime,
+        limit: int,
+        owner_ids: list[UUID] | None = None,
+        min_duration: timedelta | None = None,
+    ) -> list[Availabilities]:
+        if not owner_ids:
+            result = await self.__db.scalars(
+                self.__next_available_query(
+                    select(Availabilities).options(selectinload(Availabilities.user)),
+                    after,
+                    min_duration,
+                    limit,
+                )
+            )
+            return result.all()
+
+        owners = (
+            func.unnest(bindparam("owner_ids", owner_ids, type_=ARRAY(PG_UUID)))
+            .table_valued(column("owner_id", PG_UUID))
+            .render_derived()
+        )
+        per_owner = self.__next_available_query(
+            select(Availabilities).where(Availabilities.owner_id == owners.c.owner_id),
+            after,
+            min_duration,
+            limit,
+        ).lateral()
+        slot = aliased(Availabilities, per_owner)
+
+        result = await self.__db.scalars(
+            select(slot)
+            .select_from(owners)
+            .join(per_owner, true())
+            .options(selectinload(slot.user))
+            .order_by(slot.start_time, slot.id)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def stream_for_export(
+        self,
+        owner_id: UUID,
+        start: datetime | None,
+        end: datetime | None,
+        chunk_size: int,
+    ) -> AsyncIterator[Row]:
+        query = select(*EXPORT_COLUMNS).where(Availabilities.owner_id == owner_id)
+        if start:
+            query = query.where(Availabilities.start_time >= start)
+        if end:
+            query = query.where(Availabilities.start_time < end)
+
+        result = await self.__db.stream(
+            query.order_by(
+                Availabilities.start_time, Availabilities.id
+            ).execution_options(yield_per=chunk_size)
+        )
+        async for row in result:
+            yield row
+
+    async def save(self, availability) -> Availabilities:
         self.__db.add(availability)
-        self.__db.commit()
-        self.__db.refresh(availability)
+        await self.__db.commit()
+        await self.__db.refresh(availability)
         return availability
 
-    def exists_or_overlap(self, start_time, end_time, owner_id) -> bool:
-        return self.__db.query(
-            exists().where(
-                and_(
-                    Availabilities.owner_id == owner_id,
-                    or_(
-                        and_(
-                            Availabilities.start_time == start_time,
-                            Availabilities.end_time == end_time,
-                        ),
-                        and_(
-                            Availabilities.start_time < end_time,
-                            Availabilities.end_time > start_time,
-                        ),
-                    ),
+    async def save_all(self, rows: list[dict]) -> list[UUID]:
+        result = await self.__db.scalars(
+            insert(Availabilities).returning(
+                Availabilities.id, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        ids = result.all()
+        await self.__db.commit()
+        return ids
+
+    async def find_conflicting_slots(
+        self, owner_id, slots: list[tuple[datetime, datetime]]
+    ) -> dict[int, AvailabilityConflictEnum]:
+        timestamps = ARRAY(DateTime(timezone=True))
+        requested = (
+            select(
+                func.unnest(
+                    bindparam("starts", [s for s, _ in slots], type_=timestamps),
+                    bindparam("ends", [e for _, e in slots], type_=timestamps),
+                )
+                .table_valued(
+                    column("start_time", DateTime(timezone=True)),
+                    column("end_time", DateTime(timezone=True)),
+                    with_ordinality="position",
                 )
+                .render_derived()
+            )
+        ).subquery()
+
+        swept = select(
+            requested,
+            func.max(requested.c.end_time)
+            .over(
+                order_by=(requested.c.start_time, requested.c.position),
+                rows=(None, -1),
+            )
+            .label("previous_end"),
+        ).subquery()
+
+        overlaps_existing = exists().where(
+            Availabilities.owner_id == owner_id,
+            func.tstzrange(Availabilities.start_time, Availabilities.end_time).op("&&")(
+                func.tstzrange(swept.c.start_time, swept.c.end_time)
+            ),
+        )
+        overlaps_batch = swept.c.previous_end > swept.c.start_time
+
+        result = await self.__db.execute(
+            select(swept.c.position, overlaps_existing.label("existing")).where(
+                or_(overlaps_existing, overlaps_batch)
+            )
+        )
+        conflicts = {}
+        for row in result:
+            conflicts[row.position - 1] = (
+                AvailabilityConflictEnum.EXISTING
+                if row.existing
+                else AvailabilityConflictEnum.BATCH
             )
-        ).scalar()
+        return conflicts
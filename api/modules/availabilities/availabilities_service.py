@@ -1,71 +1,173 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import List
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.export_format_enum import ExportFormatEnum
 from api.enum.time_enum import TimeEnum
+from api.modules.availabilities.availabilities_cache import availabilities_cache
 from api.modules.availabilities.availabilities_model import Availabilities
 from api.modules.availabilities.availabilities_repository import (
+    EXPORT_FIELDS,
     AvailabilitiesRepository,
 )
+from api.modules.availabilities.availabilities_summary_repository import (
+    COUNTS_TIMEZONE,
+    AvailabilitiesSummaryRepository,
+)
+from api.modules.availabilities.request.availabilities_bulk_create_request import (
+    AvailabilitiesBulkCreateRequest,
+)
 from api.modules.availabilities.request.availabilities_change_status_request import (
     AvailabilitiesUpdateStatusRequest,
 )
 from api.modules.availabilities.request.availabilities_create_request import (
     AvailabilitiesCreateRequest,
 )
+from api.modules.availabilities.response.availabilities_bulk_create_response import (
+    AvailabilitiesBulkCreateResponse,
+    AvailabilitiesSlotResponse,
+)
 from api.modules.availabilities.response.availabilities_response import (
     AvailabilitiesResponse,
+    availabilities_list_adapter,
 )
-from api.modules.user.user_model import User
+from api.modules.availabilities.response.availabilities_summary_response import (
+    AvailabilitiesDaySummaryResponse,
+)
+from api.modules.export.export_response import (
+    EXPORT_CHUNK_ROWS,
+    export_response,
+    validate_export_range,
+)
+from api.modules.http_cache.etag import strong_etag
+from api.modules.pagination.cursor import decode_cursor, encode_cursor
+from api.modules.pagination.response.cursor_page_response import CursorPageResponse
+from api.modules.security.token_claims import TokenClaims
+from api.modules.time_window.time_window import parse_timezone
+from api.modules.user.user_cache import UserSnapshot
 from api.modules.user.user_repository import UserRepository
 from api.modules.user.user_validator import UserValidator
 
+MAX_SUMMARY_DAYS = 93
+
+
+def _versions(availability_list: List[Availabilities]):
+    return (
+        (availability.id, availability.updated_at, availability.user.updated_at)
+        for availability in availability_list
+    )
+
 
 class AvailabilitiesService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.__repo: AvailabilitiesRepository = AvailabilitiesRepository(db)
+        self.__summary_repo: AvailabilitiesSummaryRepository = (
+            AvailabilitiesSummaryRepository(db)
+        )
         self.__user_repo: UserRepository = UserRepository(db)
 
-    def __get_owner_data_by_id(self, owner_id) -> User | None:
-        owner_user: User = self.__user_repo.find_by_id(owner_id)
+    async def __get_owner(self, claims: TokenClaims) -> TokenClaims | UserSnapshot:
+        owner_user = await self.__user_repo.find_principal(claims)
 
         UserValidator.validate_user(owner_user)
         return owner_user
 
-    def create_availability(self, request: AvailabilitiesCreateRequest, owner_id):
-        owner_user: User = self.__get_owner_data_by_id(owner_id)
+    async def create_availability(
+        self, request: AvailabilitiesCreateRequest, claims: TokenClaims
+    ):
+        owner_user = await self.__get_owner(claims)
+        owner_id = owner_user.id
 
         UserValidator.validate_user_professional(owner_user)
         UserValidator.validate_user_professional_crp_ready(owner_user)
 
-        if self.__repo.exists_or_overlap(
-            request.start_time, request.end_time, owner_id
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="start_time and end_time are conflicting with another availability for this user.",
-            )
-
         availability = Availabilities(
             start_time=request.start_time,
             end_time=request.end_time,
             status=request.status,
             owner_id=owner_id,
         )
-        return self.__repo.save(availability)
 
-    def get_availabilities(
+        try:
+            availability = await self.__repo.save(availability)
+        except IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="start_time and end_time are conflicting with another availability for this user.",
+            )
+
+        await availabilities_cache.invalidate(owner_id)
+        return availability
+
+    async def create_availabilities_bulk(
+        self, request: AvailabilitiesBulkCreateRequest, claims: TokenClaims
+    ) -> AvailabilitiesBulkCreateResponse:
+        owner_user = await self.__get_owner(claims)
+        owner_id = owner_user.id
+
+        UserValidator.validate_user_professional(owner_user)
+        UserValidator.validate_user_professional_crp_ready(owner_user)
+
+        slots = request.generate_slots()
+        if not slots:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No slots to create.",
+            )
+
+        conflicting = await self.__repo.find_conflicting_slots(owner_id, slots)
+        accepted = [slot for i, slot in enumerate(slots) if i not in conflicting]
+
+        created_ids = []
+        if accepted:
+            try:
+                created_ids = await self.__repo.save_all(
+                    [
+                        {
+                            "owner_id": owner_id,
+                            "start_time": start_time,
+                            "end_time": end_time,
+                            "status": request.status,
+                        }
+                        for start_time, end_time in accepted
+                    ]
+                )
+            except IntegrityError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Availabilities were created concurrently for this user. Try again.",
+                )
+            await availabilities_cache.invalidate(owner_id)
+
+        return AvailabilitiesBulkCreateResponse(
+            [
+                AvailabilitiesSlotResponse(start_time, end_time, availability_id)
+                for (start_time, end_time), availability_id in zip(
+                    accepted, created_ids
+                )
+            ],
+            [
+                AvailabilitiesSlotResponse(*slots[i], reason=reason)
+                for i, reason in sorted(conflicting.items())
+            ],
+        )
+
+    async def get_availabilities(
         self,
         professional_id: UUID | None,
         time_filter: TimeEnum,
         availability_status: AvailabilityStatusEnum,
         skip: int,
         limit: int,
-    ):
-        availability_list = self.__repo.find_all_by_owner_id_status_and_time(
+    ) -> tuple[List[AvailabilitiesResponse], str]:
+        availability_list = await self.__repo.find_all_by_owner_id_status_and_time(
             professional_id, availability_status, time_filter, skip, limit
         )
 
@@ -75,16 +177,172 @@ class AvailabilitiesService:
                 detail="No availabilities found.",
             )
 
-        return [AvailabilitiesResponse(a) for a in availability_list]
+        return (
+            availabilities_list_adapter.validate_python(
+                availability_list, from_attributes=True
+            ),
+            strong_etag("availabilities", rows=_versions(availability_list)),
+        )
 
-    def change_status(self, request: AvailabilitiesUpdateStatusRequest, owner_id):
+    async def get_availabilities_page(
+        self,
+        professional_id: UUID | None,
+        time_filter: TimeEnum,
+        availability_status: AvailabilityStatusEnum,
+        cursor: str,
+        limit: int,
+    ) -> tuple[CursorPageResponse[AvailabilitiesResponse], str]:
+        availability_list = await self.__repo.find_page_by_owner_id_status_and_time(
+            professional_id,
+            availability_status,
+            time_filter,
+            decode_cursor(cursor),
+            limit + 1,
+        )
+        etag = strong_etag(
+            "availabilities_page", limit, rows=_versions(availability_list)
+        )
 
-        owner_user: User = self.__get_owner_data_by_id(owner_id)
+        next_cursor = None
+        if len(availability_list) > limit:
+            availability_list = availability_list[:limit]
+            last = availability_list[-1]
+            next_cursor = encode_cursor(last.start_time, last.id)
+
+        return (
+            CursorPageResponse[AvailabilitiesResponse](
+                items=availabilities_list_adapter.validate_python(
+                    availability_list, from_attributes=True
+                ),
+                next_cursor=next_cursor,
+            ),
+            etag,
+        )
+
+    async def get_availabilities_etag(
+        self,
+        professional_id: UUID | None,
+        time_filter: TimeEnum,
+        availability_status: AvailabilityStatusEnum,
+        skip: int,
+        limit: int,
+        cursor: str | None,
+    ) -> str:
+        if cursor is not None:
+            versions = await self.__repo.find_page_versions_by_owner_id_status_and_time(
+                professional_id,
+                availability_status,
+                time_filter,
+                decode_cursor(cursor),
+                limit + 1,
+            )
+            return strong_etag("availabilities_page", limit, rows=versions)
+
+        versions = await self.__repo.find_versions_by_owner_id_status_and_time(
+            professional_id, availability_status, time_filter, skip, limit
+        )
+        return strong_etag("availabilities", rows=versions)
+
+    async def get_next_availabilities(
+        self,
+        after: datetime | None,
+        timezone_name: str,
+        limit: int,
+        professional_ids: List[UUID] | None,
+        duration_minutes: int | None,
+    ) -> List[AvailabilitiesResponse]:
+        if after is None:
+            after = datetime.now(timezone.utc)
+        elif after.tzinfo is None:
+            after = after.replace(tzinfo=parse_timezone(timezone_name))
+
+        availability_list = await self.__repo.find_next_available(
+            after,
+            limit,
+            list(dict.fromkeys(professional_ids or ())),
+            timedelta(minutes=duration_minutes) if duration_minutes else None,
+        )
+        return availabilities_list_adapter.validate_python(
+            availability_list, from_attributes=True
+        )
+
+    async def get_summary(
+        self,
+        professional_ids: List[UUID],
+        start: date,
+        end: date,
+        timezone_name: str = COUNTS_TIMEZONE,
+    ) -> tuple[List[AvailabilitiesDaySummaryResponse], str]:
+        if start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="from must be before to.",
+            )
+        if (end - start).days > MAX_SUMMARY_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The summary range can not exceed {MAX_SUMMARY_DAYS} days.",
+            )
+
+        parse_timezone(timezone_name)
+        if timezone_name == COUNTS_TIMEZONE:
+            counts = await self.__summary_repo.find_by_owner_ids_and_days(
+                professional_ids, start, end
+            )
+        else:
+            counts = await self.__summary_repo.count_by_owner_ids_and_days(
+                professional_ids, start, end, timezone_name
+            )
+
+        summary: dict[tuple[UUID, date], AvailabilitiesDaySummaryResponse] = {}
+        for count in counts:
+            day = summary.get((count.owner_id, count.day))
+            if day is None:
+                day = summary[(count.owner_id, count.day)] = (
+                    AvailabilitiesDaySummaryResponse(
+                        professional_id=count.owner_id, day=count.day, counts={}
+                    )
+                )
+            day.counts[count.status] = count.slots
+
+        etag = strong_etag(
+            "availabilities_summary",
+            timezone_name,
+            rows=((c.owner_id, c.day, c.status, c.slots) for c in counts),
+        )
+        return list(summary.values()), etag
+
+    @staticmethod
+    def export_availabilities(
+        owner_id: UUID,
+        export_format: ExportFormatEnum,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> StreamingResponse:
+        start, end = validate_export_range(start, end)
+
+        return export_response(
+            export_format,
+            "availabilities",
+            EXPORT_FIELDS,
+            owner_id,
+            lambda db: AvailabilitiesRepository(db).stream_for_export(
+                owner_id, start, end, EXPORT_CHUNK_ROWS
+            ),
+        )
+
+    async def change_status(
+        self, request: AvailabilitiesUpdateStatusRequest, claims: TokenClaims
+    ):
+
+        owner_user = await self.__get_owner(claims)
 
         UserValidator.validate_user_professional(owner_user)
         UserValidator.validate_user_professional_crp_ready(owner_user)
 
-        availability: Availabilities = self.__repo.find_by_id(request.availability_id)
+        availability: Availabilities = await self.__repo.find_by_id(
+            request.availability_id
+        )
 
         if not availability:
             raise HTTPException(
@@ -99,4 +357,7 @@ class AvailabilitiesService:
             )
 
         availability.status = request.status
-        return self.__repo.save(availability)
+        availability = await self.__repo.save(availability)
+
+        await availabilities_cache.invalidate(availability.owner_id)
+        return availability
@@ -0,0 +1,124 @@
+from datetime import date, datetime, time
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, and_, cast, delete, func, insert, select, text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.availabilities.availabilities_model import Availabilities
+from api.modules.availabilities.availability_day_count_model import (
+    AvailabilityDayCount,
+)
+
+LOCK_AVAILABILITIES = text("LOCK TABLE availabilities IN SHARE ROW EXCLUSIVE MODE")
+# must match the zone hardcoded in the availability_day() SQL function
+COUNTS_TIMEZONE = "America/Sao_Paulo"
+
+
+def _actual_counts(owner_id: UUID | None = None):
+    day = func.availability_day(Availabilities.start_time)
+    query = select(
+        Availabilities.owner_id,
+        day.label("day"),
+        Availabilities.status,
+        func.count().label("slots"),
+    )
+    if owner_id:
+        query = query.where(Availabilities.owner_id == owner_id)
+    return query.group_by(Availabilities.owner_id, day, Availabilities.status)
+
+
+class AvailabilitiesSummaryRepository:
+    def __init__(self, db: AsyncSession):
+        self.__db = db
+
+    async def find_by_owner_ids_and_days(
+        self, owner_ids: list[UUID], start: date, end: date
+    ) -> list[AvailabilityDayCount]:
+        result = await self.__db.scalars(
+            select(AvailabilityDayCount)
+            .where(
+                AvailabilityDayCount.owner_id.in_(owner_ids),
+                AvailabilityDayCount.day >= start,
+                AvailabilityDayCount.day < end,
+                AvailabilityDayCount.slots > 0,
+            )
+            .order_by(
+                AvailabilityDayCount.owner_id,
+                AvailabilityDayCount.day,
+                AvailabilityDayCount.status,
+            )
+        )
+        return result.all()
+
+    async def count_by_owner_ids_and_days(
+        self, owner_ids: list[UUID], start: date, end: date, timezone_name: str
+    ) -> list[Row]:
+        tz = ZoneInfo(timezone_name)
+        day = cast(func.timezone(timezone_name, Availabilities.start_time), Date)
+        result = await self.__db.execute(
+            select(
+                Availabilities.owner_id,
+                day.label("day"),
+                Availabilities.status,
+                func.count().label("slots"),
+            )
+            .where(
+                Availabilities.owner_id.in_(owner_ids),
+                Availabilities.start_time >= datetime.combine(start, time(), tz),
+                Availabilities.start_time < datetime.combine(end, time(), tz),
+            )
+            .group_by(Availabilities.owner_id, day, Availabilities.status)
+            .order_by(Availabilities.owner_id, day, Availabilities.status)
+        )
+        return result.all()
+
+    async def rebuild(self, owner_id: UUID | None = None) -> int:
+        await self.__db.execute(LOCK_AVAILABILITIES)
+
+        stale = delete(AvailabilityDayCount)
+        if owner_id:
+            stale = stale.where(AvailabilityDayCount.owner_id == owner_id)
+        await self.__db.execute(stale)
+
+        result = await self.__db.execute(
+            insert(AvailabilityDayCount).from_select(
+                ["owner_id", "day", "status", "slots"], _actual_counts(owner_id)
+            )
+        )
+        await self.__db.commit()
+        return result.rowcount
+
+    async def find_drift(self, owner_id: UUID | None = None) -> list[Row]:
+        actual = _actual_counts(owner_id).subquery()
+        stored = select(AvailabilityDayCount).where(AvailabilityDayCount.slots != 0)
+        if owner_id:
+            stored = stored.where(AvailabilityDayCount.owner_id == owner_id)
+        stored = stored.subquery()
+
+        stored_slots = func.coalesce(stored.c.slots, 0)
+        actual_slots = func.coalesce(actual.c.slots, 0)
+        result = await self.__db.execute(
+            select(
+                func.coalesce(stored.c.owner_id, actual.c.owner_id).label("owner_id"),
+                func.coalesce(stored.c.day, actual.c.day).label("day"),
+                func.coalesce(stored.c.status, actual.c.status).label("status"),
+                stored_slots.label("stored"),
+                actual_slots.label("actual"),
+            )
+            .select_from(
+                stored.join(
+                    actual,
+                    and_(
+                        stored.c.owner_id == actual.c.owner_id,
+                        stored.c.day == actual.c.day,
+                        stored.c.status == actual.c.status,
+                    ),
+                    full=True,
+                )
+            )
+            .where(stored_slots != actual_slots)
+            .order_by("owner_id", "day", "status")
+        )
+        return result.all()
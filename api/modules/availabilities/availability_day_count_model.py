@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Date, Enum, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.modules.db.db import Base
+
+
+class AvailabilityDayCount(Base):
+    __tablename__ = "availability_day_counts"
+
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(
+        Enum(AvailabilityStatusEnum, name="status", native_enum=False),
+        primary_key=True,
+    )
+    slots = Column(Integer, nullable=False)
@@ -0,0 +1,109 @@
+from datetime import date, datetime, time, timedelta
+from typing import List
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
+
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+
+MAX_BULK_SLOTS = 2000
+MAX_RECURRENCE_DAYS = 366
+MAX_WEEKDAY = 6
+
+
+class AvailabilitiesSlotRequest(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+    @model_validator(mode="after")
+    def check_time_order(self):
+        if self.start_time >= self.end_time:
+            raise ValueError("Invalid start_time or end_time")
+        return self
+
+
+class AvailabilitiesTimeRangeRequest(BaseModel):
+    start: time
+    end: time
+
+    @model_validator(mode="after")
+    def check_time_order(self):
+        if self.start >= self.end:
+            raise ValueError("Invalid time range start or end")
+        return self
+
+
+class AvailabilitiesRecurrenceRequest(BaseModel):
+    weekdays: List[int] = Field(min_length=1)
+    time_ranges: List[AvailabilitiesTimeRangeRequest] = Field(min_length=1)
+    slot_minutes: int = Field(gt=0)
+    start_date: date
+    end_date: date
+    timezone: str = "UTC"
+
+    @field_validator("weekdays")
+    def validate_weekdays(cls, weekdays: List[int]):
+        if any(day < 0 or day > MAX_WEEKDAY for day in weekdays):
+            raise ValueError("Weekdays must be between 0 (Monday) and 6 (Sunday)")
+        return sorted(set(weekdays))
+
+    @field_validator("timezone")
+    def validate_timezone(cls, timezone: str):
+        try:
+            ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError("Invalid timezone")
+        return timezone
+
+    @model_validator(mode="after")
+    def check_date_order(self):
+        if self.start_date > self.end_date:
+            raise ValueError("Invalid start_date or end_date")
+        if (self.end_date - self.start_date).days >= MAX_RECURRENCE_DAYS:
+            raise ValueError(
+                f"Recurrence cannot span more than {MAX_RECURRENCE_DAYS} days"
+            )
+        return self
+
+    def generate_slots(self) -> List[tuple[datetime, datetime]]:
+        zone = ZoneInfo(self.timezone)
+        slot = timedelta(minutes=self.slot_minutes)
+        slots = []
+
+        for offset in range((self.end_date - self.start_date).days + 1):
+            day = self.start_date + timedelta(days=offset)
+            if day.weekday() in self.weekdays:
+                for time_range in self.time_ranges:
+                    start = datetime.combine(day, time_range.start, zone)
+                    range_end = datetime.combine(day, time_range.end, zone)
+                    while start + slot <= range_end:
+                        slots.append((start, start + slot))
+                        start += slot
+                        if len(slots) > MAX_BULK_SLOTS:
+                            raise ValueError(
+                                f"Recurrence generates more than {MAX_BULK_SLOTS} slots"
+                            )
+
+        return slots
+
+
+class AvailabilitiesBulkCreateRequest(BaseModel):
+    slots: List[AvailabilitiesSlotRequest] | None = Field(
+        default=None, max_length=MAX_BULK_SLOTS
+    )
+    recurrence: AvailabilitiesRecurrenceRequest | None = None
+    status: AvailabilityStatusEnum = AvailabilityStatusEnum.AVAILABLE
+    _slots: List[tuple[datetime, datetime]] = PrivateAttr(default_factory=list)
+
+    @model_validator(mode="after")
+    def check_slots_or_recurrence(self):
+        if (self.slots is None) == (self.recurrence is None):
+            raise ValueError("Send either slots or recurrence")
+        if self.recurrence is not None:
+            self._slots = self.recurrence.generate_slots()
+        else:
+            self._slots = [(s.start_time, s.end_time) for s in self.slots]
+        return self
+
+    def generate_slots(self) -> List[tuple[datetime, datetime]]:
+        return self._slots
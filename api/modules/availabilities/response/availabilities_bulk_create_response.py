@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+from api.enum.availability_conflict_enum import AvailabilityConflictEnum
+
+
+class AvailabilitiesSlotResponse:
+    availability_id: UUID | None
+    start_time: datetime
+    end_time: datetime
+    reason: AvailabilityConflictEnum | None
+
+    def __init__(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        availability_id: UUID | None = None,
+        reason: AvailabilityConflictEnum | None = None,
+    ):
+        self.availability_id = availability_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.reason = reason
+
+
+class AvailabilitiesBulkCreateResponse:
+    created: List[AvailabilitiesSlotResponse]
+    conflicts: List[AvailabilitiesSlotResponse]
+
+    def __init__(
+        self,
+        created: List[AvailabilitiesSlotResponse],
+        conflicts: List[AvailabilitiesSlotResponse],
+    ):
+        self.created = created
+        self.conflicts = conflicts
@@ -1,13 +1,15 @@
 from datetime import datetime
+from typing import List
 from uuid import UUID
 
+from pydantic import BaseModel, TypeAdapter
+
 from api.enum.availability_status_enum import AvailabilityStatusEnum
-from api.modules.availabilities.availabilities_model import Availabilities
+from api.modules.pagination.response.cursor_page_response import CursorPageResponse
 from api.modules.user.response.user_response import UserResponse
-from api.modules.user.user_mapper import UserMapper
 
 
-class AvailabilitiesResponse:
+class AvailabilitiesResponse(BaseModel):
     id: UUID
     created_at: datetime
     status: AvailabilityStatusEnum
@@ -15,10 +17,9 @@ class AvailabilitiesResponse:
     end_time: datetime
     user: UserResponse
 
-    def __init__(self, availabilities: Availabilities):
-        self.id = availabilities.id
-        self.created_at = availabilities.created_at
-        self.status = availabilities.status
-        self.start_time = availabilities.start_time
-        self.end_time = availabilities.end_time
-        self.user = UserMapper.to_user_response(availabilities.user)
+    class Config:
+        from_attributes = True
+
+
+availabilities_list_adapter = TypeAdapter(List[AvailabilitiesResponse])
+availabilities_page_adapter = TypeAdapter(CursorPageResponse[AvailabilitiesResponse])
@@ -0,0 +1,16 @@
+from datetime import date
+from typing import Dict, List
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter
+
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+
+
+class AvailabilitiesDaySummaryResponse(BaseModel):
+    professional_id: UUID
+    day: date
+    counts: Dict[AvailabilityStatusEnum, int]
+
+
+availabilities_summary_adapter = TypeAdapter(List[AvailabilitiesDaySummaryResponse])
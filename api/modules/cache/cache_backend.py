@@ -0,0 +1,122 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, List
+
+from api.config.settings import Settings, settings
+from api.modules.metrics.metrics import registry
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+eviction_counter = registry.counter(
+    "cache_evictions_total",
+    "Entries dropped from the in-process cache to respect its size limit",
+    ["backend"],
+)
+entries_gauge = registry.gauge(
+    "cache_entries", "Entries held by the in-process cache", ["backend"]
+)
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int, name: str = "memory"):
+        self.name = name
+        self.instance_id = uuid.uuid4().hex[:8]
+        self.__max_entries = max_entries
+        self.__entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.__counters: OrderedDict[str, int] = OrderedDict()
+        entries_gauge.set_function(lambda: len(self.__entries), backend=self.name)
+
+    async def get(self, key: str) -> Any:
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.__entries[key]
+            return None
+
+        self.__entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: int):
+        self.__entries[key] = (time.monotonic() + ttl_seconds, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+            eviction_counter.inc(backend=self.name)
+
+    async def delete(self, key: str):
+        self.__entries.pop(key, None)
+
+    def __counter(self, key: str) -> int:
+        # A counter dropped by the LRU restarts at the clock, never at a value it already had
+        value = self.__counters.get(key)
+        if value is None:
+            value = time.time_ns()
+            self.__counters[key] = value
+            while len(self.__counters) > self.__max_entries:
+                self.__counters.popitem(last=False)
+        self.__counters.move_to_end(key)
+        return value
+
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        return [self.__counter(key) for key in keys]
+
+    async def incr(self, key: str, ttl_seconds: int) -> int:
+        self.__counters[key] = self.__counter(key) + 1
+        return self.__counters[key]
+
+    async def close(self):
+        self.__entries.clear()
+        self.__counters.clear()
+
+
+class RedisCacheBackend:
+    name = "redis"
+    instance_id = "redis"
+
+    def __init__(self, url: str, prefix: str = "agenda:"):
+        if redis_asyncio is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+        self.__client = redis_asyncio.from_url(url)
+        self.__prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.__client.get(self.__prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        await self.__client.set(self.__prefix + key, value, ex=ttl_seconds)
+
+    async def delete(self, key: str):
+        await self.__client.delete(self.__prefix + key)
+
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        values = await self.__client.mget([self.__prefix + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def incr(self, key: str, ttl_seconds: int) -> int:
+        # An expired counter restarts at the clock, never at a value it already had
+        key = self.__prefix + key
+        async with self.__client.pipeline(transaction=True) as pipeline:
+            pipeline.set(key, time.time_ns(), nx=True)
+            pipeline.incr(key)
+            pipeline.expire(key, ttl_seconds)
+            _, value, _ = await pipeline.execute()
+        return value
+
+    async def close(self):
+        await self.__client.aclose()
+
+
+def create_cache_backend(config: Settings = settings):
+    if config.cache_backend == "redis":
+        return RedisCacheBackend(config.cache_redis_url)
+    return MemoryCacheBackend(config.cache_max_entries)
+
+
+cache_backend = create_cache_backend()
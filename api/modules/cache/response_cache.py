@@ -0,0 +1,72 @@
+import logging
+from typing import Awaitable, Callable, List
+
+from api.modules.metrics.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+GENERATION_PREFIX = "generation:"
+GENERATION_TTL_FACTOR = 2
+
+requests_counter = registry.counter(
+    "cache_requests_total", "Cache lookups by result", ["cache", "result"]
+)
+errors_counter = registry.counter(
+    "cache_errors_total", "Cache backend calls that failed", ["cache"]
+)
+
+
+def generation_ttl(ttl_seconds: int) -> int:
+    return GENERATION_TTL_FACTOR * max(ttl_seconds, 1)
+
+
+class ResponseCache:
+    def __init__(self, name: str, backend, ttl_seconds: int):
+        self.__name = name
+        self.__backend = backend
+        self.__ttl_seconds = ttl_seconds
+
+    async def __generation(self, scopes: List[str]) -> str:
+        counters = await self.__backend.get_counters(
+            [f"{GENERATION_PREFIX}{self.__name}:{scope}" for scope in scopes]
+        )
+        return ".".join(str(counter) for counter in counters)
+
+    async def get_or_load(
+        self, scopes: List[str], key: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        if self.__ttl_seconds <= 0:
+            return await loader()
+
+        try:
+            generation = await self.__generation(scopes)
+            full_key = f"{self.__name}:{generation}:{key}"
+            cached = await self.__backend.get(full_key)
+        except Exception:
+            logger.warning("Cache %s lookup failed", self.__name, exc_info=True)
+            errors_counter.inc(cache=self.__name)
+            return await loader()
+
+        if cached is not None:
+            requests_counter.inc(cache=self.__name, result="hit")
+            return cached
+
+        requests_counter.inc(cache=self.__name, result="miss")
+        value = await loader()
+        try:
+            await self.__backend.set(full_key, value, self.__ttl_seconds)
+        except Exception:
+            logger.warning("Cache %s store failed", self.__name, exc_info=True)
+            errors_counter.inc(cache=self.__name)
+        return value
+
+    async def invalidate(self, scopes: List[str]):
+        try:
+            for scope in scopes:
+                await self.__backend.incr(
+                    f"{GENERATION_PREFIX}{self.__name}:{scope}",
+                    generation_ttl(self.__ttl_seconds),
+                )
+        except Exception:
+            logger.warning("Cache %s invalidation failed", self.__name, exc_info=True)
+            errors_counter.inc(cache=self.__name)
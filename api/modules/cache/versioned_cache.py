@@ -0,0 +1,74 @@
+import logging
+from typing import Any, Awaitable, Callable
+
+from api.modules.cache.cache_backend import MemoryCacheBackend
+from api.modules.cache.response_cache import (
+    errors_counter,
+    generation_ttl,
+    requests_counter,
+)
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "generation:"
+
+
+class VersionedCache:
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        shared,
+        ttl_seconds: int,
+        version_check: bool,
+    ):
+        self.__name = name
+        self.__local = MemoryCacheBackend(max_entries, name=name)
+        self.__shared = shared
+        self.__ttl_seconds = ttl_seconds
+        self.__version_check = version_check
+
+    async def __version(self, key: str) -> int:
+        if not self.__version_check:
+            return 0
+        return (
+            await self.__shared.get_counters([f"{VERSION_PREFIX}{self.__name}:{key}"])
+        )[0]
+
+    async def get_or_load(self, key, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.__ttl_seconds <= 0:
+            return await loader()
+
+        key = str(key)
+        try:
+            version = await self.__version(key)
+        except Exception:
+            logger.warning("Cache %s version check failed", self.__name, exc_info=True)
+            errors_counter.inc(cache=self.__name)
+            return await loader()
+
+        entry = await self.__local.get(key)
+        if entry is not None:
+            cached_version, value = entry
+            if cached_version == version:
+                requests_counter.inc(cache=self.__name, result="hit")
+                return value
+            await self.__local.delete(key)
+
+        requests_counter.inc(cache=self.__name, result="miss")
+        value = await loader()
+        if value is not None:
+            await self.__local.set(key, (version, value), self.__ttl_seconds)
+        return value
+
+    async def invalidate(self, key):
+        key = str(key)
+        await self.__local.delete(key)
+        try:
+            await self.__shared.incr(
+                f"{VERSION_PREFIX}{self.__name}:{key}",
+                generation_ttl(self.__ttl_seconds),
+            )
+        except Exception:
+            logger.warning("Cache %s invalidation failed", self.__name, exc_info=True)
+            errors_counter.inc(cache=self.__name)
@@ -0,0 +1,38 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.calendar.calendar_service import CalendarService
+from api.modules.db.db import get_db
+from api.modules.security.security_dependencies import get_current_claims
+from api.modules.security.token_claims import TokenClaims
+
+
+def get_calendar_service(db: AsyncSession = Depends(get_db)):
+    return CalendarService(db)
+
+
+router = APIRouter(
+    prefix="/calendar",
+    tags=["calendar"],
+)
+
+
+@router.get("/feed-url")
+async def calendar_feed_url(
+    service: CalendarService = Depends(get_calendar_service),
+    claims: TokenClaims = Depends(get_current_claims),
+):
+    return {"url": await service.get_feed_url(claims)}
+
+
+@router.get("/{user_id}.ics")
+async def calendar_feed(
+    user_id: UUID,
+    token: str,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    service: CalendarService = Depends(get_calendar_service),
+):
+    return await service.get_feed(user_id, token, if_none_match, if_modified_since)
@@ -0,0 +1,63 @@
+import logging
+import time
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from api.config.settings import settings
+from api.modules.cache.cache_backend import cache_backend
+from api.modules.cache.response_cache import errors_counter, requests_counter
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_FEED_CACHE = "calendar_feed"
+
+
+class CalendarFeed:
+    def __init__(self, etag: str, last_modified: int, body: bytes):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+
+
+class CalendarFeedCache:
+    def __init__(self, backend, ttl_seconds: int):
+        self.__backend = backend
+        self.__ttl_seconds = ttl_seconds
+
+    async def get_or_render(
+        self,
+        user_id: UUID,
+        etag: str,
+        render: Callable[[], Awaitable[bytes]],
+    ) -> CalendarFeed:
+        if self.__ttl_seconds <= 0:
+            return CalendarFeed(etag, int(time.time()), await render())
+
+        key = f"{CALENDAR_FEED_CACHE}:{user_id}:{etag}"
+        try:
+            cached = await self.__backend.get(key)
+        except Exception:
+            logger.warning("Calendar feed lookup failed", exc_info=True)
+            errors_counter.inc(cache=CALENDAR_FEED_CACHE)
+            cached = None
+
+        if cached is not None:
+            requests_counter.inc(cache=CALENDAR_FEED_CACHE, result="hit")
+            last_modified, _, body = cached.partition(b"\n")
+            return CalendarFeed(etag, int(last_modified), body)
+
+        requests_counter.inc(cache=CALENDAR_FEED_CACHE, result="miss")
+        feed = CalendarFeed(etag, int(time.time()), await render())
+        try:
+            await self.__backend.set(
+                key, b"%d\n" % feed.last_modified + feed.body, self.__ttl_seconds
+            )
+        except Exception:
+            logger.warning("Calendar feed store failed", exc_info=True)
+            errors_counter.inc(cache=CALENDAR_FEED_CACHE)
+        return feed
+
+
+calendar_feed_cache = CalendarFeedCache(
+    cache_backend, settings.calendar_feed_cache_ttl_seconds
+)
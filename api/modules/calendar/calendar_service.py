@@ -0,0 +1,101 @@
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from api.config.settings import settings
+from api.modules.calendar.calendar_feed_cache import calendar_feed_cache
+from api.modules.calendar.calendar_version_repository import (
+    CalendarVersionRepository,
+)
+from api.modules.calendar.ics_renderer import render_calendar
+from api.modules.http_cache.etag import etag_matches, not_modified, strong_etag
+from api.modules.schedule.schedule_repository import ScheduleRepository
+from api.modules.security.token_claims import TokenClaims
+from api.modules.user.user_repository import UserRepository
+
+CALENDAR_MEDIA_TYPE = "text/calendar; charset=utf-8"
+FEED_TOKEN_LENGTH = 32
+
+
+def _not_modified_since(if_modified_since: str, last_modified: int) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return since.timestamp() >= last_modified
+
+
+class CalendarService:
+    def __init__(self, db: AsyncSession):
+        self.__schedule_repo: ScheduleRepository = ScheduleRepository(db)
+        self.__user_repo: UserRepository = UserRepository(db)
+        self.__version_repo = CalendarVersionRepository(db)
+
+    @staticmethod
+    def feed_token(user_id: UUID, token_version: int) -> str:
+        return hmac.new(
+            settings.jwt_secret_key.encode(),
+            f"calendar:{user_id}:{token_version}".encode(),
+            hashlib.sha256,
+        ).hexdigest()[:FEED_TOKEN_LENGTH]
+
+    async def get_feed_url(self, claims: TokenClaims) -> str:
+        token_version = await self.__user_repo.find_token_version(claims.id)
+        if token_version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+
+        return f"/calendar/{claims.id}.ics?token={self.feed_token(claims.id, token_version)}"
+
+    async def get_feed(
+        self,
+        user_id: UUID,
+        token: str,
+        if_none_match: str | None,
+        if_modified_since: str | None,
+    ) -> Response:
+        token_version = await self.__user_repo.find_token_version(user_id)
+        if token_version is None or not hmac.compare_digest(
+            token, self.feed_token(user_id, token_version)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Calendar feed not found.",
+            )
+
+        since = datetime.now(timezone.utc) - timedelta(
+            days=settings.calendar_feed_past_days
+        )
+        version = await self.__version_repo.find_version(user_id)
+        etag = strong_etag("calendar", user_id, version, since.date())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        feed = await calendar_feed_cache.get_or_render(
+            user_id, etag, lambda: self.__render(user_id, since)
+        )
+        headers = {
+            "Last-Modified": formatdate(feed.last_modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+            "ETag": feed.etag,
+        }
+
+        if (
+            not if_none_match
+            and if_modified_since
+            and _not_modified_since(if_modified_since, feed.last_modified)
+        ):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(feed.body, media_type=CALENDAR_MEDIA_TYPE, headers=headers)
+
+    async def __render(self, user_id: UUID, since: datetime) -> bytes:
+        entries = await self.__schedule_repo.find_calendar_entries(user_id, since)
+        return render_calendar(user_id, entries)
@@ -0,0 +1,11 @@
+from sqlalchemy import BigInteger, Column, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from api.modules.db.db import Base
+
+
+class CalendarVersion(Base):
+    __tablename__ = "calendar_versions"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    version = Column(BigInteger, nullable=False)
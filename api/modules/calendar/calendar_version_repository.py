@@ -0,0 +1,17 @@
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.calendar.calendar_version_model import CalendarVersion
+
+
+class CalendarVersionRepository:
+    def __init__(self, db: AsyncSession):
+        self.__db = db
+
+    async def find_version(self, user_id: UUID) -> int:
+        version = await self.__db.scalar(
+            select(CalendarVersion.version).where(CalendarVersion.user_id == user_id)
+        )
+        return version or 0
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy.engine import Row
+
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+
+MAX_LINE_OCTETS = 75
+PRODUCT_ID = "-//Agenda//Agenda API//PT"
+UID_DOMAIN = "agenda"
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line: str) -> bytes:
+    encoded = line.encode()
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return encoded + b"\r\n"
+
+    folded = bytearray()
+    current = bytearray()
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        char_bytes = char.encode()
+        if len(current) + len(char_bytes) > limit:
+            folded += current + b"\r\n "
+            current = bytearray()
+            limit = MAX_LINE_OCTETS - 1
+        current += char_bytes
+    return bytes(folded + current + b"\r\n")
+
+
+def render_calendar(user_id: UUID, entries: Iterable[Row]) -> bytes:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:Agenda",
+    ]
+    for entry in entries:
+        other_party = (
+            entry.patient_name
+            if entry.professional_id == user_id
+            else entry.professional_name
+        )
+        event_status = (
+            "CANCELLED"
+            if entry.status == AvailabilityStatusEnum.CANCELED
+            else "CONFIRMED"
+        )
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{entry.id}@{UID_DOMAIN}",
+            f"DTSTAMP:{_timestamp(entry.created_at)}",
+            f"DTSTART:{_timestamp(entry.start_time)}",
+            f"DTEND:{_timestamp(entry.end_time)}",
+            f"SUMMARY:{_escape(f'Consulta com {other_party}')}",
+            f"STATUS:{event_status}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return b"".join(_fold(line) for line in lines)
@@ -0,0 +1,245 @@
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Dict, List
+
+from sqlalchemy import Delete, Insert, Update, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from api.modules.metrics.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ROUTER_KEY = "db_router"
+USE_PRIMARY_KEY = "use_primary"
+WROTE_KEY = "wrote"
+PIN_KEY = "pin"
+REPLICA_KEY = "replica"
+USER_ID_KEY = "user_id"
+PIN_PREFIX = "db_pin:"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+ACCESS_TOKEN_COOKIE = "access_token_cookie"
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+routed_counter = registry.counter(
+    "db_routed_statements_total", "Statements routed to each database", ["target"]
+)
+replica_healthy_gauge = registry.gauge(
+    "db_replica_healthy", "1 when the replica is used for reads", ["replica"]
+)
+replica_lag_gauge = registry.gauge(
+    "db_replica_lag_seconds",
+    "Replication lag seen by the last health check",
+    ["replica"],
+)
+
+
+class DbRouter:
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: List[AsyncEngine],
+        backend,
+        sticky_seconds: int,
+        max_lag_seconds: int,
+        health_interval_seconds: int,
+        retry_after_seconds: int,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.__backend = backend
+        self.__sticky_seconds = sticky_seconds
+        self.__max_lag_seconds = max_lag_seconds
+        self.__health_interval_seconds = health_interval_seconds
+        self.__retry_after_seconds = retry_after_seconds
+        self.__unhealthy_until: Dict[int, float] = {}
+        self.__next = 0
+        self.__health_task: asyncio.Task | None = None
+
+        for index, replica in enumerate(replicas):
+            replica_healthy_gauge.set(1, replica=str(index))
+            event.listen(
+                replica.sync_engine,
+                "handle_error",
+                lambda context, index=index: self.__on_replica_error(index, context),
+            )
+
+    def __on_replica_error(self, index: int, context):
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(index)
+
+    def replica_index(self, sync_engine) -> int | None:
+        for index, replica in enumerate(self.replicas):
+            if replica.sync_engine is sync_engine:
+                return index
+        return None
+
+    def mark_unhealthy(self, index: int):
+        logger.warning("Read replica %s marked unhealthy", index)
+        self.__unhealthy_until[index] = time.monotonic() + self.__retry_after_seconds
+        replica_healthy_gauge.set(0, replica=str(index))
+
+    def mark_healthy(self, index: int):
+        if self.__unhealthy_until.pop(index, None) is not None:
+            logger.info("Read replica %s is healthy again", index)
+        replica_healthy_gauge.set(1, replica=str(index))
+
+    def choose_replica(self) -> AsyncEngine | None:
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            index = self.__next % len(self.replicas)
+            self.__next = index + 1
+            if self.__unhealthy_until.get(index, 0) <= now:
+                return self.replicas[index]
+        return None
+
+    async def pin(self, user_id: str | None):
+        if not user_id or not self.replicas or self.__sticky_seconds <= 0:
+            return
+        try:
+            await self.__backend.set(
+                f"{PIN_PREFIX}{user_id}", b"1", self.__sticky_seconds
+            )
+        except Exception:
+            logger.warning("Could not pin user to the primary", exc_info=True)
+
+    async def is_pinned(self, user_id: str | None) -> bool:
+        if not user_id or self.__sticky_seconds <= 0:
+            return False
+        try:
+            return await self.__backend.get(f"{PIN_PREFIX}{user_id}") is not None
+        except Exception:
+            logger.warning("Primary pin lookup failed", exc_info=True)
+            return True
+
+    async def session_info(self, method: str, user_id: str | None) -> dict:
+        return {
+            USER_ID_KEY: user_id,
+            USE_PRIMARY_KEY: not self.replicas
+            or method not in SAFE_METHODS
+            or await self.is_pinned(user_id),
+        }
+
+    async def check_replicas(self):
+        for index, replica in enumerate(self.replicas):
+            try:
+                async with replica.connect() as connection:
+                    lag = float((await connection.execute(REPLICA_LAG_QUERY)).scalar())
+                replica_lag_gauge.set(lag, replica=str(index))
+                if self.__max_lag_seconds and lag > self.__max_lag_seconds:
+                    self.mark_unhealthy(index)
+                else:
+                    self.mark_healthy(index)
+            except Exception:
+                logger.exception("Health check failed for read replica %s", index)
+                self.mark_unhealthy(index)
+
+    async def __health_loop(self):
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(self.__health_interval_seconds)
+
+    def start(self):
+        if self.replicas and self.__health_task is None:
+            self.__health_task = asyncio.create_task(self.__health_loop())
+
+    async def stop(self):
+        if self.__health_task is not None:
+            self.__health_task.cancel()
+            self.__health_task = None
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router: DbRouter = self.info[ROUTER_KEY]
+
+        if (
+            self._flushing
+            or self.info.get(USE_PRIMARY_KEY)
+            or self.info.get(WROTE_KEY)
+            or isinstance(clause, (Insert, Update, Delete))
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            routed_counter.inc(target="primary")
+            return router.primary.sync_engine
+
+        if REPLICA_KEY not in self.info:
+            self.info[REPLICA_KEY] = router.choose_replica()
+        replica = self.info[REPLICA_KEY]
+        if replica is None:
+            routed_counter.inc(target="primary")
+            return router.primary.sync_engine
+
+        routed_counter.inc(target="replica")
+        return replica.sync_engine
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        try:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        except Exception:
+            router: DbRouter = self.info[ROUTER_KEY]
+            index = router.replica_index(engine)
+            if index is None:
+                raise
+
+            logger.exception("Could not connect to read replica %s", index)
+            router.mark_unhealthy(index)
+            self.info[REPLICA_KEY] = None
+            routed_counter.inc(target="primary")
+            return super()._connection_for_bind(
+                router.primary.sync_engine, execution_options, **kw
+            )
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, _flush_context):
+    session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _on_orm_execute(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    if session.info.get(WROTE_KEY):
+        session.info[PIN_KEY] = True
+
+
+class RoutingAsyncSession(AsyncSession):
+    async def commit(self):
+        await super().commit()
+        if self.info.pop(PIN_KEY, False):
+            await self.info[ROUTER_KEY].pin(self.info.get(USER_ID_KEY))
+
+
+# Routing hint only: the token signature is checked later by the security dependencies.
+def unverified_user_id(headers, cookies) -> str | None:
+    authorization = headers.get("authorization", "")
+    token = (
+        authorization[7:]
+        if authorization.lower().startswith("bearer ")
+        else cookies.get(ACCESS_TOKEN_COOKIE)
+    )
+    if not token:
+        return None
+
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        subject = json.loads(base64.urlsafe_b64decode(payload))["subject"]
+        return str(subject["user_id"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
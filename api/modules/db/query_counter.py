@@ -0,0 +1,110 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = b"x-db-query-count"
+
+
+class QueryCounter:
+    def __init__(
+        self, parent: "QueryCounter | None" = None, capture_statements: bool = False
+    ):
+        self.count = 0
+        self.rows = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.statements: list[str] | None = [] if capture_statements else None
+        self.parent = parent
+
+
+_current_counter: ContextVar[QueryCounter | None] = ContextVar(
+    "query_counter", default=None
+)
+
+
+@contextmanager
+def count_queries(capture_statements: bool = False) -> Iterator[QueryCounter]:
+    counter = QueryCounter(_current_counter.get(), capture_statements)
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def record_pool_wait(seconds: float):
+    counter = _current_counter.get()
+    while counter is not None:
+        counter.pool_wait_seconds += seconds
+        counter = counter.parent
+
+
+def _before_cursor_execute(_conn, _cursor, statement, _parameters, context, *_args):
+    counter = _current_counter.get()
+    if counter is None:
+        return
+
+    context.query_counter_started = time.perf_counter()
+    while counter is not None:
+        counter.count += 1
+        if counter.statements is not None:
+            counter.statements.append(statement)
+        counter = counter.parent
+
+
+def _after_cursor_execute(_conn, cursor, _statement, _parameters, context, *_args):
+    counter = _current_counter.get()
+    started = getattr(context, "query_counter_started", None)
+    if counter is None or started is None:
+        return
+
+    elapsed = time.perf_counter() - started
+    rows = cursor.rowcount if cursor.description is not None else 0
+    while counter is not None:
+        counter.db_seconds += elapsed
+        counter.rows += max(rows, 0)
+        counter = counter.parent
+
+
+_LISTENERS = (
+    ("before_cursor_execute", _before_cursor_execute),
+    ("after_cursor_execute", _after_cursor_execute),
+)
+
+
+def install_query_counter(sync_engine: Engine):
+    for name, listener in _LISTENERS:
+        if not event.contains(sync_engine, name, listener):
+            event.listen(sync_engine, name, listener)
+
+
+def remove_query_counter(sync_engine: Engine):
+    for name, listener in _LISTENERS:
+        if event.contains(sync_engine, name, listener):
+            event.remove(sync_engine, name, listener)
+
+
+class QueryCountMiddleware:
+    def __init__(self, app, expose_header: bool = False):
+        self.__app = app
+        self.__expose_header = expose_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.__app(scope, receive, send)
+
+        with count_queries() as counter:
+
+            async def send_with_count(message):
+                if message["type"] == "http.response.start" and self.__expose_header:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (QUERY_COUNT_HEADER, str(counter.count).encode()),
+                    ]
+                await send(message)
+
+            await self.__app(scope, receive, send_with_count)
@@ -0,0 +1,225 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.config.settings import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_EXPLAINS_IN_FLIGHT = 2
+MAX_PARAMETER_ITEMS = 20
+SAFE_STRING = re.compile(
+    r"^([A-Z][A-Z_]*|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+SLOT_SUFFIX = ".json"
+POSITION_FILE = ".position"
+
+_current_scope: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "slow_query_scope", default=None
+)
+
+
+def redact(value):
+    if value is None or isinstance(value, (bool, int, float, Decimal)):
+        return value
+    if isinstance(value, (datetime, date, timedelta, UUID)):
+        return str(value)
+    if isinstance(value, str):
+        return value if SAFE_STRING.match(value) else f"<redacted {len(value)} chars>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<redacted {len(value)} bytes>"
+    if isinstance(value, (list, tuple)):
+        items = [redact(item) for item in value[:MAX_PARAMETER_ITEMS]]
+        if len(value) > MAX_PARAMETER_ITEMS:
+            items.append(f"<{len(value) - MAX_PARAMETER_ITEMS} more>")
+        return items
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    return f"<{type(value).__name__}>"
+
+
+class SlowQueryRing:
+    def __init__(self, directory: str, max_entries: int):
+        self.__directory = directory
+        self.__max_entries = max(max_entries, 1)
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def append(self, record: dict):
+        os.makedirs(self.__directory, exist_ok=True)
+        with open(os.path.join(self.__directory, POSITION_FILE), "a+") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            lock.seek(0)
+            position = int(lock.read() or 0) % self.__max_entries
+            slot = os.path.join(self.__directory, f"{position:06d}{SLOT_SUFFIX}")
+            with open(f"{slot}.tmp", "w") as file:
+                json.dump(record, file, default=str)
+            os.replace(f"{slot}.tmp", slot)
+            lock.seek(0)
+            lock.truncate()
+            lock.write(str((position + 1) % self.__max_entries))
+
+    def read(self) -> list[dict]:
+        if not os.path.isdir(self.__directory):
+            return []
+        records = []
+        for name in os.listdir(self.__directory):
+            if not name.endswith(SLOT_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self.__directory, name)) as file:
+                    records.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        return sorted(records, key=lambda record: record["recorded_at"])
+
+    def clear(self) -> int:
+        if not os.path.isdir(self.__directory):
+            return 0
+        removed = 0
+        for name in os.listdir(self.__directory):
+            if name.endswith(SLOT_SUFFIX) or name == POSITION_FILE:
+                os.remove(os.path.join(self.__directory, name))
+                removed += name.endswith(SLOT_SUFFIX)
+        return removed
+
+
+class SlowQueryRecorder:
+    def __init__(
+        self, ring: SlowQueryRing, threshold_ms: int, explain_sample_rate: float
+    ):
+        self.__ring = ring
+        self.__threshold = threshold_ms / 1000
+        self.__explain_sample_rate = explain_sample_rate
+        self.__engines: dict = {}
+        self.__explains: set[asyncio.Task] = set()
+
+    def install(self, db_engine: AsyncEngine):
+        sync_engine = db_engine.sync_engine
+        self.__engines[sync_engine] = db_engine
+        for name, listener in (
+            ("before_cursor_execute", self._before_cursor_execute),
+            ("after_cursor_execute", self._after_cursor_execute),
+        ):
+            if not event.contains(sync_engine, name, listener):
+                event.listen(sync_engine, name, listener)
+
+    def _before_cursor_execute(
+        self, _conn, _cursor, _statement, _parameters, context, *_args
+    ):
+        context.slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        started = getattr(context, "slow_query_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        keyword = statement.lstrip()[:10].upper()
+        if duration < self.__threshold or keyword.startswith("EXPLAIN"):
+            return
+
+        scope = _current_scope.get()
+        route = None
+        if scope is not None:
+            template = getattr(scope.get("route"), "path", scope["path"])
+            route = f"{scope['method']} {template}"
+        record = {
+            "id": uuid.uuid4().hex[:12],
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            "route": route,
+            "pool": getattr(conn.engine.pool, "pool_name", None),
+            "rows": cursor.rowcount,
+            "statement": statement,
+            "parameters": redact(parameters[0] if executemany else parameters),
+        }
+        if executemany:
+            record["batch_size"] = len(parameters)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.__write(record)
+        if (
+            not executemany
+            and keyword.startswith(EXPLAINABLE)
+            and len(self.__explains) < MAX_EXPLAINS_IN_FLIGHT
+            and random.random() < self.__explain_sample_rate
+        ):
+            task = contextvars.Context().run(
+                loop.create_task,
+                self.__explain(
+                    self.__engines[conn.engine], statement, parameters, record
+                ),
+            )
+            self.__explains.add(task)
+            task.add_done_callback(self.__explains.discard)
+        else:
+            loop.run_in_executor(None, self.__write, record)
+
+    async def __explain(
+        self, db_engine: AsyncEngine, statement: str, parameters, record: dict
+    ):
+        try:
+            async with db_engine.connect() as connection:
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters)
+                )
+                plan = result.scalar()
+            record["plan"] = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+        except Exception as error:
+            record["explain_error"] = type(error).__name__
+        await asyncio.get_running_loop().run_in_executor(None, self.__write, record)
+
+    def __write(self, record: dict):
+        try:
+            self.__ring.append(record)
+        except OSError:
+            logger.warning(
+                "Could not write slow query to %s", self.__ring.directory, exc_info=True
+            )
+
+
+class SlowQueryLogMiddleware:
+    def __init__(self, app):
+        self.__app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.__app(scope, receive, send)
+
+        token = _current_scope.set(scope)
+        try:
+            await self.__app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+slow_query_recorder = SlowQueryRecorder(
+    SlowQueryRing(settings.slow_query_log_dir, settings.slow_query_log_max_entries),
+    settings.slow_query_threshold_ms,
+    settings.slow_query_explain_sample_rate,
+)
@@ -0,0 +1,103 @@
+import csv
+import io
+from datetime import datetime, timezone
+from enum import Enum
+from typing import AsyncIterator, Callable, List
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.enum.export_format_enum import ExportFormatEnum
+from api.modules.db.db import session_for
+
+EXPORT_CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv; charset=utf-8",
+}
+EXTENSIONS = {ExportFormatEnum.NDJSON: "ndjson", ExportFormatEnum.CSV: "csv"}
+
+
+def validate_export_range(
+    start: datetime | None, end: datetime | None
+) -> tuple[datetime | None, datetime | None]:
+    start = start.replace(tzinfo=timezone.utc) if start and not start.tzinfo else start
+    end = end.replace(tzinfo=timezone.utc) if end and not end.tzinfo else end
+    if start and end and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end.",
+        )
+    return start, end
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+async def _encode_ndjson(rows: AsyncIterator[Row]) -> AsyncIterator[bytes]:
+    chunk = []
+    async for row in rows:
+        chunk.append(
+            orjson.dumps(row._asdict(), default=str, option=orjson.OPT_APPEND_NEWLINE)
+        )
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
+async def _encode_csv(
+    rows: AsyncIterator[Row], columns: List[str]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 1
+    async for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(
+    export_format: ExportFormatEnum,
+    filename: str,
+    columns: List[str],
+    user_id,
+    stream_rows: Callable[[AsyncSession], AsyncIterator[Row]],
+) -> StreamingResponse:
+    async def body() -> AsyncIterator[bytes]:
+        async with session_for("GET", str(user_id)) as db:
+            rows = stream_rows(db)
+            if export_format == ExportFormatEnum.CSV:
+                chunks = _encode_csv(rows, columns)
+            else:
+                chunks = _encode_ndjson(rows)
+            async for chunk in chunks:
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{EXTENSIONS[export_format]}"'
+        },
+    )
@@ -0,0 +1,38 @@
+import asyncio
+import logging
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from api.modules.db.db import engine, pool_status
+
+logger = logging.getLogger(__name__)
+
+READY_CHECK_TIMEOUT_SECONDS = 2
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+
+@router.get("/ready")
+async def ready():
+    try:
+        async with asyncio.timeout(READY_CHECK_TIMEOUT_SECONDS):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        database, status_code = "ok", status.HTTP_200_OK
+    except Exception:
+        logger.warning("Readiness check could not reach the database", exc_info=True)
+        database, status_code = "unavailable", status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "status": "ready" if status_code == status.HTTP_200_OK else "unavailable",
+            "database": database,
+            "pool": pool_status(engine),
+        },
+    )
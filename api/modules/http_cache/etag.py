@@ -0,0 +1,40 @@
+import hashlib
+from typing import Any, Iterable
+
+from fastapi import Response
+from starlette import status
+
+ETAG_LENGTH = 32
+CONTENT_CODING_SUFFIXES = ("-gzip", "-br")
+
+
+def strong_etag(*parts: Any, rows: Iterable[Iterable[Any]] = ()) -> str:
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode())
+    for row in rows:
+        digest.update(b"\x1e")
+        digest.update("\x1f".join(str(value) for value in row).encode())
+    return f'"{digest.hexdigest()[:ETAG_LENGTH]}"'
+
+
+def _opaque(etag: str) -> str:
+    opaque = etag.strip().removeprefix("W/")
+    for suffix in CONTENT_CODING_SUFFIXES:
+        if opaque.endswith(f'{suffix}"'):
+            return opaque[: -len(suffix) - 1] + '"'
+    return opaque
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _opaque(etag)
+    return any(_opaque(candidate) == opaque for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str, headers: dict | None = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={**(headers or {}), "ETag": etag},
+    )
@@ -0,0 +1,112 @@
+import logging
+import time
+from collections import Counter as ShapeCounter
+
+from api.modules.db.query_counter import QueryCounter, count_queries
+from api.modules.metrics.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+STATEMENT_LOG_LENGTH = 300
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000)
+
+duration_histogram = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency per route template",
+    ["method", "route", "status"],
+)
+db_histogram = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per request",
+    ["method", "route"],
+)
+python_histogram = registry.histogram(
+    "http_request_python_seconds",
+    "Request time outside SQL statements and pool checkout",
+    ["method", "route"],
+)
+pool_wait_histogram = registry.histogram(
+    "http_request_pool_wait_seconds",
+    "Time spent waiting for a pooled connection per request",
+    ["method", "route"],
+    WAIT_BUCKETS,
+)
+statements_histogram = registry.histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request",
+    ["method", "route"],
+    STATEMENT_BUCKETS,
+)
+rows_histogram = registry.histogram(
+    "http_request_db_rows",
+    "Rows returned by SQL statements per request",
+    ["method", "route"],
+    ROW_BUCKETS,
+)
+n_plus_one_counter = registry.counter(
+    "http_request_n_plus_one_total",
+    "Requests that repeated one statement shape more than the N+1 threshold",
+    ["method", "route"],
+)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app, n_plus_one_threshold: int = 5):
+        self.__app = app
+        self.__n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.__app(scope, receive, send)
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with count_queries(capture_statements=True) as counter:
+            try:
+                await self.__app(scope, receive, send_with_status)
+            finally:
+                self.__observe(
+                    scope, counter, status_code, time.perf_counter() - started
+                )
+
+    def __observe(self, scope, counter: QueryCounter, status_code: int, elapsed: float):
+        method = scope["method"]
+        route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+        duration_histogram.observe(
+            elapsed, method=method, route=route, status=status_code
+        )
+        db_histogram.observe(counter.db_seconds, method=method, route=route)
+        python_histogram.observe(
+            max(elapsed - counter.db_seconds - counter.pool_wait_seconds, 0),
+            method=method,
+            route=route,
+        )
+        pool_wait_histogram.observe(
+            counter.pool_wait_seconds, method=method, route=route
+        )
+        statements_histogram.observe(counter.count, method=method, route=route)
+        rows_histogram.observe(counter.rows, method=method, route=route)
+
+        if not counter.statements:
+            return
+        statement, repeats = ShapeCounter(counter.statements).most_common(1)[0]
+        if repeats > self.__n_plus_one_threshold:
+            n_plus_one_counter.inc(method=method, route=route)
+            logger.warning(
+                "Possible N+1 in %s %s: statement ran %d times: %s",
+                method,
+                route,
+                repeats,
+                statement[:STATEMENT_LOG_LENGTH],
+            )
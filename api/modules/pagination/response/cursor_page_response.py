@@ -0,0 +1,10 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CursorPageResponse(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: str | None
@@ -1,30 +1,28 @@
 from datetime import datetime
+from typing import List
 from uuid import UUID
 
+from pydantic import AliasPath, BaseModel, Field, TypeAdapter
+
 from api.enum.availability_status_enum import AvailabilityStatusEnum
-from api.modules.availabilities.response.availabilities_response import (
-    AvailabilitiesResponse,
-)
-from api.modules.schedule.schedule_model import Schedule
 from api.modules.user.response.user_response import UserResponse
-from api.modules.user.user_mapper import UserMapper
 
 
-class ScheduleResponse:
+class ScheduleResponse(BaseModel):
     id: UUID
-    user: UserResponse
     patient_id: UUID
     availability_id: UUID
+    status: AvailabilityStatusEnum = Field(
+        validation_alias=AliasPath("availability", "status")
+    )
+    start_time: datetime = Field(
+        validation_alias=AliasPath("availability", "start_time")
+    )
     created_at: datetime
-    start_time: datetime
-    status: AvailabilityStatusEnum
-    availabilities: AvailabilitiesResponse
+    user: UserResponse = Field(validation_alias=AliasPath("availability", "user"))
+
+    class Config:
+        from_attributes = True
+
 
-    def __init__(self, schedule: Schedule):
-        self.id = schedule.id
-        self.patient_id = schedule.patient_id
-        self.availability_id = schedule.availability_id
-        self.status = schedule.availability.status
-        self.start_time = schedule.availability.start_time
-        self.created_at = schedule.created_at
-        self.user = UserMapper.to_user_response(schedule.availability.user)
+schedule_list_adapter = TypeAdapter(List[ScheduleResponse])
@@ -1,23 +1,28 @@
+from datetime import datetime
+from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Security
-from fastapi_jwt import JwtAuthorizationCredentials
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.enum.export_format_enum import ExportFormatEnum
 from api.enum.time_enum import TimeEnum
 from api.modules.db.db import get_db
+from api.modules.http_cache.etag import etag_matches, not_modified
 from api.modules.schedule.request.schedule_create_request import ScheduleCreateRequest
-from api.modules.schedule.schedule_model import Schedule
+from api.modules.schedule.response.schedule_response import (
+    ScheduleResponse,
+    schedule_list_adapter,
+)
 from api.modules.schedule.schedule_service import ScheduleService
-from api.modules.security.security_service import SecurityService
-
+from api.modules.security.security_dependencies import get_current_claims
+from api.modules.security.token_claims import TokenClaims
 
-def get_schedule_service(db: Session = Depends(get_db)):
-    return ScheduleService(db)
+MAX_SCHEDULE_LIMIT = 1000
 
 
-def get_security_service():
-    return SecurityService()
+def get_schedule_service(db: AsyncSession = Depends(get_db)):
+    return ScheduleService(db)
 
 
 router = APIRouter(
@@ -30,31 +35,56 @@ router = APIRouter(
 async def schedule(
     data: ScheduleCreateRequest,
     service: ScheduleService = Depends(get_schedule_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    new_schedule: Schedule = service.create_schedule(data, credentials.subject)
+    schedule_id = await service.create_schedule(data, claims)
 
-    return {"schedule_id": new_schedule.id}
+    return {"schedule_id": schedule_id}
 
 
-@router.get("")
+@router.get("", response_model=List[ScheduleResponse])
 async def schedule(
     time_filter: TimeEnum | None = TimeEnum.WEEK,
+    start: datetime | None = Query(None, alias="from"),
+    end: datetime | None = Query(None, alias="to"),
+    timezone_name: str = Query("UTC", alias="timezone"),
+    limit: int | None = Query(None, ge=1, le=MAX_SCHEDULE_LIMIT),
+    if_none_match: str | None = Header(None),
     service: ScheduleService = Depends(get_schedule_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    return service.get_schedules(time_filter, credentials.subject)
+    if if_none_match:
+        etag = await service.get_schedules_etag(
+            claims, time_filter, start, end, timezone_name, limit
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    schedules, etag = await service.get_schedules(
+        claims, time_filter, start, end, timezone_name, limit
+    )
+
+    return Response(
+        content=schedule_list_adapter.dump_json(schedules),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/export")
+async def export_schedules(
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format"),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    claims: TokenClaims = Depends(get_current_claims),
+):
+    return ScheduleService.export_schedules(claims.id, export_format, start, end)
+
 
 @router.delete("", status_code=204)
 async def delete_schedule(
-        schedule_id: UUID,
-        service: ScheduleService = Depends(get_schedule_service),
-        credentials: JwtAuthorizationCredentials = Security(
-            get_security_service().access_security
-        )
+    schedule_id: UUID,
+    service: ScheduleService = Depends(get_schedule_service),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    service.delete_schedule(schedule_id, credentials.subject.get("user_id"))
+    await service.delete_schedule(schedule_id, claims)
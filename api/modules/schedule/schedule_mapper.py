@@ -14,4 +14,4 @@ class ScheduleMapper:
 
     @staticmethod
     def to_schedule_response(schedule: Schedule):
-        return ScheduleResponse(schedule=schedule)
+        return ScheduleResponse.model_validate(schedule)
@@ -16,8 +16,17 @@ class Schedule(Base):
     availability_id = Column(
         UUID(as_uuid=True), ForeignKey("availabilities.id"), nullable=False, unique=True
     )
+    start_time = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
 
-    availability = relationship("Availabilities", back_populates="schedules")
+    availability = relationship(
+        "Availabilities", back_populates="schedules", lazy="raise_on_sql"
+    )
@@ -1,80 +1,239 @@
-from datetime import datetime, timedelta
-from typing import Type
-from uuid import UUID
+from datetime import datetime
+from typing import AsyncIterator, Type
+from uuid import UUID, uuid4
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import bindparam, insert, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, contains_eager, joinedload
 
-from api.enum.time_enum import TimeEnum
+from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.user_roles_enum import UserRolesEnum
 from api.modules.availabilities.availabilities_model import Availabilities
 from api.modules.schedule.schedule_model import Schedule
+from api.modules.user.user_model import User
+
+EXPORT_COLUMNS = (
+    Schedule.id,
+    Schedule.professional_id,
+    Schedule.patient_id,
+    Schedule.availability_id,
+    Availabilities.status,
+    Availabilities.start_time,
+    Availabilities.end_time,
+    Schedule.created_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+VERSION_COLUMNS = (
+    Schedule.id,
+    Schedule.updated_at,
+    Availabilities.updated_at,
+    User.updated_at,
+)
+
+_calendar_professional = aliased(User)
+_calendar_patient = aliased(User)
+
+
+def _book_query():
+    target = (
+        select(Availabilities.id)
+        .where(
+            Availabilities.id == bindparam("availability_id"),
+            Availabilities.status == AvailabilityStatusEnum.AVAILABLE,
+        )
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    taken = (
+        update(Availabilities)
+        .where(Availabilities.id == target)
+        .values(status=AvailabilityStatusEnum.TAKEN)
+        .returning(
+            Availabilities.id, Availabilities.owner_id, Availabilities.start_time
+        )
+        .cte("taken")
+    )
+    return (
+        insert(Schedule)
+        .from_select(
+            ["id", "professional_id", "patient_id", "availability_id", "start_time"],
+            select(
+                bindparam("schedule_id", type_=Schedule.id.type),
+                taken.c.owner_id,
+                bindparam("patient_id", type_=Schedule.patient_id.type),
+                taken.c.id,
+                taken.c.start_time,
+            ),
+        )
+        .returning(Schedule.id, Schedule.professional_id)
+    )
+
+
+BOOK_QUERY = _book_query()
 
 
 class ScheduleRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.__db = db
 
-    def find_by_id(self, av_id) -> Schedule | None:
-        return self.__db.query(Schedule).filter(Schedule.id == av_id).first()
+    async def find_by_id(self, av_id) -> Schedule | None:
+        return await self.__db.scalar(
+            select(Schedule)
+            .options(joinedload(Schedule.availability))
+            .where(Schedule.id == av_id)
+        )
 
-    def find_all(self) -> list[Type[Schedule]]:
-        return self.__db.query(Schedule).all()
+    async def find_all(self) -> list[Type[Schedule]]:
+        result = await self.__db.scalars(select(Schedule))
+        return result.all()
 
-    def save(self, schedule) -> Schedule:
+    async def save(self, schedule) -> Schedule:
         self.__db.add(schedule)
-        self.__db.commit()
-        self.__db.refresh(schedule)
+        await self.__db.commit()
+        await self.__db.refresh(schedule)
         return schedule
 
-    def delete(self, schedule):
-        self.__db.delete(schedule)
-        self.__db.commit()
-
-
-    def find_by_professional_id_or_patient_id_filter_by_time(
-        self, professional_id: UUID, patient_id: UUID, time_filter: TimeEnum
+    async def book(self, availability_id, patient_id) -> Row | None:
+        result = await self.__db.execute(
+            BOOK_QUERY,
+            {
+                "schedule_id": uuid4(),
+                "availability_id": availability_id,
+                "patient_id": patient_id,
+            },
+            execution_options={"dml_strategy": "raw"},
+        )
+        booked = result.one_or_none()
+        if booked:
+            await self.__db.commit()
+        return booked
+
+    async def delete(self, schedule):
+        await self.__db.delete(schedule)
+        await self.__db.commit()
+
+    @staticmethod
+    def __filter_by_user_and_range(
+        query,
+        user_id: UUID,
+        role: UserRolesEnum,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int | None,
+    ):
+        owner_column = (
+            Schedule.professional_id
+            if str(role) == str(UserRolesEnum.PROFESSIONAL)
+            else Schedule.patient_id
+        )
+        query = query.where(owner_column == user_id)
+
+        if start:
+            query = query.where(Schedule.start_time >= start)
+        if end:
+            query = query.where(Schedule.start_time < end)
+
+        return query.order_by(Schedule.start_time, Schedule.id).limit(limit)
+
+    async def find_by_user_in_range(
+        self,
+        user_id: UUID,
+        role: UserRolesEnum,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int | None = None,
     ) -> list[Schedule]:
+        query = self.__filter_by_user_and_range(
+            select(Schedule)
+            .join(Schedule.availability)
+            .options(
+                contains_eager(Schedule.availability).joinedload(Availabilities.user)
+            ),
+            user_id,
+            role,
+            start,
+            end,
+            limit,
+        )
+
+        result = await self.__db.scalars(query)
+        return result.unique().all()
+
+    async def find_versions_by_user_in_range(
+        self,
+        user_id: UUID,
+        role: UserRolesEnum,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int | None = None,
+    ) -> list[Row]:
+        result = await self.__db.execute(
+            self.__filter_by_user_and_range(
+                select(*VERSION_COLUMNS)
+                .join(Schedule.availability)
+                .join(Availabilities.user),
+                user_id,
+                role,
+                start,
+                end,
+                limit,
+            )
+        )
+        return result.all()
+
+    async def stream_for_export(
+        self,
+        user_id: UUID,
+        start: datetime | None,
+        end: datetime | None,
+        chunk_size: int,
+    ) -> AsyncIterator[Row]:
         query = (
-            self.__db.query(Schedule)
+            select(*EXPORT_COLUMNS)
             .join(Schedule.availability)
-            .options(joinedload(Schedule.availability))
-            .filter(
+            .where(
+                or_(Schedule.professional_id == user_id, Schedule.patient_id == user_id)
+            )
+        )
+        if start:
+            query = query.where(Schedule.start_time >= start)
+        if end:
+            query = query.where(Schedule.start_time < end)
+
+        result = await self.__db.stream(
+            query.order_by(Schedule.start_time, Schedule.id).execution_options(
+                yield_per=chunk_size
+            )
+        )
+        async for row in result:
+            yield row
+
+    async def find_calendar_entries(self, user_id: UUID, since: datetime) -> list[Row]:
+        result = await self.__db.execute(
+            select(
+                Schedule.id,
+                Schedule.professional_id,
+                Schedule.created_at,
+                Availabilities.status,
+                Availabilities.start_time,
+                Availabilities.end_time,
+                _calendar_professional.name.label("professional_name"),
+                _calendar_patient.name.label("patient_name"),
+            )
+            .join(Schedule.availability)
+            .join(
+                _calendar_professional,
+                _calendar_professional.id == Schedule.professional_id,
+            )
+            .join(_calendar_patient, _calendar_patient.id == Schedule.patient_id)
+            .where(
                 or_(
-                    Schedule.professional_id == professional_id,
-                    Schedule.patient_id == patient_id,
-                )
+                    Schedule.professional_id == user_id, Schedule.patient_id == user_id
+                ),
+                Schedule.start_time >= since,
             )
+            .order_by(Schedule.start_time, Schedule.id)
         )
-
-        now = datetime.now()
-
-        match time_filter:
-            case TimeEnum.DAY:
-                start = datetime(now.year, now.month, now.day)
-                end = start + timedelta(days=1)
-                query = query.filter(
-                    Availabilities.start_time >= start, Availabilities.start_time < end
-                )
-
-            case TimeEnum.WEEK:
-                start = now - timedelta(days=now.weekday())
-                start = datetime(start.year, start.month, start.day)
-                end = start + timedelta(days=7)
-                query = query.filter(
-                    Availabilities.start_time >= start, Availabilities.start_time < end
-                )
-
-            case TimeEnum.MONTH:
-                start = datetime(now.year, now.month, 1)
-                if now.month == 12:
-                    end = datetime(now.year + 1, 1, 1)
-                else:
-                    end = datetime(now.year, now.month + 1, 1)
-                query = query.filter(
-                    Availabilities.start_time >= start, Availabilities.start_time < end
-                )
-
-            case _:
-                pass
-
-        return query.all()
+        return result.all()
@@ -1,81 +1,163 @@
-from typing import Any, Dict
+from datetime import datetime
+from typing import List
 from uuid import UUID
 
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from api.enum.availability_status_enum import AvailabilityStatusEnum
+from api.enum.export_format_enum import ExportFormatEnum
 from api.enum.time_enum import TimeEnum
+from api.modules.availabilities.availabilities_cache import availabilities_cache
 from api.modules.availabilities.availabilities_model import Availabilities
 from api.modules.availabilities.availabilities_repository import (
     AvailabilitiesRepository,
 )
 from api.modules.availabilities.availabilities_validator import AvailabilitiesValidator
+from api.modules.export.export_response import (
+    EXPORT_CHUNK_ROWS,
+    export_response,
+    validate_export_range,
+)
+from api.modules.http_cache.etag import strong_etag
 from api.modules.schedule.request.schedule_create_request import ScheduleCreateRequest
-from api.modules.schedule.schedule_mapper import ScheduleMapper
+from api.modules.schedule.response.schedule_response import (
+    ScheduleResponse,
+    schedule_list_adapter,
+)
 from api.modules.schedule.schedule_model import Schedule
-from api.modules.schedule.schedule_repository import ScheduleRepository
+from api.modules.schedule.schedule_repository import (
+    EXPORT_FIELDS,
+    ScheduleRepository,
+)
 from api.modules.schedule.schedule_validator import ScheduleValidator
-from api.modules.user.user_model import User
+from api.modules.security.token_claims import TokenClaims
+from api.modules.time_window.time_window import resolve_window
+from api.modules.user.user_cache import UserSnapshot
 from api.modules.user.user_repository import UserRepository
 from api.modules.user.user_validator import UserValidator
 
 
 class ScheduleService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.__repo: ScheduleRepository = ScheduleRepository(db)
         self.__availabilities_repo: AvailabilitiesRepository = AvailabilitiesRepository(
             db
         )
         self.__user_repo: UserRepository = UserRepository(db)
 
-    def create_schedule(
-        self, request: ScheduleCreateRequest, subject: Dict[str, Any]
-    ) -> Schedule | None:
-        availability: Availabilities = self.__availabilities_repo.find_by_id(
-            request.availability_id
-        )
-        user: User = self.__user_repo.find_by_id(subject.get("user_id"))
-
-        AvailabilitiesValidator.validate_if_can_schedule(availability, user)
+    async def create_schedule(
+        self, request: ScheduleCreateRequest, claims: TokenClaims
+    ) -> UUID:
+        user = await self.__user_repo.find_principal(claims)
 
-        schedule: Schedule = ScheduleMapper.to_schedule(
-            professional_id=availability.owner_id,
-            patient_id=user.id,
-            availability_id=availability.id,
-        )
+        UserValidator.validate_user(user)
+        AvailabilitiesValidator.validate_user_can_schedule(user)
 
         try:
-            schedule: Schedule = self.__repo.save(schedule)
-            self.__update_availability_to_taken(availability)
-            return schedule
-
+            booked = await self.__repo.book(request.availability_id, user.id)
         except IntegrityError:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="This schedule already exists",
             )
 
-    def __update_availability_to_taken(self, availability: Availabilities):
-        availability.status = AvailabilityStatusEnum.TAKEN
-        self.__availabilities_repo.save(availability)
+        if not booked:
+            availability: Availabilities = await self.__availabilities_repo.find_by_id(
+                request.availability_id
+            )
+            AvailabilitiesValidator.validate_availability(availability)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="This availability cannot be scheduled.",
+            )
+
+        await availabilities_cache.invalidate(booked.professional_id)
+        return booked.id
 
-    def get_schedules(self, time_filter: TimeEnum, subject: Dict[str, Any]):
-        user: User = self.__user_repo.find_by_id(subject.get("user_id"))
+    async def __get_listing_user(
+        self, claims: TokenClaims
+    ) -> TokenClaims | UserSnapshot:
+        user = await self.__user_repo.find_principal(claims)
 
-        schedule_list: list[Schedule] = (
-            self.__repo.find_by_professional_id_or_patient_id_filter_by_time(
-                user.id, user.id, time_filter
-            )
+        UserValidator.validate_user(user)
+        return user
+
+    async def get_schedules(
+        self,
+        claims: TokenClaims,
+        time_filter: TimeEnum,
+        start: datetime | None,
+        end: datetime | None,
+        timezone_name: str,
+        limit: int | None,
+    ) -> tuple[List[ScheduleResponse], str]:
+        user = await self.__get_listing_user(claims)
+        start, end = resolve_window(time_filter, start, end, timezone_name)
+
+        schedule_list: list[Schedule] = await self.__repo.find_by_user_in_range(
+            user.id, user.role, start, end, limit
         )
 
-        return [ScheduleMapper.to_schedule_response(s) for s in schedule_list]
+        etag = strong_etag(
+            "schedule",
+            rows=(
+                (
+                    schedule.id,
+                    schedule.updated_at,
+                    schedule.availability.updated_at,
+                    schedule.availability.user.updated_at,
+                )
+                for schedule in schedule_list
+            ),
+        )
+        return (
+            schedule_list_adapter.validate_python(schedule_list, from_attributes=True),
+            etag,
+        )
+
+    async def get_schedules_etag(
+        self,
+        claims: TokenClaims,
+        time_filter: TimeEnum,
+        start: datetime | None,
+        end: datetime | None,
+        timezone_name: str,
+        limit: int | None,
+    ) -> str:
+        user = await self.__get_listing_user(claims)
+        start, end = resolve_window(time_filter, start, end, timezone_name)
+
+        versions = await self.__repo.find_versions_by_user_in_range(
+            user.id, user.role, start, end, limit
+        )
+        return strong_etag("schedule", rows=versions)
+
+    @staticmethod
+    def export_schedules(
+        user_id: UUID,
+        export_format: ExportFormatEnum,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> StreamingResponse:
+        start, end = validate_export_range(start, end)
+
+        return export_response(
+            export_format,
+            "schedules",
+            EXPORT_FIELDS,
+            user_id,
+            lambda db: ScheduleRepository(db).stream_for_export(
+                user_id, start, end, EXPORT_CHUNK_ROWS
+            ),
+        )
 
-    def delete_schedule(self, schedule_id: UUID, user_id: UUID):
-        schedule: Schedule = self.__repo.find_by_id(schedule_id)
-        user: User = self.__user_repo.find_by_id(user_id)
+    async def delete_schedule(self, schedule_id: UUID, claims: TokenClaims):
+        schedule: Schedule = await self.__repo.find_by_id(schedule_id)
+        user = await self.__user_repo.find_principal(claims)
         availability: Availabilities = schedule.availability
 
         UserValidator.validate_user(user)
@@ -85,6 +167,7 @@ class ScheduleService:
 
         if availability.status == AvailabilityStatusEnum.TAKEN:
             availability.status = AvailabilityStatusEnum.AVAILABLE
-            self.__availabilities_repo.save(availability)
+            await self.__availabilities_repo.save(availability)
 
-        self.__repo.delete(schedule)
+        await self.__repo.delete(schedule)
+        await availabilities_cache.invalidate(schedule.professional_id)
@@ -20,4 +20,4 @@ class ScheduleValidator:
             raise HTTPException(
                 status_code=403,
                 detail="You are not allowed to delete this schedule",
-            )
\ No newline at end of file
+            )
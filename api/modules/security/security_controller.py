@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Security
+from fastapi import APIRouter, Depends, Security
 from fastapi_jwt import JwtAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.modules.security.security_service import SecurityService
+from api.modules.db.db import get_db
+from api.modules.security.security_service import security_service
+from api.modules.security.token_claims import TokenClaims
+from api.modules.user.user_model import User
+from api.modules.user.user_service import UserService
+
+
+def get_user_service(db: AsyncSession = Depends(get_db)):
+    return UserService(db)
 
-security_service = SecurityService()
 
 router = APIRouter(
     prefix="/auth",
@@ -16,5 +24,11 @@ async def refresh(
     credentials: JwtAuthorizationCredentials = Security(
         security_service.refresh_security
     ),
+    service: UserService = Depends(get_user_service),
 ):
-    return security_service.refresh(credentials)
+    user: User = await service.get_user_for_refresh(
+        credentials.subject.get("user_id"),
+        credentials.subject.get("credential_version", 0),
+    )
+
+    return security_service.auth(TokenClaims.subject_for(user))
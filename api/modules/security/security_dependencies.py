@@ -0,0 +1,27 @@
+from fastapi import Depends, HTTPException, Security, status
+from fastapi_jwt import JwtAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.db.db import get_db
+from api.modules.security.security_service import security_service
+from api.modules.security.token_claims import TokenClaims
+from api.modules.user.user_repository import UserRepository
+
+
+async def get_current_claims(
+    credentials: JwtAuthorizationCredentials = Security(
+        security_service.access_security
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> TokenClaims:
+    claims = TokenClaims.from_subject(credentials.subject)
+
+    if claims.token_version is not None:
+        current_version = await UserRepository(db).find_token_version(claims.id)
+        if current_version is None or claims.token_version < current_version:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revoked. Use /auth/refresh to get a new one.",
+            )
+
+    return claims
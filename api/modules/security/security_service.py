@@ -1,24 +1,58 @@
+import hashlib
+import time
 from datetime import timedelta
+from typing import Any, Dict, Optional
 
-from fastapi_jwt import (
-    JwtAccessBearerCookie,
-    JwtAuthorizationCredentials,
-    JwtRefreshBearer,
-)
+from fastapi_jwt import JwtAccessBearerCookie, JwtRefreshBearer
+
+from api.config.settings import Settings, settings
+from api.modules.cache.cache_backend import MemoryCacheBackend
+from api.modules.cache.response_cache import requests_counter
 
 ACCESS_TOKEN_EXPIRE_HOURS = 1
 REFRESH_TOKEN_EXPIRE_DAYS = 2
 
+VERIFIED_TOKENS_CACHE = "verified_tokens"
+
+
+class CachedJwtAccessBearerCookie(JwtAccessBearerCookie):
+    def __init__(self, *args, max_cached_tokens: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__max_cached_tokens = max_cached_tokens
+        self.__verified = MemoryCacheBackend(
+            max(max_cached_tokens, 1), name=VERIFIED_TOKENS_CACHE
+        )
+
+    async def _get_payload(self, bearer, cookie) -> Optional[Dict[str, Any]]:
+        token = str(bearer.credentials) if bearer else str(cookie) if cookie else None
+        if not token or self.__max_cached_tokens <= 0:
+            return await super()._get_payload(bearer, cookie)
+
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        payload = await self.__verified.get(digest)
+        if payload is not None:
+            requests_counter.inc(cache=VERIFIED_TOKENS_CACHE, result="hit")
+            return payload
+
+        requests_counter.inc(cache=VERIFIED_TOKENS_CACHE, result="miss")
+        payload = await super()._get_payload(bearer, cookie)
+        if payload:
+            ttl_seconds = payload.get("exp", 0) - time.time()
+            if ttl_seconds > 0:
+                await self.__verified.set(digest, payload, ttl_seconds)
+        return payload
+
 
 class SecurityService:
-    def __init__(self):
-        self.access_security = JwtAccessBearerCookie(
-            secret_key="secret_key",
+    def __init__(self, config: Settings = settings):
+        self.access_security = CachedJwtAccessBearerCookie(
+            secret_key=config.jwt_secret_key,
             auto_error=True,
             access_expires_delta=timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS),
+            max_cached_tokens=config.jwt_verified_cache_max_entries,
         )
         self.refresh_security = JwtRefreshBearer(
-            secret_key="secret_key",
+            secret_key=config.jwt_secret_key,
             auto_error=True,
             access_expires_delta=timedelta(hours=REFRESH_TOKEN_EXPIRE_DAYS),
         )
@@ -28,11 +62,5 @@ class SecurityService:
         refresh_token = self.refresh_security.create_refresh_token(subject=sub)
         return {"access_token": access_token, "refresh_token": refresh_token}
 
-    def refresh(self, credentials: JwtAuthorizationCredentials):
-        access_token = self.access_security.create_access_token(
-            subject=credentials.subject
-        )
-        refresh_token = self.refresh_security.create_refresh_token(
-            subject=credentials.subject
-        )
-        return {"access_token": access_token, "refresh_token": refresh_token}
+
+security_service = SecurityService()
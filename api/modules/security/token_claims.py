@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+from uuid import UUID
+
+from api.enum.user_roles_enum import UserRolesEnum
+from api.enum.user_status_enum import UserStatusEnum
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    id: UUID
+    role: UserRolesEnum | None = None
+    status: UserStatusEnum | None = None
+    token_version: int | None = None
+
+    @property
+    def has_standing(self) -> bool:
+        return (
+            self.role is not None
+            and self.status is not None
+            and self.token_version is not None
+        )
+
+    @classmethod
+    def from_subject(cls, subject: Dict[str, Any]) -> "TokenClaims":
+        role = subject.get("role")
+        status = subject.get("status")
+        return cls(
+            id=UUID(subject.get("user_id")),
+            role=UserRolesEnum[role] if role in UserRolesEnum.__members__ else None,
+            status=(
+                UserStatusEnum[status] if status in UserStatusEnum.__members__ else None
+            ),
+            token_version=subject.get("token_version"),
+        )
+
+    @staticmethod
+    def subject_for(user) -> Dict[str, Any]:
+        return {
+            "user_id": str(user.id),
+            "role": str(user.role),
+            "status": str(user.status),
+            "token_version": user.token_version,
+            "credential_version": user.credential_version,
+        }
@@ -0,0 +1,12 @@
+from api.config.settings import settings
+from api.modules.cache.cache_backend import cache_backend
+from api.modules.cache.versioned_cache import VersionedCache
+
+token_version_store = VersionedCache(
+    "token_versions",
+    settings.user_cache_max_entries,
+    cache_backend,
+    ttl_seconds=settings.token_version_cache_ttl_seconds,
+    version_check=settings.user_cache_version_check
+    or settings.cache_backend == "redis",
+)
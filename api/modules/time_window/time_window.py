@@ -0,0 +1,63 @@
+from datetime import date, datetime, time, timedelta, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import HTTPException
+from starlette import status
+
+from api.enum.time_enum import TimeEnum
+
+DAYS_IN_WEEK = 7
+MONTHS_IN_YEAR = 12
+
+
+def parse_timezone(name: str) -> tzinfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid timezone.",
+        )
+
+
+def _local_midnight(day: date, tz: tzinfo) -> datetime:
+    return datetime.combine(day, time(), tzinfo=tz)
+
+
+def resolve_window(
+    time_filter: TimeEnum | None,
+    start: datetime | None,
+    end: datetime | None,
+    timezone_name: str,
+) -> tuple[datetime | None, datetime | None]:
+    tz = parse_timezone(timezone_name)
+
+    if start or end:
+        start = start.replace(tzinfo=tz) if start and not start.tzinfo else start
+        end = end.replace(tzinfo=tz) if end and not end.tzinfo else end
+        if start and end and start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="from must be before to.",
+            )
+        return start, end
+
+    today = datetime.now(tz).date()
+
+    match time_filter:
+        case TimeEnum.DAY:
+            first_day = today
+            last_day = today + timedelta(days=1)
+        case TimeEnum.WEEK:
+            first_day = today - timedelta(days=today.weekday())
+            last_day = first_day + timedelta(days=DAYS_IN_WEEK)
+        case TimeEnum.MONTH:
+            first_day = today.replace(day=1)
+            if today.month == MONTHS_IN_YEAR:
+                last_day = date(today.year + 1, 1, 1)
+            else:
+                last_day = date(today.year, today.month + 1, 1)
+        case _:
+            return None, None
+
+    return _local_midnight(first_day, tz), _local_midnight(last_day, tz)
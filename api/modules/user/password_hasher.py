@@ -0,0 +1,124 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from api.config.settings import settings
+from api.modules.metrics.metrics import registry
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+RETRY_AFTER_SECONDS = 1
+HASH_BUCKETS = (0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1.0, 2.5, 5.0)
+
+pending_gauge = registry.gauge(
+    "password_hash_pending", "Password jobs waiting for or running on a worker"
+)
+saturation_gauge = registry.gauge(
+    "password_hash_saturation", "Pending password jobs over the queue depth limit"
+)
+rejected_counter = registry.counter(
+    "password_hash_rejected_total",
+    "Password jobs rejected with 503 because the queue was full",
+    ["operation"],
+)
+duration_histogram = registry.histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying inside the worker",
+    ["operation"],
+    HASH_BUCKETS,
+)
+wait_histogram = registry.histogram(
+    "password_hash_wait_seconds",
+    "Time password jobs waited for a free worker",
+    ["operation"],
+)
+
+
+def _hash(password: str):
+    started = time.perf_counter()
+    return pwd_context.hash(password), time.perf_counter() - started
+
+
+def _verify(password: str, password_hash: str):
+    started = time.perf_counter()
+    return pwd_context.verify(password, password_hash), time.perf_counter() - started
+
+
+class PasswordHasher:
+    def __init__(self, executor_type: str, workers: int, max_pending: int):
+        if workers < 1 or max_pending < 1:
+            raise RuntimeError(
+                "PASSWORD_HASH_WORKERS and PASSWORD_HASH_MAX_PENDING must be at least 1"
+            )
+        self.__executor_type = executor_type
+        self.__workers = workers
+        self.__max_pending = max_pending
+        self.__executor: Executor | None = None
+        self.__pending = 0
+
+        pending_gauge.set_function(lambda: self.__pending)
+        saturation_gauge.set_function(lambda: self.__pending / self.__max_pending)
+
+    def __get_executor(self) -> Executor:
+        if self.__executor is None:
+            if self.__executor_type == "process":
+                self.__executor = ProcessPoolExecutor(max_workers=self.__workers)
+            else:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.__workers, thread_name_prefix="password-hasher"
+                )
+        return self.__executor
+
+    async def __submit(self, operation: str, fn, *args):
+        if self.__pending >= self.__max_pending:
+            rejected_counter.inc(operation=operation)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later.",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        future = self.__get_executor().submit(fn, *args)
+        self.__pending += 1
+        # a cancelled request does not stop a job that is already running,
+        # so the slot is only released once the worker is done with it
+        future.add_done_callback(lambda _: self.__release(loop))
+        result, elapsed = await asyncio.wrap_future(future)
+
+        duration_histogram.observe(elapsed, operation=operation)
+        wait_histogram.observe(
+            max(time.perf_counter() - submitted - elapsed, 0), operation=operation
+        )
+        return result
+
+    def __release(self, loop: asyncio.AbstractEventLoop):
+        def release():
+            self.__pending -= 1
+
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            release()
+
+    async def hash(self, password: str) -> str:
+        return await self.__submit("hash", _hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self.__submit("verify", _verify, password, password_hash)
+
+    def shutdown(self):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.password_hash_executor,
+    settings.password_hash_workers,
+    settings.password_hash_max_pending,
+)
@@ -1,10 +1,12 @@
 from datetime import datetime
+from typing import List
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from api.enum.user_roles_enum import UserRolesEnum
 from api.enum.user_status_enum import UserStatusEnum
+from api.modules.pagination.response.cursor_page_response import CursorPageResponse
 
 
 class UserResponse(BaseModel):
@@ -20,3 +22,7 @@ class UserResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+user_list_adapter = TypeAdapter(List[UserResponse])
+user_page_adapter = TypeAdapter(CursorPageResponse[UserResponse])
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from api.config.settings import settings
+from api.enum.user_roles_enum import UserRolesEnum
+from api.enum.user_status_enum import UserStatusEnum
+from api.modules.cache.cache_backend import cache_backend
+from api.modules.cache.versioned_cache import VersionedCache
+from api.modules.user.user_model import User
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: UUID
+    name: str
+    email: str
+    role: UserRolesEnum
+    status: UserStatusEnum
+    crp: str | None
+    phone: str | None
+    bio: str | None
+    image_url: str | None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            status=user.status,
+            crp=user.crp,
+            phone=user.phone,
+            bio=user.bio,
+            image_url=user.image_url,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+user_cache = VersionedCache(
+    "users",
+    settings.user_cache_max_entries,
+    cache_backend,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    version_check=settings.user_cache_version_check,
+)
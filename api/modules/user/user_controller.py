@@ -1,27 +1,32 @@
+from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Security
-from fastapi_jwt import JwtAuthorizationCredentials
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.enum.user_roles_enum import UserRolesEnum
 from api.modules.db.db import get_db
-from api.modules.security.security_service import SecurityService
+from api.modules.http_cache.etag import etag_matches, not_modified
+from api.modules.pagination.response.cursor_page_response import CursorPageResponse
+from api.modules.security.security_dependencies import get_current_claims
+from api.modules.security.security_service import security_service
+from api.modules.security.token_claims import TokenClaims
 from api.modules.user.request.user_login_request import UserLoginRequest
 from api.modules.user.request.user_register_request import UserRegisterRequest
 from api.modules.user.request.user_update_request import UserUpdateRequest
+from api.modules.user.response.user_response import (
+    UserResponse,
+    user_list_adapter,
+    user_page_adapter,
+)
 from api.modules.user.user_model import User
 from api.modules.user.user_service import UserService
 
 
-def get_user_service(db: Session = Depends(get_db)):
+def get_user_service(db: AsyncSession = Depends(get_db)):
     return UserService(db)
 
 
-def get_security_service():
-    return SecurityService()
-
-
 router = APIRouter(
     prefix="/user",
     tags=["user"],
@@ -32,14 +37,14 @@ router = APIRouter(
 async def login(
     data: UserLoginRequest, service: UserService = Depends(get_user_service)
 ):
-    user_id: UUID = service.login(data)
+    user: User = await service.login(data)
 
-    tokens = get_security_service().auth({"user_id": str(user_id)})
+    tokens = security_service.auth(TokenClaims.subject_for(user))
 
     return {
         "access_token": tokens["access_token"],
         "refresh_token": tokens["refresh_token"],
-        "user_id": user_id,
+        "user_id": user.id,
     }
 
 
@@ -47,52 +52,71 @@ async def login(
 async def register(
     data: UserRegisterRequest, service: UserService = Depends(get_user_service)
 ):
-    return service.register(data)
+    return await service.register(data)
 
 
 @router.get("/verify-crp")
 async def verify_crp(
     user_id: UUID | None = None,
     service: UserService = Depends(get_user_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    user: User = service.verify_crp(user_id, credentials.subject.get("user_id"))
+    user: User = await service.verify_crp(user_id, claims.id)
 
     return {"user_id": user.id, "crp": user.crp, "status": user.status}
 
 
-@router.get("")
+@router.get("", response_model=UserResponse)
 async def get_user(
     user_id: str | None = None,
+    if_none_match: str | None = Header(None),
     service: UserService = Depends(get_user_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    return service.get_user_data(user_id, credentials.subject)
+    user, etag = await service.get_user_data(user_id, claims)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    return Response(
+        content=user.model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
 
 
-@router.get("/all")
+@router.get(
+    "/all", response_model=List[UserResponse] | CursorPageResponse[UserResponse]
+)
 async def get_all_users(
     role: UserRolesEnum | None = None,
     skip: int | None = 0,
     limit: int | None = 50,
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
     service: UserService = Depends(get_user_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    return service.get_all_users(role, skip, limit)
+    if if_none_match:
+        etag = await service.get_users_etag(role, skip, limit, cursor)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    if cursor is not None:
+        page, etag = await service.get_users_page(role, cursor, limit)
+        content = user_page_adapter.dump_json(page)
+    else:
+        users, etag = await service.get_all_users(role, skip, limit)
+        content = user_list_adapter.dump_json(users)
+
+    return Response(
+        content=content, media_type="application/json", headers={"ETag": etag}
+    )
 
 
 @router.post("/update")
 async def update_user(
     data: UserUpdateRequest,
     service: UserService = Depends(get_user_service),
-    credentials: JwtAuthorizationCredentials = Security(
-        get_security_service().access_security
-    ),
+    claims: TokenClaims = Depends(get_current_claims),
 ):
-    return service.update_user(data, credentials.subject.get("user_id"))
+    return await service.update_user(data, claims.id)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum, String
+from sqlalchemy import Column, DateTime, Enum, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,8 +17,10 @@ class User(Base):
     name = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
     password_hash = Column(String, nullable=False)
-    role = Column(Enum(UserRolesEnum, name="role"), nullable=False)
-    status = Column(Enum(UserStatusEnum, name="status"), nullable=False)
+    role = Column(Enum(UserRolesEnum, name="role", native_enum=False), nullable=False)
+    status = Column(
+        Enum(UserStatusEnum, name="status", native_enum=False), nullable=False
+    )
     crp = Column(String, nullable=False, unique=True)
     phone = Column(String, unique=True)
     bio = Column(String)
@@ -26,5 +28,15 @@ class User(Base):
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    credential_version = Column(Integer, nullable=False, default=0, server_default="0")
 
-    availabilities = relationship("Availabilities", back_populates="user")
+    availabilities = relationship(
+        "Availabilities", back_populates="user", lazy="raise_on_sql"
+    )
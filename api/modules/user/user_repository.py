@@ -1,32 +1,113 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from uuid import UUID
 
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.security.token_claims import TokenClaims
+from api.modules.security.token_version_store import token_version_store
+from api.modules.user.user_cache import UserSnapshot, user_cache
 from api.modules.user.user_model import User
 
+SNAPSHOTS_KEY = "user_snapshots"
+VERSION_COLUMNS = (User.id, User.updated_at)
+
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.__db = db
 
-    def find_by_id(self, user_id):
-        return self.__db.query(User).filter(User.id == user_id).first()
+    async def find_by_id(self, user_id):
+        return await self.__db.scalar(select(User).where(User.id == user_id))
+
+    async def find_snapshot_by_id(self, user_id) -> UserSnapshot | None:
+        snapshots = self.__db.info.setdefault(SNAPSHOTS_KEY, {})
+        key = str(user_id)
+        if key not in snapshots:
+            snapshots[key] = await user_cache.get_or_load(
+                user_id, lambda: self.__load_snapshot(user_id)
+            )
+        return snapshots[key]
+
+    async def find_principal(self, claims: TokenClaims) -> TokenClaims | UserSnapshot:
+        if claims.has_standing:
+            return claims
+        return await self.find_snapshot_by_id(claims.id)
+
+    async def __load_snapshot(self, user_id) -> UserSnapshot | None:
+        user = await self.find_by_id(user_id)
+        return UserSnapshot.from_user(user) if user else None
+
+    async def find_token_version(self, user_id) -> int | None:
+        return await token_version_store.get_or_load(
+            user_id,
+            lambda: self.__db.scalar(
+                select(User.token_version).where(User.id == user_id)
+            ),
+        )
+
+    @staticmethod
+    def __offset_query(query, role_filter=None, skip=0, limit=50):
+        if role_filter:
+            query = query.where(User.role == str(role_filter))
+
+        return query.order_by(User.created_at, User.id).offset(skip).limit(limit)
+
+    @staticmethod
+    def __keyset_query(
+        query, role_filter=None, after: tuple[datetime, UUID] | None = None, limit=50
+    ):
+        if role_filter:
+            query = query.where(User.role == str(role_filter))
 
-    def find_all(self, skip=0, limit=50):
-        return self.__db.query(User).offset(skip).limit(limit).all()
+        if after:
+            query = query.where(tuple_(User.created_at, User.id) > tuple_(*after))
 
-    def find_all_by_role(self, role_filter, skip=0, limit=50):
-        return (
-            self.__db.query(User)
-            .filter(User.role == str(role_filter))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return query.order_by(User.created_at, User.id).limit(limit)
+
+    async def find_all(self, skip=0, limit=50):
+        result = await self.__db.scalars(
+            self.__offset_query(select(User), skip=skip, limit=limit)
+        )
+        return result.all()
+
+    async def find_all_by_role(self, role_filter, skip=0, limit=50):
+        result = await self.__db.scalars(
+            self.__offset_query(select(User), role_filter, skip, limit)
+        )
+        return result.all()
+
+    async def find_versions(self, role_filter=None, skip=0, limit=50):
+        result = await self.__db.execute(
+            self.__offset_query(select(*VERSION_COLUMNS), role_filter, skip, limit)
         )
+        return result.all()
 
-    def find_by_email(self, email):
-        return self.__db.query(User).filter(User.email == email).first()
+    async def find_page(
+        self, role_filter=None, after: tuple[datetime, UUID] | None = None, limit=50
+    ):
+        result = await self.__db.scalars(
+            self.__keyset_query(select(User), role_filter, after, limit)
+        )
+        return result.all()
+
+    async def find_page_versions(
+        self, role_filter=None, after: tuple[datetime, UUID] | None = None, limit=50
+    ):
+        result = await self.__db.execute(
+            self.__keyset_query(select(*VERSION_COLUMNS), role_filter, after, limit)
+        )
+        return result.all()
 
-    def save(self, user):
+    async def find_by_email(self, email):
+        return await self.__db.scalar(select(User).where(User.email == email))
+
+    async def save(self, user):
         self.__db.add(user)
-        self.__db.commit()
-        self.__db.refresh(user)
+        await self.__db.commit()
+        await self.__db.refresh(user)
+
+        self.__db.info.get(SNAPSHOTS_KEY, {}).pop(str(user.id), None)
+        await user_cache.invalidate(user.id)
+        await token_version_store.invalidate(user.id)
         return user
@@ -1,59 +1,80 @@
-from uuid import UUID
-
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.enum.user_status_enum import UserStatusEnum
+from api.modules.availabilities.availabilities_cache import availabilities_cache
+from api.modules.http_cache.etag import strong_etag
+from api.modules.pagination.cursor import decode_cursor, encode_cursor
+from api.modules.pagination.response.cursor_page_response import CursorPageResponse
+from api.modules.security.token_claims import TokenClaims
+from api.modules.user.password_hasher import password_hasher
 from api.modules.user.request.user_login_request import UserLoginRequest
 from api.modules.user.request.user_register_request import UserRegisterRequest
 from api.modules.user.request.user_update_request import UserUpdateRequest
-from api.modules.user.response.user_response import UserResponse
+from api.modules.user.response.user_response import UserResponse, user_list_adapter
+from api.modules.user.user_cache import UserSnapshot
 from api.modules.user.user_mapper import UserMapper
 from api.modules.user.user_model import User
 from api.modules.user.user_repository import UserRepository
 from api.modules.user.user_validator import UserValidator
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.__repo = UserRepository(db)
 
-    def get_user_data(self, user_id, credentials_subject) -> UserResponse:
+    async def get_user_data(
+        self, user_id, claims: TokenClaims
+    ) -> tuple[UserResponse, str]:
         if not user_id:
-            user_id = credentials_subject.get("user_id")
+            user_id = claims.id
 
-        user: User = self.__repo.find_by_id(user_id)
+        user: UserSnapshot = await self.__repo.find_snapshot_by_id(user_id)
 
         UserValidator.validate_user(user)
 
-        return UserMapper.to_user_response(user)
+        return UserMapper.to_user_response(user), strong_etag(
+            "user", user.id, user.updated_at
+        )
 
-    def login(self, data: UserLoginRequest) -> UUID:
-        user = self.__repo.find_by_email(data.email)
+    async def login(self, data: UserLoginRequest) -> User:
+        user = await self.__repo.find_by_email(data.email)
 
-        if not user or not pwd_context.verify(data.password, user.password_hash):
+        if not user or not await password_hasher.verify(
+            data.password, user.password_hash
+        ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid email or password",
             )
 
-        return user.id
+        return user
+
+    async def get_user_for_refresh(self, user_id, credential_version: int) -> User:
+        user: User = await self.__repo.find_by_id(user_id)
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User no longer exists",
+            )
+
+        if credential_version < user.credential_version:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token revoked. Log in again.",
+            )
+
+        return user
 
-    def register(self, data: UserRegisterRequest) -> UserResponse:
+    async def register(self, data: UserRegisterRequest) -> UserResponse:
         user = UserMapper.user_register_request_to_user(
-            request=data, password_hash=hash_password(data.password)
+            request=data, password_hash=await password_hasher.hash(data.password)
         )
 
         try:
-            user: User = self.__repo.save(user)
+            user: User = await self.__repo.save(user)
 
             return UserMapper.to_user_response(user)
 
@@ -63,40 +84,78 @@ class UserService:
                 detail="Email or CRP already registered",
             )
 
-    def verify_crp(self, user_id_to_verify, current_user_id):
+    async def verify_crp(self, user_id_to_verify, current_user_id):
         if not user_id_to_verify:
             user_id_to_verify = current_user_id
 
-        user_to_verify: User = self.__repo.find_by_id(user_id_to_verify)
+        user_to_verify: User = await self.__repo.find_by_id(user_id_to_verify)
 
         UserValidator.validate_user(user_to_verify)
         UserValidator.validate_user_professional(user_to_verify)
 
         user_to_verify.status = str(UserStatusEnum.READY)
+        user_to_verify.token_version += 1
 
-        return self.__repo.save(user_to_verify)
+        user_to_verify = await self.__repo.save(user_to_verify)
+        await availabilities_cache.invalidate(user_to_verify.id)
+        return user_to_verify
 
-    def get_all_users(self, role_filter, skip, limit):
+    async def get_all_users(self, role_filter, skip, limit):
         if role_filter:
-            users = self.__repo.find_all_by_role(role_filter, skip, limit)
+            users = await self.__repo.find_all_by_role(role_filter, skip, limit)
 
         else:
-            users = self.__repo.find_all(skip, limit)
+            users = await self.__repo.find_all(skip, limit)
+
+        etag = strong_etag("users", rows=((user.id, user.updated_at) for user in users))
+        return user_list_adapter.validate_python(users, from_attributes=True), etag
+
+    async def get_users_page(self, role_filter, cursor: str, limit: int):
+        users = await self.__repo.find_page(
+            role_filter, decode_cursor(cursor), limit + 1
+        )
+        etag = strong_etag(
+            "users_page", limit, rows=((user.id, user.updated_at) for user in users)
+        )
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+
+        return (
+            CursorPageResponse[UserResponse](
+                items=user_list_adapter.validate_python(users, from_attributes=True),
+                next_cursor=next_cursor,
+            ),
+            etag,
+        )
+
+    async def get_users_etag(self, role_filter, skip, limit, cursor: str | None):
+        if cursor is not None:
+            versions = await self.__repo.find_page_versions(
+                role_filter, decode_cursor(cursor), limit + 1
+            )
+            return strong_etag("users_page", limit, rows=versions)
 
-        return [UserMapper.to_user_response(u) for u in users]
+        versions = await self.__repo.find_versions(role_filter, skip, limit)
+        return strong_etag("users", rows=versions)
 
-    def update_user(self, data: UserUpdateRequest, user_id):
-        user: User = self.__repo.find_by_id(user_id)
+    async def update_user(self, data: UserUpdateRequest, user_id):
+        user: User = await self.__repo.find_by_id(user_id)
 
         UserValidator.validate_user(user)
 
         update_data = data.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            user.password_hash = hash_password(update_data.pop("password"))
+            user.password_hash = await password_hasher.hash(update_data.pop("password"))
+            user.token_version += 1
+            user.credential_version += 1
 
         for field, value in update_data.items():
             setattr(user, field, value)
 
-        user: User = self.__repo.save(user)
+        user: User = await self.__repo.save(user)
+        await availabilities_cache.invalidate(user.id)
         return UserMapper.to_user_response(user)
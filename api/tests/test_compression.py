@@ -0,0 +1,49 @@
+import gzip
+
+import pytest
+
+from api.modules.http_cache import compression_middleware
+from api.modules.http_cache.compression_middleware import (
+    _accepted_encodings,
+    _choose_encoding,
+    compress,
+)
+
+
+def test_accepted_encodings_skip_zero_quality_and_invalid_values():
+    accepted = _accepted_encodings("GZIP;q=0.5, br;q=0, deflate;q=x, identity")
+
+    assert accepted == {"gzip", "identity"}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip, deflate, br", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("deflate", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding_prefers_brotli(monkeypatch, accept_encoding, encoding):
+    monkeypatch.setattr(compression_middleware, "brotli", object())
+
+    assert _choose_encoding(accept_encoding) == encoding
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [("gzip, br", "gzip"), ("br", None), ("*", "gzip")],
+)
+def test_choose_encoding_without_brotli(monkeypatch, accept_encoding, encoding):
+    monkeypatch.setattr(compression_middleware, "brotli", None)
+
+    assert _choose_encoding(accept_encoding) == encoding
+
+
+def test_gzip_output_is_deterministic():
+    body = b'{"items": []}' * 100
+
+    assert compress(body, "gzip") == compress(body, "gzip")
+    assert gzip.decompress(compress(body, "gzip")) == body
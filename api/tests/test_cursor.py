@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from api.modules.pagination.cursor import decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    sort_value = datetime(2041, 1, 1, 9, 30, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    assert decode_cursor(encode_cursor(sort_value, row_id)) == (sort_value, row_id)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(datetime(2041, 1, 1, tzinfo=timezone.utc), uuid4())
+
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", [None, ""])
+def test_empty_cursor_is_first_page(cursor):
+    assert decode_cursor(cursor) is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-base64!", "bm90IGpzb24", "WzFd", "WyJ4IiwieSJd"],
+)
+def test_invalid_cursor_is_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+
+    assert error.value.status_code == 400
@@ -0,0 +1,46 @@
+from api.modules.http_cache.etag import ETAG_LENGTH, etag_matches, strong_etag
+
+
+def test_strong_etag_is_quoted_and_stable():
+    etag = strong_etag("calendar", 1, rows=[(1, "a"), (2, "b")])
+
+    assert etag == strong_etag("calendar", 1, rows=[(1, "a"), (2, "b")])
+    assert etag.startswith('"') and etag.endswith('"')
+    assert len(etag) == ETAG_LENGTH + 2
+
+
+def test_strong_etag_changes_with_parts_and_rows():
+    etag = strong_etag("calendar", 1, rows=[(1, "a")])
+
+    assert etag != strong_etag("calendar", 2, rows=[(1, "a")])
+    assert etag != strong_etag("calendar", 1, rows=[(1, "b")])
+    assert etag != strong_etag("calendar", 1, rows=[(1, "a"), (2, "b")])
+
+
+def test_strong_etag_separates_values():
+    assert strong_etag("ab", "c") != strong_etag("a", "bc")
+    assert strong_etag(rows=[("a", "b")]) != strong_etag(rows=[("a",), ("b",)])
+
+
+def test_etag_matches_exact_list_and_wildcard():
+    etag = strong_etag("users")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_etag_matches_weak_and_content_coded_validators():
+    etag = strong_etag("users")
+    opaque = etag[1:-1]
+
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches(f'"{opaque}-gzip"', etag)
+    assert etag_matches(f'"{opaque}-br"', etag)
+
+
+def test_etag_matches_without_header_or_etag():
+    assert not etag_matches(None, strong_etag("users"))
+    assert not etag_matches("", strong_etag("users"))
+    assert not etag_matches("*", None)
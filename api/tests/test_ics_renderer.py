@@ -0,0 +1,36 @@
+from api.modules.calendar.ics_renderer import MAX_LINE_OCTETS, _escape, _fold
+
+
+def test_short_line_is_not_folded():
+    assert _fold("SUMMARY:Consulta") == b"SUMMARY:Consulta\r\n"
+
+
+def test_line_exactly_at_the_limit_is_not_folded():
+    line = "X" * MAX_LINE_OCTETS
+
+    assert _fold(line) == line.encode() + b"\r\n"
+
+
+def test_long_line_is_folded_within_the_octet_limit():
+    line = "SUMMARY:" + "a" * 200
+    folded = _fold(line)
+
+    physical = folded.removesuffix(b"\r\n").split(b"\r\n")
+    assert len(physical) > 1
+    assert all(len(part) <= MAX_LINE_OCTETS for part in physical)
+    assert all(part.startswith(b" ") for part in physical[1:])
+    assert folded.replace(b"\r\n ", b"") == line.encode() + b"\r\n"
+
+
+def test_folding_never_splits_a_multibyte_character():
+    line = "SUMMARY:Consulta com " + "João Ção " * 20
+    folded = _fold(line)
+
+    for part in folded.removesuffix(b"\r\n").split(b"\r\n"):
+        assert len(part) <= MAX_LINE_OCTETS
+        part.decode()
+    assert folded.replace(b"\r\n ", b"").decode() == line + "\r\n"
+
+
+def test_escape_text_values():
+    assert _escape("a,b;c\\d\ne") == r"a\,b\;c\\d\ne"
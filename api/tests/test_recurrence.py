@@ -0,0 +1,93 @@
+from datetime import date, time, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from api.modules.availabilities.request.availabilities_bulk_create_request import (
+    MAX_BULK_SLOTS,
+    MAX_RECURRENCE_DAYS,
+    AvailabilitiesBulkCreateRequest,
+    AvailabilitiesRecurrenceRequest,
+)
+
+START = date(2041, 1, 7)
+
+
+def recurrence(**overrides) -> dict:
+    return {
+        "weekdays": [0, 2],
+        "time_ranges": [{"start": "09:00", "end": "12:00"}],
+        "slot_minutes": 60,
+        "start_date": START.isoformat(),
+        "end_date": (START + timedelta(days=6)).isoformat(),
+        **overrides,
+    }
+
+
+def test_generate_slots_on_selected_weekdays():
+    slots = AvailabilitiesRecurrenceRequest(**recurrence()).generate_slots()
+
+    assert len(slots) == 6
+    assert {start.date().weekday() for start, _ in slots} == {0, 2}
+    assert all(end - start == timedelta(hours=1) for start, end in slots)
+    assert slots[0][0].time() == time(9)
+
+
+def test_slots_follow_the_recurrence_timezone():
+    slots = AvailabilitiesRecurrenceRequest(
+        **recurrence(timezone="America/Sao_Paulo")
+    ).generate_slots()
+
+    assert slots[0][0].utcoffset() == timedelta(hours=-3)
+
+
+def test_span_up_to_the_limit_is_accepted():
+    end_date = START + timedelta(days=MAX_RECURRENCE_DAYS - 1)
+
+    AvailabilitiesRecurrenceRequest(
+        **recurrence(weekdays=[0], end_date=end_date.isoformat())
+    )
+
+
+def test_span_over_the_limit_is_rejected():
+    end_date = START + timedelta(days=MAX_RECURRENCE_DAYS)
+
+    with pytest.raises(ValidationError, match="cannot span more than"):
+        AvailabilitiesRecurrenceRequest(**recurrence(end_date=end_date.isoformat()))
+
+
+def test_far_future_end_date_is_rejected_before_expanding():
+    with pytest.raises(ValidationError, match="cannot span more than"):
+        AvailabilitiesRecurrenceRequest(**recurrence(end_date="9999-12-31"))
+
+
+def test_too_many_slots_are_rejected():
+    end_date = START + timedelta(days=MAX_RECURRENCE_DAYS - 1)
+    request = recurrence(
+        weekdays=list(range(7)),
+        time_ranges=[{"start": "00:00", "end": "23:59"}],
+        slot_minutes=15,
+        end_date=end_date.isoformat(),
+    )
+
+    with pytest.raises(ValidationError, match=f"more than {MAX_BULK_SLOTS} slots"):
+        AvailabilitiesBulkCreateRequest(recurrence=request)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"weekdays": [7]},
+        {"timezone": "Mars/Olympus"},
+        {"time_ranges": [{"start": "12:00", "end": "09:00"}]},
+        {"end_date": (START - timedelta(days=1)).isoformat()},
+    ],
+)
+def test_invalid_recurrence_is_rejected(overrides):
+    with pytest.raises(ValidationError):
+        AvailabilitiesRecurrenceRequest(**recurrence(**overrides))
+
+
+def test_slots_or_recurrence_is_required():
+    with pytest.raises(ValidationError, match="either slots or recurrence"):
+        AvailabilitiesBulkCreateRequest()
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from api.modules.db.slow_query_log import MAX_PARAMETER_ITEMS, redact
+
+
+def test_scalars_are_kept():
+    assert redact(None) is None
+    assert redact(True) is True
+    assert redact(42) == 42
+    assert redact(Decimal("1.5")) == Decimal("1.5")
+
+
+def test_dates_and_ids_are_kept_as_text():
+    row_id = uuid4()
+    moment = datetime(2041, 1, 1, tzinfo=timezone.utc)
+
+    assert redact(row_id) == str(row_id)
+    assert redact(moment) == str(moment)
+
+
+def test_enum_like_and_uuid_strings_are_kept():
+    row_id = str(uuid4())
+
+    assert redact("AVAILABLE") == "AVAILABLE"
+    assert redact(row_id) == row_id
+
+
+def test_free_text_and_bytes_are_redacted():
+    assert redact("ana.silva@email.com") == "<redacted 19 chars>"
+    assert redact("available") == "<redacted 9 chars>"
+    assert redact(b"hash") == "<redacted 4 bytes>"
+
+
+def test_collections_are_redacted_recursively_and_truncated():
+    values = ["secret"] * (MAX_PARAMETER_ITEMS + 5)
+
+    redacted = redact(values)
+
+    assert len(redacted) == MAX_PARAMETER_ITEMS + 1
+    assert redacted[0] == "<redacted 6 chars>"
+    assert redacted[-1] == "<5 more>"
+    assert redact({"email": "a@b.c", "status": "TAKEN"}) == {
+        "email": "<redacted 5 chars>",
+        "status": "TAKEN",
+    }
+
+
+def test_unknown_objects_only_show_their_type():
+    assert redact(object()) == "<object>"
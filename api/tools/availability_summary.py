@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import dataclasses
+import sys
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config.settings import settings
+from api.modules.availabilities.availabilities_summary_repository import (
+    AvailabilitiesSummaryRepository,
+)
+from api.modules.db.db import create_db_engine
+from api.modules.schedule.schedule_model import Schedule  # noqa: F401
+from api.modules.user.user_model import User  # noqa: F401
+
+
+async def rebuild(repo: AvailabilitiesSummaryRepository, args) -> int:
+    rows = await repo.rebuild(args.professional_id)
+    print(f"rebuilt {rows} day counts")
+    return 0
+
+
+async def check(repo: AvailabilitiesSummaryRepository, args) -> int:
+    drift = await repo.find_drift(args.professional_id)
+    for row in drift[: args.show]:
+        print(
+            f"{row.owner_id} {row.day} {row.status}: "
+            f"stored {row.stored}, actual {row.actual}"
+        )
+    if len(drift) > args.show:
+        print(f"... and {len(drift) - args.show} more")
+    print(f"{len(drift)} day counts out of sync")
+    return 1 if drift else 0
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild or verify the per-day availability counters behind /availabilities/summary."
+    )
+    parser.add_argument(
+        "--professional-id",
+        type=UUID,
+        help="only this professional (default: everyone)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "rebuild", help="recount every day from the availabilities table"
+    ).set_defaults(run=rebuild)
+    check_parser = commands.add_parser(
+        "check", help="compare the counters with the availabilities table"
+    )
+    check_parser.add_argument("--show", type=int, default=20)
+    check_parser.set_defaults(run=check)
+    args = parser.parse_args()
+
+    engine = create_db_engine(
+        dataclasses.replace(settings, db_statement_timeout_ms=0), pool_name="tools"
+    )
+    try:
+        async with AsyncSession(engine) as db:
+            code = await args.run(AvailabilitiesSummaryRepository(db), args)
+    finally:
+        await engine.dispose()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,479 @@
+import argparse
+import asyncio
+import dataclasses
+import itertools
+import random
+import sys
+import time
+from array import array
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from datetime import time as day_time
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config.settings import settings
+from api.modules.availabilities.availabilities_summary_repository import (
+    AvailabilitiesSummaryRepository,
+)
+from api.modules.db.db import create_db_engine
+from api.modules.schedule.schedule_model import Schedule  # noqa: F401
+from api.modules.user.password_hasher import pwd_context
+from api.modules.user.user_model import User  # noqa: F401
+
+LOCAL_TIMEZONE = ZoneInfo("America/Sao_Paulo")
+TABLES = (
+    "users",
+    "availabilities",
+    "schedule",
+    "availability_day_counts",
+    "calendar_versions",
+)
+USER_COLUMNS = (
+    "id",
+    "name",
+    "email",
+    "password_hash",
+    "role",
+    "status",
+    "crp",
+    "phone",
+    "bio",
+    "created_at",
+    "updated_at",
+)
+AVAILABILITY_COLUMNS = (
+    "id",
+    "owner_id",
+    "start_time",
+    "end_time",
+    "status",
+    "created_at",
+    "updated_at",
+)
+SCHEDULE_COLUMNS = (
+    "id",
+    "professional_id",
+    "patient_id",
+    "availability_id",
+    "start_time",
+    "created_at",
+    "updated_at",
+)
+CRP_PREFIX = "CRP/G"
+SESSION_MINUTES = (50, 50, 50, 45, 30)
+LUNCH_HOUR = 12
+PARETO_ALPHA = 1.16
+MAX_PROFESSIONAL_WEIGHT = 50
+MAX_PATIENT_WEIGHT = 8
+MAX_BOOKING_RATIO = 0.95
+PAST_CANCELED_RATIO = 0.1
+FUTURE_CANCELED_RATIO = 0.03
+PAST_NOT_COMPLETED_RATIO = 0.1
+BOOKING_WINDOW = timedelta(days=60)
+
+
+def random_uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def pareto_weights(rng: random.Random, count: int, cap: float) -> array:
+    return array("d", (min(rng.paretovariate(PARETO_ALPHA), cap) for _ in range(count)))
+
+
+def split_total(
+    rng: random.Random, total: int, weights: array, capacities: list[int]
+) -> list[int]:
+    scale = total / sum(weights)
+    counts = [
+        min(int(weight * scale), capacity)
+        for weight, capacity in zip(weights, capacities)
+    ]
+    missing = total - sum(counts)
+    order = list(range(len(counts)))
+    rng.shuffle(order)
+    while missing > 0:
+        before = missing
+        for index in order:
+            if counts[index] < capacities[index]:
+                counts[index] += 1
+                missing -= 1
+                if not missing:
+                    break
+        if missing == before:
+            break
+    return counts
+
+
+@dataclasses.dataclass
+class WorkWeek:
+    slots: list[tuple[int, int]]
+    minutes: int
+
+
+def work_week(rng: random.Random) -> WorkWeek:
+    days = [0, 1, 2, 3, 4]
+    if rng.random() < 0.25:
+        days.append(5)
+    if rng.random() < 0.15:
+        days.remove(rng.choice(days))
+    first_hour = rng.randint(7, 10)
+    hours = [
+        hour
+        for hour in range(first_hour, first_hour + rng.randint(6, 10) + 1)
+        if hour != LUNCH_HOUR and hour < 22
+    ]
+    return WorkWeek(
+        [(day, hour) for day in days for hour in hours], rng.choice(SESSION_MINUTES)
+    )
+
+
+class CopyWriter:
+    def __init__(self, engine, workers: int):
+        self.__engine = engine
+        self.__workers = workers
+        self.__queue = asyncio.Queue(maxsize=workers)
+        self.__tasks = []
+        self.__error = None
+        self.copied = defaultdict(int)
+        self.started = time.perf_counter()
+
+    async def __aenter__(self):
+        for _ in range(self.__workers):
+            self.__tasks.append(asyncio.create_task(self.__copy()))
+        return self
+
+    async def __aexit__(self, *_exc):
+        for _ in self.__tasks:
+            await self.__queue.put(None)
+        await asyncio.gather(*self.__tasks)
+        if self.__error is not None:
+            raise self.__error
+
+    async def put(self, table: str, columns: tuple, rows: list):
+        if self.__error is not None:
+            raise self.__error
+        await self.__queue.put((table, columns, rows))
+
+    async def __copy(self):
+        try:
+            async with self.__engine.connect() as connection:
+                driver = (await connection.get_raw_connection()).driver_connection
+                await driver.execute("SET session_replication_role = replica")
+                while (job := await self.__queue.get()) is not None:
+                    table, columns, rows = job
+                    await driver.copy_records_to_table(
+                        table, records=rows, columns=columns
+                    )
+                    self.copied[table] += len(rows)
+                await driver.execute("RESET session_replication_role")
+        except Exception as error:
+            self.__error = self.__error or error
+            while await self.__queue.get() is not None:
+                pass
+
+    def progress(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.copied.values())
+        return (
+            ", ".join(f"{table} {rows}" for table, rows in self.copied.items())
+            + f" ({total / max(elapsed, 1e-9):,.0f} rows/s)"
+        )
+
+
+class CopyBatch:
+    def __init__(self, writer: CopyWriter, table: str, columns: tuple, size: int):
+        self.__writer = writer
+        self.__table = table
+        self.__columns = columns
+        self.__size = size
+        self.rows = []
+
+    async def flush(self, force: bool = False):
+        if not self.rows or (len(self.rows) < self.__size and not force):
+            return
+        await self.__writer.put(self.__table, self.__columns, self.rows)
+        self.rows = []
+
+
+class DataGenerator:
+    def __init__(self, args, password_hash: str):
+        self.__args = args
+        self.__rng = random.Random(args.seed)
+        self.__password_hash = password_hash
+        self.__now = datetime.combine(args.now, day_time(), LOCAL_TIMEZONE)
+        self.__first_monday = args.now - timedelta(
+            days=args.now.weekday() + 7 * args.past_weeks
+        )
+        self.__weeks = args.past_weeks + args.future_weeks
+        self.__history_days = 7 * args.past_weeks + 365
+
+    def __created_at(self) -> datetime:
+        return self.__now - timedelta(
+            seconds=self.__rng.randrange(self.__history_days * 86400)
+        )
+
+    def __user(self, role: str, number: int, crp: str | None, bio: str | None):
+        user_id = random_uuid(self.__rng)
+        created_at = self.__created_at()
+        row = (
+            user_id,
+            f"{role.title()} {number}",
+            f"{role.lower()}{number}@{self.__args.domain}",
+            self.__password_hash,
+            role,
+            "READY",
+            crp,
+            f"+55119{number:08d}" if self.__rng.random() < 0.8 else None,
+            bio,
+            created_at,
+            created_at,
+        )
+        return user_id, row
+
+    async def users(self, writer: CopyWriter):
+        batch = CopyBatch(writer, "users", USER_COLUMNS, self.__args.batch_size)
+        professional_ids = []
+        for number in range(1, self.__args.professionals + 1):
+            user_id, row = self.__user(
+                "PROFESSIONAL",
+                number,
+                f"{CRP_PREFIX}{number:07d}",
+                f"Psicólogo(a) clínico(a) há {self.__rng.randint(1, 30)} anos.",
+            )
+            professional_ids.append(user_id)
+            batch.rows.append(row)
+            await batch.flush()
+
+        patient_ids = array("Q")
+        for number in range(1, self.__args.patients + 1):
+            user_id, row = self.__user("PATIENT", number, None, None)
+            patient_ids.append(user_id.int >> 64)
+            patient_ids.append(user_id.int & 0xFFFFFFFFFFFFFFFF)
+            batch.rows.append(row)
+            await batch.flush()
+        await batch.flush(force=True)
+        return professional_ids, patient_ids
+
+    async def calendars(
+        self, professional_ids: list[UUID], patient_ids: array, writer: CopyWriter
+    ):
+        rng = self.__rng
+        args = self.__args
+        availabilities = CopyBatch(
+            writer, "availabilities", AVAILABILITY_COLUMNS, args.batch_size
+        )
+        schedules = CopyBatch(writer, "schedule", SCHEDULE_COLUMNS, args.batch_size)
+        weeks = [work_week(rng) for _ in professional_ids]
+        weights = pareto_weights(rng, len(professional_ids), MAX_PROFESSIONAL_WEIGHT)
+        counts = split_total(
+            rng,
+            args.availabilities,
+            weights,
+            [len(week.slots) * self.__weeks for week in weeks],
+        )
+        booking_weights = [weight**0.5 for weight in weights]
+        booking_scale = args.schedules / max(
+            sum(count * weight for count, weight in zip(counts, booking_weights)), 1
+        )
+        patient_weights = list(
+            itertools.accumulate(
+                pareto_weights(rng, len(patient_ids) // 2, MAX_PATIENT_WEIGHT)
+            )
+        )
+
+        for owner_id, week, count, booking_weight in zip(
+            professional_ids, weeks, counts, booking_weights
+        ):
+            booking_ratio = min(booking_weight * booking_scale, MAX_BOOKING_RATIO)
+            positions = sorted(rng.sample(range(len(week.slots) * self.__weeks), count))
+            patients = rng.choices(
+                range(len(patient_ids) // 2),
+                cum_weights=patient_weights,
+                k=round(count * booking_ratio * 1.2) + 1,
+            )
+            duration = timedelta(minutes=week.minutes)
+            for position in positions:
+                weekday, hour = week.slots[position % len(week.slots)]
+                day = self.__first_monday + timedelta(
+                    days=7 * (position // len(week.slots)) + weekday
+                )
+                start_time = datetime.combine(day, day_time(hour), LOCAL_TIMEZONE)
+                created_at = start_time - BOOKING_WINDOW * (0.02 + rng.random())
+                booked = rng.random() < booking_ratio
+                if start_time < self.__now:
+                    if booked:
+                        status = (
+                            "TAKEN"
+                            if rng.random() < PAST_NOT_COMPLETED_RATIO
+                            else "COMPLETED"
+                        )
+                    elif rng.random() < PAST_CANCELED_RATIO:
+                        status = "CANCELED"
+                    else:
+                        status = "AVAILABLE"
+                elif booked:
+                    status = "TAKEN"
+                elif rng.random() < FUTURE_CANCELED_RATIO:
+                    status = "CANCELED"
+                else:
+                    status = "AVAILABLE"
+
+                availability_id = random_uuid(rng)
+                availabilities.rows.append(
+                    (
+                        availability_id,
+                        owner_id,
+                        start_time,
+                        start_time + duration,
+                        status,
+                        created_at,
+                        created_at,
+                    )
+                )
+                if booked:
+                    patient = patients.pop() if patients else 0
+                    booked_at = created_at + (start_time - created_at) * rng.random()
+                    schedules.rows.append(
+                        (
+                            random_uuid(rng),
+                            owner_id,
+                            UUID(
+                                int=(patient_ids[2 * patient] << 64)
+                                | patient_ids[2 * patient + 1]
+                            ),
+                            availability_id,
+                            start_time,
+                            booked_at,
+                            booked_at,
+                        )
+                    )
+
+            if len(availabilities.rows) >= args.batch_size:
+                await availabilities.flush(force=True)
+                await schedules.flush(force=True)
+                if writer.copied:
+                    print(f"  {writer.progress()}", flush=True)
+        await availabilities.flush(force=True)
+        await schedules.flush(force=True)
+
+
+async def deferred_indexes(connection) -> list[tuple[str, str]]:
+    result = await connection.exec_driver_sql(
+        "SELECT format('ALTER TABLE %I DROP CONSTRAINT %I', conrelid::regclass, conname), "
+        "format('ALTER TABLE %I ADD CONSTRAINT %I %s', conrelid::regclass, conname, "
+        "pg_get_constraintdef(oid)) "
+        "FROM pg_constraint WHERE conrelid = ANY($1::text[]::regclass[]) AND contype = 'u' "
+        "UNION ALL "
+        "SELECT format('DROP INDEX %I', indexname), indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = ANY($1::text[]) "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint)",
+        (list(TABLES),),
+    )
+    return [tuple(row) for row in result]
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Fill the local database with a large, reproducible dataset using COPY."
+    )
+    parser.add_argument("--professionals", type=int, default=50000)
+    parser.add_argument("--patients", type=int, default=2000000)
+    parser.add_argument("--availabilities", type=int, default=20000000)
+    parser.add_argument("--schedules", type=int, default=5000000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--now",
+        type=date.fromisoformat,
+        default=datetime.now(LOCAL_TIMEZONE).date(),
+        help="date that splits past and future slots (default: today); "
+        "the same seed and date always produce the same rows",
+    )
+    parser.add_argument("--past-weeks", type=int, default=52)
+    parser.add_argument("--future-weeks", type=int, default=12)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument(
+        "--workers", type=int, default=4, help="parallel COPY connections"
+    )
+    parser.add_argument("--domain", default="generated.local")
+    parser.add_argument(
+        "--password",
+        default="password123",
+        help="password of every generated user",
+    )
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="empty users, availabilities and schedule before loading",
+    )
+    parser.add_argument(
+        "--keep-indexes",
+        action="store_true",
+        help="with --truncate, keep secondary indexes and unique constraints "
+        "during the load instead of recreating them at the end",
+    )
+    args = parser.parse_args()
+
+    engine = create_db_engine(
+        dataclasses.replace(settings, db_statement_timeout_ms=0), pool_name="generator"
+    )
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            if args.truncate:
+                await connection.exec_driver_sql(f"TRUNCATE {', '.join(TABLES)}")
+            elif await connection.scalar(
+                select(User.id)
+                .where(
+                    or_(
+                        User.email.like(f"%@{args.domain}"),
+                        User.crp.like(f"{CRP_PREFIX}%"),
+                    )
+                )
+                .limit(1)
+            ):
+                print(
+                    "generated users already exist, run again with --truncate",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+
+            deferred = []
+            if args.truncate and not args.keep_indexes:
+                deferred = await deferred_indexes(connection)
+                for drop, _ in deferred:
+                    await connection.exec_driver_sql(drop)
+
+            try:
+                generator = DataGenerator(args, pwd_context.hash(args.password))
+                async with CopyWriter(engine, args.workers) as writer:
+                    professional_ids, patient_ids = await generator.users(writer)
+                    await generator.calendars(professional_ids, patient_ids, writer)
+                print(writer.progress(), flush=True)
+            finally:
+                for _, create in deferred:
+                    print(create, flush=True)
+                    await connection.exec_driver_sql(create)
+
+        async with AsyncSession(engine) as db:
+            print(
+                f"rebuilt {await AvailabilitiesSummaryRepository(db).rebuild()} day counts"
+            )
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            await connection.exec_driver_sql(f"VACUUM ANALYZE {', '.join(TABLES)}")
+    finally:
+        await engine.dispose()
+    print(f"done in {time.perf_counter() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
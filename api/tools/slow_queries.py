@@ -0,0 +1,104 @@
+import argparse
+import json
+import statistics
+import sys
+from collections import defaultdict
+
+from api.config.settings import settings
+from api.modules.db.slow_query_log import SlowQueryRing
+
+STATEMENT_WIDTH = 80
+
+
+def one_line(statement: str, width: int = STATEMENT_WIDTH) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= width else statement[: width - 3] + "..."
+
+
+def matching(records: list[dict], args) -> list[dict]:
+    return [
+        record
+        for record in records
+        if record["duration_ms"] >= args.min_ms
+        and (args.route is None or args.route in (record["route"] or ""))
+    ]
+
+
+def list_records(ring: SlowQueryRing, args) -> int:
+    records = matching(ring.read(), args)[-args.limit :]
+    for record in records:
+        print(
+            f"{record['id']} {record['recorded_at'][:19]} "
+            f"{record['duration_ms']:9.1f} ms {'plan' if 'plan' in record else '    '} "
+            f"{record['route'] or '-':<40} {one_line(record['statement'])}"
+        )
+    print(f"{len(records)} slow queries in {ring.directory}")
+    return 0
+
+
+def show(ring: SlowQueryRing, args) -> int:
+    for record in ring.read():
+        if record["id"].startswith(args.id):
+            print(json.dumps(record, indent=2))
+            return 0
+    print(f"slow query {args.id} not found", file=sys.stderr)
+    return 1
+
+
+def top(ring: SlowQueryRing, args) -> int:
+    durations = defaultdict(list)
+    routes = defaultdict(set)
+    for record in matching(ring.read(), args):
+        durations[record["statement"]].append(record["duration_ms"])
+        routes[record["statement"]].add(record["route"] or "-")
+
+    ranked = sorted(durations.items(), key=lambda item: sum(item[1]), reverse=True)
+    for statement, samples in ranked[: args.limit]:
+        print(
+            f"{len(samples):5}x total {sum(samples):10.1f} ms | "
+            f"p50 {statistics.median(samples):9.1f} ms | max {max(samples):9.1f} ms | "
+            f"{', '.join(sorted(routes[statement]))}"
+        )
+        print(f"       {one_line(statement, 120)}")
+    return 0
+
+
+def clear(ring: SlowQueryRing, _args) -> int:
+    print(f"removed {ring.clear()} slow queries")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Inspect the slow query log written when SLOW_QUERY_LOG_ENABLED=true."
+    )
+    parser.add_argument(
+        "--dir",
+        default=settings.slow_query_log_dir,
+        help="log directory (default: SLOW_QUERY_LOG_DIR)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, run, description in (
+        ("list", list_records, "most recent slow queries"),
+        ("top", top, "statements ranked by total time"),
+    ):
+        command = commands.add_parser(name, help=description)
+        command.add_argument("--limit", type=int, default=20)
+        command.add_argument("--route", help="only routes containing this text")
+        command.add_argument("--min-ms", type=float, default=0)
+        command.set_defaults(run=run)
+    show_parser = commands.add_parser(
+        "show", help="full record with redacted parameters and plan"
+    )
+    show_parser.add_argument("id")
+    show_parser.set_defaults(run=show)
+    commands.add_parser("clear", help="delete every record").set_defaults(run=clear)
+    args = parser.parse_args()
+
+    sys.exit(
+        args.run(SlowQueryRing(args.dir, settings.slow_query_log_max_entries), args)
+    )
+
+
+if __name__ == "__main__":
+    main()